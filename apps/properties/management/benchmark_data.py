@@ -0,0 +1,109 @@
+"""
+Synthetic portfolios for the benchmark commands (--seed options).
+
+Rows go in with bulk_create, so no signals fire; callers rebuild the derived
+tables they measure (availability index, rollups...). Every seeded user name
+starts with `bench-` so a seeded database is easy to tell apart and clean up.
+"""
+
+import random
+import uuid
+from decimal import Decimal
+
+from django.db import transaction
+
+from apps.properties.models import Bed, Property, Room
+from apps.users.models import CustomUser, OwnerProfile, TenantProfile
+from shared.utils import geohash
+
+# (city, latitude, longitude) centres; properties scatter within ~15 km
+CITIES = (
+    ('Bengaluru', 12.9716, 77.5946),
+    ('Pune', 18.5204, 73.8567),
+    ('Hyderabad', 17.3850, 78.4867),
+    ('Chennai', 13.0827, 80.2707),
+    ('Kota', 25.2138, 75.8648),
+    ('Delhi', 28.6139, 77.2090),
+)
+ROOM_TYPES = ('SINGLE', 'DOUBLE', 'TRIPLE', 'DORMITORY')
+PROPERTY_TYPES = ('BOYS', 'GIRLS', 'CO_ED')
+
+
+def _user(role, tag):
+    return CustomUser(
+        username=f"bench-{role.lower()}-{tag}", phone_number=f"b{tag}"[:15], role=role,
+        email=f"bench-{tag}@example.com", first_name=f"Bench {tag}"[:150],
+    )
+
+
+def seed_owner():
+    tag = uuid.uuid4().hex[:12]
+    user = CustomUser.objects.create(**{
+        field: getattr(_user('SUPERADMIN', tag), field)
+        for field in ('username', 'phone_number', 'role', 'email', 'first_name')
+    })
+    return OwnerProfile.objects.create(user=user, business_name=f"Bench {tag}")
+
+
+def seed_portfolio(properties, rooms_per_property=10, beds_per_room=3, occupancy=0.0, owner=None, seed=7, batch_size=500):
+    """
+    Create `properties` properties for `owner` (a new one by default) with rooms
+    and beds. A share `occupancy` of the beds gets a tenant (user + profile).
+    Returns the OwnerProfile.
+    """
+    rng = random.Random(seed)
+    owner = owner or seed_owner()
+    for start in range(0, properties, batch_size):
+        with transaction.atomic():
+            props, rooms, beds, users, tenants = [], [], [], [], []
+            for i in range(start, min(start + batch_size, properties)):
+                city, lat, lng = rng.choice(CITIES)
+                lat, lng = lat + rng.uniform(-0.13, 0.13), lng + rng.uniform(-0.13, 0.13)
+                prop = Property(
+                    owner=owner, name=f"Bench PG {i}", address=f"{i} Bench Road", city=city, state='KA',
+                    property_type=rng.choice(PROPERTY_TYPES), latitude=Decimal(f"{lat:.6f}"), longitude=Decimal(f"{lng:.6f}"),
+                    geohash=geohash.encode(lat, lng, precision=12),
+                )
+                props.append(prop)
+                for number in range(rooms_per_property):
+                    rent = Decimal(rng.choice((5000, 6500, 8000, 12000)))
+                    room = Room(
+                        property=prop, room_number=str(100 + number), type=rng.choice(ROOM_TYPES),
+                        base_rent=rent, has_ac=rng.random() < 0.4, has_attached_bathroom=rng.random() < 0.5,
+                    )
+                    rooms.append(room)
+                    for label in 'ABCDEFGH'[:beds_per_room]:
+                        bed = Bed(room=room, label=label)
+                        beds.append(bed)
+                        if rng.random() < occupancy:
+                            tag = uuid.uuid4().hex[:13]
+                            user = _user('TENANT', tag)
+                            tenant = TenantProfile(user=user, property=prop, room=room, bed=bed, guardian_phone=f"g{tag}"[:15])
+                            bed.is_occupied, bed.current_tenant = True, tenant
+                            users.append(user)
+                            tenants.append(tenant)
+            # Parents first (MySQL checks FKs per statement); Bed.current_tenant goes in last
+            Property.objects.bulk_create(props)
+            Room.objects.bulk_create(rooms)
+            occupied = [bed for bed in beds if bed.current_tenant is not None]
+            for bed in occupied:
+                bed.current_tenant = None
+            Bed.objects.bulk_create(beds)
+            CustomUser.objects.bulk_create(users)
+            TenantProfile.objects.bulk_create(tenants)
+            for bed, tenant in zip(occupied, tenants):
+                bed.current_tenant = tenant
+            Bed.objects.bulk_update(occupied, ['current_tenant'], batch_size=1000)
+    return owner
+
+
+def seed_tenants(count, batch_size=2000):
+    """`count` unhoused tenants (user + profile). Returns their TenantProfile ids."""
+    ids = []
+    for start in range(0, count, batch_size):
+        with transaction.atomic():
+            users = [_user('TENANT', uuid.uuid4().hex[:13]) for _ in range(min(batch_size, count - start))]
+            CustomUser.objects.bulk_create(users)
+            tenants = TenantProfile.objects.bulk_create([TenantProfile(user_id=user.pk) for user in users])
+            ids.extend(tenant.pk for tenant in tenants)
+    return ids
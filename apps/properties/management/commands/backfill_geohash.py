@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.properties.models import Property
+from shared.utils import geohash
+
+
+class Command(BaseCommand):
+    help = "Fill Property.geohash for rows saved before it existed or written with queryset.update()."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch = []
+        updated = 0
+        rows = Property.objects.filter(latitude__isnull=False, longitude__isnull=False).only('id', 'latitude', 'longitude', 'geohash')
+        for prop in rows.iterator(chunk_size=options['batch_size']):
+            value = geohash.encode(float(prop.latitude), float(prop.longitude), precision=12)
+            if prop.geohash != value:
+                prop.geohash = value
+                batch.append(prop)
+            if len(batch) >= options['batch_size']:
+                updated += Property.objects.bulk_update(batch, ['geohash'])
+                batch = []
+        if batch:
+            updated += Property.objects.bulk_update(batch, ['geohash'])
+        self.stdout.write(self.style.SUCCESS(f"Updated geohash on {updated} properties"))
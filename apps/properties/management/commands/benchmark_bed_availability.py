@@ -0,0 +1,65 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from apps.properties.management.benchmark_data import seed_portfolio
+from apps.properties.models import Bed, BedAvailability
+from apps.properties.services import availability_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Vacancy search latency: the BedAvailability index versus the raw Bed -> Room -> Property join, "
+        "for a city-wide count and a per-property vacancy list. --seed N first creates N synthetic properties."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--city', help="Defaults to the city with the most indexed beds")
+        parser.add_argument('--room-type', default='DOUBLE')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0, help="Synthetic properties to create (10 rooms x 3 beds each)")
+
+    def _time(self, func, iterations):
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = func()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples) * 1000, max(samples) * 1000, result
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            seed_portfolio(options['seed'], occupancy=0.6)
+            availability_index.rebuild_all()
+        city = options['city'] or (
+            BedAvailability.objects.values('city').annotate(beds=Count('id')).order_by('-beds').values_list('city', flat=True).first()
+        )
+        if city is None:
+            raise CommandError("No indexed beds; pass --seed N or run rebuild_bed_availability")
+        room_type, iterations = options['room_type'], options['iterations']
+
+        def raw_count():
+            return Bed.objects.filter(is_occupied=False, room__property__city=city, room__type=room_type).count()
+
+        def raw_list():
+            return list(
+                Bed.objects.filter(is_occupied=False, room__property__city=city, room__type=room_type)
+                .values('room__property_id').annotate(vacancies=Count('id')).order_by('-vacancies')
+            )
+
+        cases = (
+            ('city count', lambda: availability_index.vacant_bed_count(city, room_type=room_type), raw_count),
+            ('per-property list', lambda: list(availability_index.properties_with_vacancy(city, room_type=room_type)), raw_list),
+        )
+        self.stdout.write(f"{city}, {room_type} rooms, {iterations} iterations (median / max ms)")
+        for label, indexed, raw in cases:
+            indexed_median, indexed_max, indexed_result = self._time(indexed, iterations)
+            raw_median, raw_max, raw_result = self._time(raw, iterations)
+            if label == 'city count' and indexed_result != raw_result:
+                self.stdout.write(self.style.WARNING(f"index drift: {indexed_result} vs {raw_result} (run rebuild_bed_availability)"))
+            self.stdout.write(
+                f"{label:18} index {indexed_median:8.2f} / {indexed_max:8.2f}   "
+                f"raw join {raw_median:8.2f} / {raw_max:8.2f}   speedup {raw_median / indexed_median:6.1f}x"
+            )
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.properties.models import PropertyStats
+
+
+class Command(BaseCommand):
+    help = "Compare read throughput with a fresh connection per request versus a persistent one."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+        parser.add_argument('--database', default='default', help="Alias to benchmark, e.g. replica_0")
+
+    def _run(self, alias, iterations, reconnect):
+        connection = connections[alias]
+        connection.close()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if reconnect:
+                connection.close()
+            PropertyStats.objects.using(alias).values_list('id', flat=True).first()
+        return iterations / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        iterations = options['iterations']
+        fresh = self._run(alias, iterations, reconnect=True)
+        persistent = self._run(alias, iterations, reconnect=False)
+        self.stdout.write(f"{alias}: new connection per query   {fresh:10.1f} queries/s")
+        self.stdout.write(f"{alias}: persistent connection      {persistent:10.1f} queries/s")
+        self.stdout.write(self.style.SUCCESS(f"Speedup {persistent / fresh:.2f}x"))
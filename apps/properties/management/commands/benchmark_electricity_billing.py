@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.properties.services import electricity_billing
+
+
+class Command(BaseCommand):
+    help = "Time the vectorized apportioning against a per-bed Python loop on a synthetic portfolio (no DB)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--beds', type=int, default=10000)
+        parser.add_argument('--beds-per-room', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def _loop(self, room_index, milli, days, rate_paise):
+        rooms = {}
+        for i, room in enumerate(room_index):
+            entry = rooms.setdefault(room, [0, 0, []])
+            entry[0] += milli[i]
+            entry[1] += days[i]
+            entry[2].append(i)
+        amounts = [0] * len(room_index)
+        for total_milli, total_days, beds in rooms.values():
+            if not total_days:
+                continue
+            total = (total_milli * rate_paise + 500) // 1000
+            shares = [(total * days[i] // total_days, total * days[i] % total_days, i) for i in beds]
+            leftover = total - sum(share for share, _, _ in shares)
+            for rank, (share, _, i) in enumerate(sorted(shares, key=lambda item: (-item[1], item[2]))):
+                amounts[i] = share + (1 if rank < leftover and days[i] else 0)
+        return amounts
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(7)
+        beds = options['beds']
+        room_index = np.arange(beds, dtype=np.int64) // options['beds_per_room']
+        milli = rng.integers(0, 250000, beds)
+        tiebreak = np.arange(beds)
+        month_start, month_end = electricity_billing.month_bounds('2026-01')
+        check_in = np.where(rng.random(beds) < 0.2, np.datetime64('2026-01-01') + rng.integers(0, 31, beds), np.datetime64('NaT'))
+        exits = np.full(beds, np.datetime64('NaT'), dtype='datetime64[D]')
+        has_tenant = rng.random(beds) < 0.85
+        last_occupied = np.full(beds, np.datetime64('NaT'), dtype='datetime64[D]')
+
+        start = time.perf_counter()
+        for _ in range(options['repeat']):
+            days = electricity_billing.occupancy_days(
+                month_start, month_end, has_tenant, check_in.astype('datetime64[D]'), exits, last_occupied
+            )
+            _, _, amount = electricity_billing.apportion(room_index, milli, days, 800, tiebreak)
+        vectorized = (time.perf_counter() - start) / options['repeat']
+
+        start = time.perf_counter()
+        looped = self._loop(room_index.tolist(), milli.tolist(), days.tolist(), 800)
+        loop = time.perf_counter() - start
+
+        self.stdout.write(f"{beds} beds, vectorized: {vectorized * 1000:8.2f} ms")
+        self.stdout.write(f"{beds} beds, python loop: {loop * 1000:8.2f} ms")
+        self.stdout.write(f"results identical: {list(amount) == looped}")
+        self.stdout.write(self.style.SUCCESS(f"Speedup {loop / vectorized:.1f}x"))
@@ -0,0 +1,87 @@
+import math
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.properties.management.benchmark_data import CITIES, seed_portfolio
+from apps.properties.models import Property
+from apps.properties.services import availability_index, geo_search
+from shared.utils import geohash
+
+
+class Command(BaseCommand):
+    help = (
+        "Nearby search latency: search_nearby (geohash + bounding-box prefilter, vectorized refinement) versus "
+        "a brute-force haversine scan of every property, over random points around the seeded cities. "
+        "--seed N first creates N synthetic properties (default 50k)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=50000)
+        parser.add_argument('--radius', type=float, default=3.0, help="km")
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--property-type', default=None)
+        parser.add_argument('--vacant-only', action='store_true')
+
+    def _brute_force(self, latitude, longitude, radius_km, property_type):
+        rows = Property.objects.all()
+        if property_type:
+            rows = rows.filter(property_type=property_type)
+        matches = []
+        for pk, lat, lng in rows.values_list('id', 'latitude', 'longitude'):
+            if lat is None or lng is None:
+                continue
+            lat1, lat2 = math.radians(latitude), math.radians(float(lat))
+            a = (
+                math.sin((lat2 - lat1) / 2) ** 2
+                + math.cos(lat1) * math.cos(lat2) * math.sin(math.radians(float(lng) - longitude) / 2) ** 2
+            )
+            distance = 2 * geohash.EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+            if distance <= radius_km:
+                matches.append((distance, pk))
+        matches.sort()
+        return len(matches)
+
+    def _summary(self, samples):
+        samples = sorted(samples)
+        return statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            start = time.perf_counter()
+            seed_portfolio(options['seed'], rooms_per_property=2, beds_per_room=2, occupancy=0.7)
+            availability_index.rebuild_all()
+            self.stdout.write(f"seeded {options['seed']:,} properties in {time.perf_counter() - start:.0f}s")
+
+        rng = random.Random(11)
+        radius, property_type = options['radius'], options['property_type']
+        indexed, brute, mismatches, found = [], [], 0, 0
+        for _ in range(options['iterations']):
+            _, lat, lng = rng.choice(CITIES)
+            lat, lng = lat + rng.uniform(-0.1, 0.1), lng + rng.uniform(-0.1, 0.1)
+
+            start = time.perf_counter()
+            result = geo_search.search_nearby(lat, lng, radius, property_type, options['vacant_only'])
+            indexed.append(time.perf_counter() - start)
+            found += result['count']
+
+            if not options['vacant_only']:
+                start = time.perf_counter()
+                expected = self._brute_force(lat, lng, radius, property_type)
+                brute.append(time.perf_counter() - start)
+                mismatches += expected != result['count']
+
+        total = Property.objects.count()
+        median, p99 = self._summary(indexed)
+        self.stdout.write(
+            f"{total:,} properties, {radius} km radius, {options['iterations']} searches, "
+            f"{found / options['iterations']:.0f} matches on average"
+        )
+        self.stdout.write(f"search_nearby   median {median:8.2f} ms  p99 {p99:8.2f} ms")
+        if brute:
+            brute_median, brute_p99 = self._summary(brute)
+            self.stdout.write(f"brute force     median {brute_median:8.2f} ms  p99 {brute_p99:8.2f} ms")
+            style = self.style.SUCCESS if mismatches == 0 else self.style.ERROR
+            self.stdout.write(style(f"speedup {brute_median / median:.1f}x, {mismatches} count mismatches"))
@@ -0,0 +1,93 @@
+import hashlib
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageDraw
+
+from apps.properties.services import media_pipeline
+
+
+class Command(BaseCommand):
+    help = (
+        "Throughput of a check-in batch (default 500 phone-sized JPEGs): upload hashing, then rendering "
+        "serially vs in a process pool. Works on synthetic files in a temp dir; the database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--photos', type=int, default=500)
+        parser.add_argument('--width', type=int, default=4032)
+        parser.add_argument('--height', type=int, default=3024)
+        parser.add_argument('--workers', type=int, help="Defaults to MEDIA_PIPELINE['WORKERS'] or the CPU count")
+        parser.add_argument('--serial-sample', type=int, default=20, help="Photos rendered serially for the baseline")
+
+    def _make_photos(self, root, count, size):
+        # A smooth base with a numbered stamp: realistic JPEG sizes, distinct hashes
+        base = Image.linear_gradient('L').resize(size).convert('RGB')
+        base = Image.blend(base, Image.effect_noise(size, 24).convert('RGB'), 0.2)
+        originals = root / media_pipeline.ORIGINALS_DIR
+        originals.mkdir(parents=True)
+        paths = []
+        for index in range(count):
+            photo = base.copy()
+            ImageDraw.Draw(photo).rectangle((40, 40, 40 + index % 400, 240), fill=(index % 255, 90, 160))
+            path = originals / f"{index:05d}.jpg"
+            photo.save(path, quality=90)
+            paths.append(path)
+        return paths
+
+    def handle(self, *args, **options):
+        config = media_pipeline.get_config()
+        workers = options['workers'] or config['WORKERS']
+        root = Path(tempfile.mkdtemp(prefix='media-bench-'))
+        try:
+            self.stdout.write(f"Generating {options['photos']} photos of {options['width']}x{options['height']}...")
+            paths = self._make_photos(root, options['photos'], (options['width'], options['height']))
+            total_mb = sum(path.stat().st_size for path in paths) / 1e6
+
+            # Upload step: what the request thread does (stream + sha256 + header probe)
+            start = time.perf_counter()
+            shas = []
+            for path in paths:
+                digest = hashlib.sha256()
+                with path.open('rb') as handle:
+                    for chunk in iter(lambda: handle.read(64 * 1024), b''):
+                        digest.update(chunk)
+                with Image.open(path) as image:
+                    image.size
+                shas.append(digest.hexdigest())
+            ingest = time.perf_counter() - start
+            self.stdout.write(
+                f"ingest (hash + probe): {len(paths) / ingest:.0f} photos/s, {total_mb / ingest:.0f} MB/s ({total_mb:.0f} MB)"
+            )
+
+            jobs = [
+                (str(root), str(path.relative_to(root)), sha, tuple(config['WIDTHS']), config['THUMBNAIL_SIZE'],
+                 config['WEBP_QUALITY'], config['JPEG_QUALITY'])
+                for path, sha in zip(paths, shas)
+            ]
+
+            sample = jobs[:options['serial_sample']]
+            start = time.perf_counter()
+            for job in sample:
+                media_pipeline.render_variants(*job)
+            serial = len(sample) / (time.perf_counter() - start)
+            self.stdout.write(f"render, serial ({len(sample)} photos): {serial:.1f} photos/s")
+
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(media_pipeline._render_safely, *zip(*jobs), chunksize=4))
+                pool_size = pool._max_workers
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for result in results if 'error' in result)
+            derived_mb = sum(path.stat().st_size for path in (root / media_pipeline.DERIVED_DIR).rglob('*') if path.is_file()) / 1e6
+            self.stdout.write(
+                f"render, pool ({pool_size} workers): {len(paths) / elapsed:.1f} photos/s, "
+                f"{elapsed:.1f}s for the batch ({len(paths) / elapsed / serial:.1f}x serial), "
+                f"{derived_mb:.0f} MB of variants, {failed} failed"
+            )
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from apps.properties.models import Bed
+from apps.properties.services import public_listing
+from apps.properties.views import public_bed_view
+
+
+class Command(BaseCommand):
+    help = "Requests per second of the public bed link: cold, shared-cache warm, process-local hot and 304."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--public-uid', help="Defaults to the first bed")
+        parser.add_argument('--iterations', type=int, default=2000)
+
+    def _measure(self, request, public_uid, iterations, before=None):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if before is not None:
+                before()
+            response = public_bed_view(request, public_uid)
+        return iterations / (time.perf_counter() - start), response.status_code
+
+    def handle(self, *args, **options):
+        public_uid = options['public_uid'] or Bed.objects.values_list('public_uid', flat=True).first()
+        if public_uid is None:
+            raise CommandError("No beds to benchmark")
+        iterations = options['iterations']
+        factory = RequestFactory()
+        request = factory.get(f'/api/v1/properties/public/bed/{public_uid}/')
+
+        cold = self._measure(request, public_uid, max(iterations // 10, 1), lambda: public_listing.invalidate([public_uid]))
+        warm = self._measure(request, public_uid, iterations, public_listing.local_cache.clear)
+        hot = self._measure(request, public_uid, iterations)
+        _, etag, _ = public_listing.get_listing(public_uid)
+        conditional = self._measure(factory.get(request.path, HTTP_IF_NONE_MATCH=etag), public_uid, iterations)
+
+        for label, (rate, status_code) in (
+            ('cold (DB + render)', cold), ('warm (shared cache)', warm), ('hot (local cache)', hot), ('If-None-Match', conditional),
+        ):
+            self.stdout.write(f"{label:22} {rate:12.0f} req/s  -> {status_code}")
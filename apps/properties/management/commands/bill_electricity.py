@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.properties.services import electricity_billing
+
+
+class Command(BaseCommand):
+    help = "Compute per-bed electricity bills for a month (all IoT properties, one property or one room)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('month', help="YYYY-MM")
+        parser.add_argument('--property', dest='property_id')
+        parser.add_argument('--room', dest='room_id', help="Re-bill a single room (e.g. after a reading correction)")
+        parser.add_argument('--rate', help="Rate per kWh, defaults to ELECTRICITY_BILLING['RATE_PER_UNIT']")
+
+    def handle(self, *args, **options):
+        month, rate = options['month'], options['rate']
+        try:
+            electricity_billing.month_bounds(month)
+        except ValueError:
+            raise CommandError("month must be YYYY-MM")
+
+        if options['room_id']:
+            summaries = [electricity_billing.rebill_room(options['room_id'], month, rate)]
+        elif options['property_id']:
+            summaries = [electricity_billing.bill_property(options['property_id'], month, rate)]
+        else:
+            summaries = electricity_billing.bill_month(month, rate)
+        billed = sum(summary['billed'] for summary in summaries)
+        total = sum(summary['total'] for summary in summaries)
+        self.stdout.write(self.style.SUCCESS(f"{month}: {billed} bills, total {total}"))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.properties.services import bulk_import
+from apps.users.models import OwnerProfile
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV/JSONL file of beds (with property and room columns) into Property/Room/Bed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--owner', required=True, help="OwnerProfile id the properties belong to")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--restart', action='store_true', help="Ignore saved progress and start from the first row")
+
+    def handle(self, *args, **options):
+        if not OwnerProfile.objects.filter(pk=options['owner']).exists():
+            raise CommandError(f"OwnerProfile {options['owner']} does not exist")
+
+        def report(progress):
+            self.stdout.write(
+                f"{progress['rows_done']} rows: {progress['properties']} properties, "
+                f"{progress['rooms']} rooms, {progress['beds']} beds, {progress['errors']} errors"
+            )
+
+        progress = bulk_import.run_import(
+            options['path'],
+            options['owner'],
+            chunk_size=options['chunk_size'],
+            resume=not options['restart'],
+            on_progress=report,
+        )
+        if progress['errors']:
+            self.stdout.write(self.style.WARNING(f"Row errors written to {bulk_import.errors_path(options['path'])}"))
+        self.stdout.write(self.style.SUCCESS("Import finished"))
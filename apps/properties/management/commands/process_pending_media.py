@@ -0,0 +1,35 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.properties.models import MediaAsset
+from apps.properties.services import media_pipeline
+
+
+class Command(BaseCommand):
+    help = "Render every PENDING upload (or --retry-failed ones) in a local process pool; for backfills and stuck queues."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help="Defaults to MEDIA_PIPELINE['WORKERS'] or the CPU count")
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--retry-failed', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            reset = MediaAsset.objects.filter(status='FAILED').update(status='PENDING', error=None)
+            self.stdout.write(f"Re-queued {reset} failed asset(s)")
+
+        workers = options['workers'] or media_pipeline.get_config()['WORKERS']
+        done = total = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                ids = list(
+                    MediaAsset.objects.filter(status='PENDING').order_by('created_at')
+                    .values_list('id', flat=True)[:options['batch_size']]
+                )
+                if not ids:
+                    break
+                done += media_pipeline.process_assets(ids, pool=pool)
+                total += len(ids)
+                self.stdout.write(f"{total} processed, {done} ready")
+        self.stdout.write(self.style.SUCCESS(f"Done: {done}/{total} assets ready"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.properties.services import availability_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the BedAvailability index from Bed/Room rows (fixes drift after bulk updates)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--property', dest='property_id', help="Only rebuild this property")
+
+    def handle(self, *args, **options):
+        if options['property_id']:
+            facets = availability_index.rebuild_property(options['property_id'])
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {facets} facet rows"))
+            return
+        count = availability_index.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt availability for {count} properties"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.properties.services import portfolio_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute PropertyStats/OwnerStats from Bed and Room rows and correct any drift."
+
+    def handle(self, *args, **options):
+        drifted = portfolio_rollups.reconcile_all()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled rollups ({drifted} rows had drifted)"))
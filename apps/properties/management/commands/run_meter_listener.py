@@ -0,0 +1,69 @@
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from apps.properties.services import meter_ingest
+
+
+class Command(BaseCommand):
+    help = (
+        "Receive smart-meter readings over UDP ('meter_id,kwh,epoch_seconds' lines, several "
+        "per datagram) and write them in bulk time buckets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='0.0.0.0')
+        parser.add_argument('--port', type=int, default=9999)
+
+    def handle(self, *args, **options):
+        ingestor = meter_ingest.get_ingestor()
+        config = ingestor.config
+        ingestor.meters.reload()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        sock.bind((options['host'], options['port']))
+        sock.settimeout(0.2)
+        self.stdout.write(f"Listening on udp://{options['host']}:{options['port']} ({len(ingestor.meters)} meters mapped)")
+
+        last_flush = time.monotonic()
+        retry_at = 0
+        received = 0
+        try:
+            while True:
+                try:
+                    datagram = sock.recv(65535)
+                except socket.timeout:
+                    datagram = None
+                if datagram:
+                    readings = [
+                        reading for reading in map(meter_ingest.parse_line, datagram.decode('ascii', 'replace').splitlines())
+                        if reading is not None
+                    ]
+                    ingestor.ingest(readings)
+                    received += len(readings)
+
+                now = time.monotonic()
+                due = ingestor.pending() >= config['BATCH_SIZE'] or now - last_flush >= config['FLUSH_INTERVAL']
+                if due and now >= retry_at:
+                    try:
+                        written = ingestor.flush()
+                    except DatabaseError as exc:
+                        # The buckets stay pending; retry after one interval instead of on every datagram
+                        self.stderr.write(f"flush failed, {ingestor.pending()} buckets kept: {exc}")
+                        retry_at = now + config['FLUSH_INTERVAL']
+                        continue
+                    if written:
+                        self.stdout.write(
+                            f"{received / (now - last_flush):,.0f} readings/s, {written} buckets written, "
+                            f"totals {ingestor.stats()}"
+                        )
+                    received = 0
+                    last_flush = now
+        except KeyboardInterrupt:
+            pass
+        finally:
+            ingestor.close()
+            sock.close()
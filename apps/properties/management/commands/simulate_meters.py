@@ -0,0 +1,82 @@
+import json
+import random
+import socket
+import time
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.properties.models import Bed
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate smart meters for local testing: cumulative kWh readings for every bed with an "
+        "iot_meter_id, sent to the UDP listener or the HTTP batch endpoint at a target rate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--udp', default='127.0.0.1:9999', help="host:port of run_meter_listener")
+        parser.add_argument('--http', help="Base URL; posts batches to /api/v1/properties/iot/meter-reading/ instead of UDP")
+        parser.add_argument('--api-key', help="X-IoT-Key for --http")
+        parser.add_argument('--rate', type=int, default=20000, help="Readings per second")
+        parser.add_argument('--duration', type=int, default=30, help="Seconds")
+        parser.add_argument('--batch', type=int, default=500, help="Readings per datagram/request")
+        parser.add_argument('--limit', type=int, help="Use only the first N meters")
+
+    def handle(self, *args, **options):
+        meters = Bed.objects.filter(iot_meter_id__isnull=False).values_list('iot_meter_id', flat=True)
+        if options['limit']:
+            meters = meters[:options['limit']]
+        meters = list(meters)
+        if not meters:
+            raise CommandError("No beds have an iot_meter_id")
+
+        send = self._http_sender(options) if options['http'] else self._udp_sender(options)
+        kwh = {meter: random.uniform(100, 5000) for meter in meters}
+        batch_size = options['batch']
+        interval = batch_size / options['rate']
+        deadline = time.monotonic() + options['duration']
+        sent = 0
+        index = 0
+        next_send = time.monotonic()
+        while time.monotonic() < deadline:
+            now = time.time()
+            batch = []
+            for _ in range(batch_size):
+                meter = meters[index % len(meters)]
+                index += 1
+                kwh[meter] += random.uniform(0.0, 0.05)
+                # Unique, increasing timestamps per meter even at high rates
+                batch.append((meter, round(kwh[meter], 3), now + index * 1e-6))
+            send(batch)
+            sent += len(batch)
+            next_send += interval
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent:,} readings from {len(meters)} meters"))
+
+    def _udp_sender(self, options):
+        host, port = options['udp'].rsplit(':', 1)
+        address = (host, int(port))
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        def send(batch):
+            # Keep datagrams under the usual 64 KiB limit
+            for start in range(0, len(batch), 1000):
+                payload = '\n'.join(f"{meter},{value},{epoch:.6f}" for meter, value, epoch in batch[start:start + 1000])
+                sock.sendto(payload.encode('ascii'), address)
+        return send
+
+    def _http_sender(self, options):
+        url = options['http'].rstrip('/') + '/api/v1/properties/iot/meter-reading/'
+        headers = {'Content-Type': 'application/json', 'X-IoT-Key': options['api_key'] or ''}
+
+        def send(batch):
+            body = json.dumps({'readings': [
+                {'meter_id': meter, 'current_reading': value, 'timestamp': epoch} for meter, value, epoch in batch
+            ]}).encode()
+            with urllib.request.urlopen(urllib.request.Request(url, data=body, headers=headers), timeout=30) as response:
+                response.read()
+        return send
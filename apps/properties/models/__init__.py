@@ -1,3 +1,8 @@
 from .property import Property
 from .room import Room
 from .bed import Bed
+from .bed_availability import BedAvailability
+from .portfolio_stats import PropertyStats, OwnerStats
+from .meter_reading import MeterReadingBucket
+from .electricity_bill import ElectricityBill
+from .media_asset import MediaAsset, MediaAttachment
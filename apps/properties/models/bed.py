@@ -18,9 +18,13 @@ class Bed(models.Model):
     
     current_tenant = models.OneToOneField('users.TenantProfile', on_delete=models.SET_NULL, null=True, blank=True, related_name='current_bed')
     last_occupied_date = models.DateField(null=True, blank=True)
+    last_tenant = models.ForeignKey('users.TenantProfile', on_delete=models.SET_NULL, null=True, blank=True, related_name='+', help_text="Who left on last_occupied_date")
 
     class Meta:
         unique_together = ('room', 'label')
+        indexes = [
+            models.Index(fields=['room', 'is_occupied']),
+        ]
 
     def __str__(self):
         return f"{self.room.room_number} - {self.label}"
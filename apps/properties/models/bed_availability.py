@@ -0,0 +1,32 @@
+from django.db import models
+import uuid
+from .property import Property
+
+class BedAvailability(models.Model):
+    """
+    Denormalized vacancy counts per property / room type / amenity facet.
+    Maintained incrementally from Bed and Room signals (see properties.signals).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='availability')
+
+    # Copied from Property so city searches never join
+    city = models.CharField(max_length=100)
+    property_type = models.CharField(max_length=20)
+
+    # Facet (copied from Room)
+    room_type = models.CharField(max_length=20)
+    has_ac = models.BooleanField(default=False)
+    has_attached_bathroom = models.BooleanField(default=False)
+
+    total_beds = models.IntegerField(default=0)
+    vacant_beds = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('property', 'room_type', 'has_ac', 'has_attached_bathroom')
+        indexes = [
+            models.Index(fields=['city', 'property_type', 'room_type', 'has_ac', 'has_attached_bathroom', 'vacant_beds']),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} {self.room_type}: {self.vacant_beds}/{self.total_beds} vacant"
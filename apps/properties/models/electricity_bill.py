@@ -0,0 +1,30 @@
+from django.db import models
+import uuid
+from .bed import Bed
+
+class ElectricityBill(models.Model):
+    """
+    One occupancy period's share of its room's metered consumption for a month (USP #5):
+    a bed that changed hands mid-month has a bill for each tenant.
+    Computed in bulk by services.electricity_billing; recomputed when readings are corrected.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    bed = models.ForeignKey(Bed, on_delete=models.CASCADE, related_name='electricity_bills')
+    tenant = models.ForeignKey('users.TenantProfile', on_delete=models.SET_NULL, null=True, blank=True, related_name='electricity_bills')
+    billing_month = models.CharField(max_length=7, help_text="YYYY-MM")
+    room_units = models.DecimalField(max_digits=12, decimal_places=3, help_text="Room consumption in kWh")
+    units_consumed = models.DecimalField(max_digits=10, decimal_places=3, help_text="This bed's share in kWh")
+    occupied_days = models.IntegerField(default=0)
+    rate_per_unit = models.DecimalField(max_digits=6, decimal_places=2)
+    cost_calculated = models.DecimalField(max_digits=10, decimal_places=2)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('bed', 'tenant', 'billing_month')
+        indexes = [
+            models.Index(fields=['billing_month']),
+            models.Index(fields=['tenant', 'billing_month']),
+        ]
+
+    def __str__(self):
+        return f"{self.bed_id} {self.billing_month}: {self.cost_calculated}"
@@ -0,0 +1,53 @@
+from django.db import models
+import uuid
+
+
+class MediaAsset(models.Model):
+    """
+    One uploaded image, stored once per distinct content (sha256) no matter how many
+    profiles or rooms reference it. `variants` holds the derived files written by
+    services.media_pipeline: {"thumb": {"webp": path, "jpeg": path, "width": ...}, "w640": {...}}.
+    """
+    STATUS_CHOICES = [('PENDING', 'Pending'), ('READY', 'Ready'), ('FAILED', 'Failed')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sha256 = models.CharField(max_length=64, unique=True)
+    original_path = models.CharField(max_length=255, help_text="Relative to MEDIA_ROOT")
+    content_type = models.CharField(max_length=50)
+    size_bytes = models.BigIntegerField()
+    width = models.IntegerField(null=True, blank=True)
+    height = models.IntegerField(null=True, blank=True)
+    variants = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    error = models.TextField(null=True, blank=True)
+    uploaded_by = models.ForeignKey('users.CustomUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='media_assets')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.status})"
+
+
+class MediaAttachment(models.Model):
+    """
+    A pending or applied link from an asset to an image field (e.g. a tenant's
+    check_in_photos). Applied in bulk once the asset's variants are ready.
+    """
+    TARGET_CHOICES = [('TENANT', 'Tenant'), ('ROOM', 'Room'), ('PROPERTY', 'Property')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    asset = models.ForeignKey(MediaAsset, on_delete=models.CASCADE, related_name='attachments')
+    target_type = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    target_id = models.UUIDField()
+    field = models.CharField(max_length=50)
+    created_at = models.DateTimeField(auto_now_add=True)
+    applied_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['asset', 'applied_at']),
+            models.Index(fields=['target_type', 'target_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_id} -> {self.target_type}:{self.target_id}.{self.field}"
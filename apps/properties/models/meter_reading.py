@@ -0,0 +1,25 @@
+from django.db import models
+import uuid
+from .bed import Bed
+
+class MeterReadingBucket(models.Model):
+    """
+    Downsampled smart-meter readings (USP #5): one row per bed per time bucket
+    (IOT_INGEST['BUCKET_SECONDS'], hourly by default) instead of one row per reading.
+    Meters report cumulative kWh, so consumption over a window is the last_kwh of its
+    final bucket minus the last_kwh before it (see services.meter_ingest).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    bed = models.ForeignKey(Bed, on_delete=models.CASCADE, related_name='meter_readings')
+    bucket_start = models.DateTimeField()
+    first_kwh = models.DecimalField(max_digits=12, decimal_places=3)
+    last_kwh = models.DecimalField(max_digits=12, decimal_places=3)
+    first_at = models.DateTimeField()
+    last_at = models.DateTimeField()
+    sample_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('bed', 'bucket_start')
+
+    def __str__(self):
+        return f"{self.bed_id} @ {self.bucket_start}: {self.first_kwh}-{self.last_kwh} kWh"
@@ -0,0 +1,33 @@
+from django.db import models
+import uuid
+from .property import Property
+
+class PropertyStats(models.Model):
+    """
+    Occupancy and rent-roll rollup for one property.
+    Maintained from Bed/Room change deltas (see services.portfolio_rollups).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    property = models.OneToOneField(Property, on_delete=models.CASCADE, related_name='stats')
+    total_beds = models.IntegerField(default=0)
+    occupied_beds = models.IntegerField(default=0)
+    rent_roll = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Monthly rent of occupied beds")
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.property_id}: {self.occupied_beds}/{self.total_beds}"
+
+class OwnerStats(models.Model):
+    """
+    Portfolio-wide rollup for one owner, summed from property deltas.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.OneToOneField('users.OwnerProfile', on_delete=models.CASCADE, related_name='stats')
+    property_count = models.IntegerField(default=0)
+    total_beds = models.IntegerField(default=0)
+    occupied_beds = models.IntegerField(default=0)
+    rent_roll = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.owner_id}: {self.property_count} properties"
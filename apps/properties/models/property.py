@@ -29,6 +29,7 @@ class Property(models.Model):
     # Geo
     latitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
     longitude = models.DecimalField(max_digits=12, decimal_places=8, null=True, blank=True)
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False, db_index=True, help_text="Maintained on save from latitude/longitude")
     
     # Media
     images_url = models.JSONField(default=list, blank=True, help_text="List of image URLs")
@@ -41,5 +42,11 @@ class Property(models.Model):
     iot_enabled = models.BooleanField(default=False, help_text="USP #5")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['city', 'property_type']),
+            models.Index(fields=['latitude', 'longitude']),
+        ]
+
     def __str__(self):
         return f"{self.name}, {self.city}"
@@ -32,6 +32,9 @@ class Room(models.Model):
 
     class Meta:
         unique_together = ('property', 'room_number')
+        indexes = [
+            models.Index(fields=['property', 'type', 'has_ac', 'has_attached_bathroom']),
+        ]
 
     def __str__(self):
         return f"{self.room_number} ({self.type})"
@@ -0,0 +1,21 @@
+import hmac
+
+from rest_framework.permissions import BasePermission
+
+from apps.properties.services.meter_ingest import get_config as get_iot_config
+
+
+class IsPropertyOwnerOrManager(BasePermission):
+    """Allows access to PG owners (SuperAdmin) and managers only."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and user.role in ('SUPERADMIN', 'MANAGER'))
+
+
+class HasIoTApiKey(BasePermission):
+    """Smart meters / gateways authenticate with a shared key in the X-IoT-Key header (IOT_INGEST['API_KEYS'])."""
+
+    def has_permission(self, request, view):
+        key = request.headers.get('X-IoT-Key')
+        return bool(key) and any(hmac.compare_digest(key, allowed) for allowed in get_iot_config()['API_KEYS'])
@@ -0,0 +1 @@
+from .bed_assignment_serializer import BulkCheckInSerializer, BulkCheckOutSerializer
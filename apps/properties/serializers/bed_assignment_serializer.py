@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+
+class BedAssignmentSerializer(serializers.Serializer):
+    tenant = serializers.UUIDField()
+    bed = serializers.UUIDField()
+
+
+class BulkCheckInSerializer(serializers.Serializer):
+    assignments = BedAssignmentSerializer(many=True, allow_empty=False, max_length=1000)
+    check_in_date = serializers.DateField(required=False)
+
+
+class BulkCheckOutSerializer(serializers.Serializer):
+    tenants = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=1000)
+    check_out_date = serializers.DateField(required=False)
@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from apps.properties.models import Bed, BedAvailability, Property
+
+def room_facet(room):
+    """Facet key a room's beds are counted under."""
+    return {
+        'room_type': room.type,
+        'has_ac': room.has_ac,
+        'has_attached_bathroom': room.has_attached_bathroom,
+    }
+
+
+def apply_delta(property_id, facet, total_delta=0, vacant_delta=0):
+    """
+    Shift the counters of one facet row with an atomic F() update.
+    Creates the row on first use; decrements against a missing row are ignored
+    (the row is already gone, e.g. during a cascading property delete).
+    """
+    if not total_delta and not vacant_delta:
+        return
+    updated = BedAvailability.objects.filter(property_id=property_id, **facet).update(
+        total_beds=F('total_beds') + total_delta,
+        vacant_beds=F('vacant_beds') + vacant_delta,
+    )
+    if updated or total_delta < 0:
+        return
+    prop = Property.objects.filter(pk=property_id).values('city', 'property_type').first()
+    if prop is None:
+        return
+    row, created = BedAvailability.objects.get_or_create(
+        property_id=property_id,
+        defaults={'total_beds': total_delta, 'vacant_beds': vacant_delta, **prop},
+        **facet,
+    )
+    if not created:
+        BedAvailability.objects.filter(pk=row.pk).update(
+            total_beds=F('total_beds') + total_delta,
+            vacant_beds=F('vacant_beds') + vacant_delta,
+        )
+
+
+def room_bed_counts(room_id):
+    """(total, vacant) beds in a room, in a single aggregate query."""
+    counts = Bed.objects.filter(room_id=room_id).aggregate(
+        total=Count('id'),
+        vacant=Count('id', filter=Q(is_occupied=False)),
+    )
+    return counts['total'], counts['vacant']
+
+
+@transaction.atomic
+def rebuild_property(property_id):
+    """Recompute every facet row of a property from Bed/Room. Used to correct drift."""
+    prop = Property.objects.filter(pk=property_id).values('city', 'property_type').first()
+    BedAvailability.objects.filter(property_id=property_id).delete()
+    if prop is None:
+        return 0
+    rows = (
+        Bed.objects.filter(room__property_id=property_id)
+        .values(room_type=F('room__type'), has_ac=F('room__has_ac'), has_attached_bathroom=F('room__has_attached_bathroom'))
+        .annotate(total_beds=Count('id'), vacant_beds=Count('id', filter=Q(is_occupied=False)))
+        .order_by()
+    )
+    BedAvailability.objects.bulk_create([
+        BedAvailability(property_id=property_id, **prop, **row) for row in rows
+    ])
+    return len(rows)
+
+
+def rebuild_all(batch_size=500):
+    """Rebuild the index for every property. Returns the number of properties processed."""
+    processed = 0
+    for property_id in Property.objects.values_list('id', flat=True).iterator(chunk_size=batch_size):
+        rebuild_property(property_id)
+        processed += 1
+    return processed
+
+
+def _facet_filter(city, property_type=None, room_type=None, has_ac=None, has_attached_bathroom=None):
+    filters = {'city': city}
+    if property_type is not None:
+        filters['property_type'] = property_type
+    if room_type is not None:
+        filters['room_type'] = room_type
+    if has_ac is not None:
+        filters['has_ac'] = has_ac
+    if has_attached_bathroom is not None:
+        filters['has_attached_bathroom'] = has_attached_bathroom
+    return filters
+
+
+def vacant_bed_count(city, **filters):
+    """Total vacant beds in a city matching the given facet filters."""
+    result = BedAvailability.objects.filter(**_facet_filter(city, **filters)).aggregate(total=Sum('vacant_beds'))
+    return result['total'] or 0
+
+
+def properties_with_vacancy(city, **filters):
+    """
+    Properties in a city with at least one vacant bed matching the filters,
+    annotated with `vacancies`, most vacancies first.
+    """
+    return (
+        BedAvailability.objects.filter(vacant_beds__gt=0, **_facet_filter(city, **filters))
+        .values('property_id')
+        .annotate(vacancies=Sum('vacant_beds'))
+        .order_by('-vacancies')
+    )
+
+
+def vacant_beds(city, **filters):
+    """Bed queryset behind a facet search; resolved through the composite indexes."""
+    facet = _facet_filter(city, **filters)
+    bed_filters = {'is_occupied': False, 'room__property__city': facet.pop('city')}
+    if 'property_type' in facet:
+        bed_filters['room__property__property_type'] = facet.pop('property_type')
+    if 'room_type' in facet:
+        bed_filters['room__type'] = facet.pop('room_type')
+    bed_filters.update({f'room__{name}': value for name, value in facet.items()})
+    return Bed.objects.filter(**bed_filters).select_related('room', 'room__property')
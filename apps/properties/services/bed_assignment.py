@@ -0,0 +1,175 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, CharField, Exists, F, OuterRef, Q, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.properties.models import Bed, Room
+from apps.properties.services import availability_index, portfolio_rollups, public_listing
+from apps.users.models import TenantProfile
+from apps.users.services import parent_access, roommate_matching
+
+
+def _tenants_changed(tenant_ids):
+    """Caches keyed on tenant residence (bulk updates skip TenantProfile signals)."""
+    roommate_matching.tenants_changed(tenant_ids)
+    parent_access.tenants_changed(tenant_ids)
+
+
+def _refresh_room_status(room_ids):
+    """Recompute status for every touched room in one UPDATE (rooms under maintenance are left alone)."""
+    has_vacancy = Exists(Bed.objects.filter(room_id=OuterRef('pk'), is_occupied=False))
+    Room.objects.filter(pk__in=room_ids).exclude(status='MAINTENANCE').update(
+        status=Case(
+            When(has_vacancy, then=Value('AVAILABLE')),
+            default=Value('OCCUPIED'),
+            output_field=CharField(),
+        )
+    )
+
+
+def _apply_availability(room_ids_with_deltas):
+    """
+    Push vacancy deltas (bulk_update skips Bed signals) into the availability index and rollups.
+    Deltas are summed per facet row and per property and applied in sorted order, so
+    concurrent batches lock the shared counter rows in the same order instead of deadlocking.
+    """
+    rooms = Room.objects.filter(pk__in=room_ids_with_deltas.keys()).only(
+        'id', 'property_id', 'type', 'has_ac', 'has_attached_bathroom', 'current_rent', 'base_rent'
+    )
+    facet_deltas = Counter()
+    rollup_deltas = {}
+    for room in rooms:
+        vacancy_delta = room_ids_with_deltas[room.pk]
+        facet = availability_index.room_facet(room)
+        facet_deltas[(str(room.property_id), tuple(sorted(facet.items())))] += vacancy_delta
+        rollup = rollup_deltas.setdefault(room.property_id, [0, 0, portfolio_rollups.ZERO])
+        rollup[1] -= vacancy_delta
+        rollup[2] -= portfolio_rollups.bed_rent(room) * vacancy_delta
+    for (property_id, facet), vacancy_delta in sorted(facet_deltas.items()):
+        availability_index.apply_delta(property_id, dict(facet), 0, vacancy_delta)
+    portfolio_rollups.apply_deltas(rollup_deltas)
+
+
+def bulk_check_in(assignments, check_in_date=None, batch_size=500, property_ids=None):
+    """
+    Assign many tenants to beds in one transaction.
+
+    `assignments` is an iterable of (tenant_profile_id, bed_id) pairs. Beds and tenants
+    are locked with SKIP LOCKED, so a concurrent manager working on an overlapping batch
+    never deadlocks; anything locked elsewhere, already occupied or already housed is
+    reported back in `skipped` instead of failing the batch.
+    With `property_ids` (ids or a subquery, see property_access) only beds of those
+    properties, and tenants who are new or were last housed there, can be assigned.
+    Each check-in starts a new stay: check_in_date is set and the exit and notice
+    dates of a previous stay are cleared.
+    """
+    check_in_date = check_in_date or timezone.localdate()
+    pairs = {}
+    skipped = []
+    used_beds = set()
+    for tenant_id, bed_id in assignments:
+        tenant_id, bed_id = str(tenant_id), str(bed_id)
+        if tenant_id in pairs or bed_id in used_beds:
+            skipped.append({'tenant': tenant_id, 'bed': bed_id, 'reason': 'DUPLICATE_IN_BATCH'})
+            continue
+        pairs[tenant_id] = bed_id
+        used_beds.add(bed_id)
+
+    with transaction.atomic():
+        free_beds = Bed.objects.filter(pk__in=used_beds, is_occupied=False, current_tenant__isnull=True)
+        unhoused = TenantProfile.objects.filter(pk__in=pairs.keys(), bed__isnull=True)
+        if property_ids is not None:
+            free_beds = free_beds.filter(room__property_id__in=property_ids)
+            unhoused = unhoused.filter(Q(property__isnull=True) | Q(property_id__in=property_ids))
+        beds = {
+            str(bed.pk): bed
+            for bed in free_beds.select_for_update(skip_locked=True, of=('self',)).select_related('room')
+        }
+        tenants = {
+            str(tenant.pk): tenant
+            for tenant in unhoused.select_for_update(skip_locked=True)
+            .only('id', 'property', 'room', 'bed', 'check_in_date', 'exit_date', 'notice_given_on')
+        }
+
+        assigned = []
+        vacancy_deltas = Counter()
+        for tenant_id, bed_id in pairs.items():
+            bed = beds.get(bed_id)
+            tenant = tenants.get(tenant_id)
+            if bed is None or tenant is None:
+                reason = 'BED_UNAVAILABLE' if bed is None else 'TENANT_UNAVAILABLE'
+                skipped.append({'tenant': tenant_id, 'bed': bed_id, 'reason': reason})
+                continue
+            bed.current_tenant_id = tenant.pk
+            bed.is_occupied = True
+            tenant.property_id = bed.room.property_id
+            tenant.room_id = bed.room_id
+            tenant.bed_id = bed.pk
+            tenant.check_in_date = check_in_date
+            tenant.exit_date = None
+            tenant.notice_given_on = None
+            vacancy_deltas[bed.room_id] -= 1
+            assigned.append((tenant, bed))
+
+        if assigned:
+            Bed.objects.bulk_update(
+                [bed for _, bed in assigned],
+                ['current_tenant', 'is_occupied'],
+                batch_size=batch_size,
+            )
+            TenantProfile.objects.bulk_update(
+                [tenant for tenant, _ in assigned],
+                ['property', 'room', 'bed', 'check_in_date', 'exit_date', 'notice_given_on'],
+                batch_size=batch_size,
+            )
+            _refresh_room_status(vacancy_deltas.keys())
+            _apply_availability(vacancy_deltas)
+            transaction.on_commit(lambda: _tenants_changed([tenant.pk for tenant, _ in assigned]))
+            transaction.on_commit(lambda: public_listing.invalidate(bed.public_uid for _, bed in assigned))
+
+    return {
+        'assigned': [{'tenant': str(tenant.pk), 'bed': str(bed.pk)} for tenant, bed in assigned],
+        'skipped': skipped,
+    }
+
+
+def bulk_check_out(tenant_ids, check_out_date=None, property_ids=None):
+    """
+    Release the beds held by the given tenants, clear their residence FKs and set
+    exit_date (and the bed's last_occupied_date and last_tenant, which billing reads). A tenant who never gave notice gets notice_given_on = exit_date too,
+    as the TenantProfile pre_save stamp would (the update skips signals).
+    Beds locked by a concurrent operation, or outside `property_ids`, are skipped and reported.
+    """
+    check_out_date = check_out_date or timezone.localdate()
+    tenant_ids = {str(tenant_id) for tenant_id in tenant_ids}
+    with transaction.atomic():
+        held = Bed.objects.filter(current_tenant_id__in=tenant_ids)
+        if property_ids is not None:
+            held = held.filter(room__property_id__in=property_ids)
+        beds = list(
+            held.select_for_update(skip_locked=True, of=('self',))
+            .values_list('id', 'room_id', 'current_tenant_id')
+        )
+        released = {str(tenant_id) for _, _, tenant_id in beds}
+        vacancy_deltas = Counter(room_id for _, room_id, _ in beds)
+
+        if beds:
+            # last_tenant first: MySQL applies SET assignments left to right
+            Bed.objects.filter(pk__in=[bed_id for bed_id, _, _ in beds]).update(
+                last_tenant=F('current_tenant'), current_tenant=None, is_occupied=False, last_occupied_date=check_out_date
+            )
+            TenantProfile.objects.filter(pk__in=released).update(
+                property=None, room=None, bed=None, exit_date=check_out_date,
+                notice_given_on=Coalesce(F('notice_given_on'), Value(check_out_date)),
+            )
+            _refresh_room_status(vacancy_deltas.keys())
+            _apply_availability(vacancy_deltas)
+            transaction.on_commit(lambda: _tenants_changed(released))
+            transaction.on_commit(lambda: public_listing.invalidate_beds([bed_id for bed_id, _, _ in beds]))
+
+    return {
+        'released': sorted(released),
+        'skipped': sorted(tenant_ids - released),
+    }
@@ -0,0 +1,271 @@
+"""
+Streaming import of properties, rooms and beds for one owner.
+
+Input is CSV or JSONL with one row per bed; property and room columns repeat and
+are only read the first time a property name / room number is seen. Rows are
+processed in fixed-size chunks: each chunk is validated, its natural keys
+(owner + property name, property + room_number, room + label) are resolved in
+bulk, and missing objects are inserted with bulk_create inside one transaction.
+Existing objects are left untouched, so a rerun is idempotent, and a progress file
+next to the input records the last committed row so an interrupted run resumes there.
+"""
+
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from apps.properties.models import Bed, Property, Room
+from apps.properties.services import availability_index, portfolio_rollups
+from shared.utils import geohash
+
+PROPERTY_REQUIRED = ('property_name', 'address', 'city', 'state', 'property_type')
+ROOM_REQUIRED = ('room_number', 'room_type', 'base_rent')
+BED_REQUIRED = ('bed_label',)
+
+PROPERTY_TYPES = {choice for choice, _ in Property._meta.get_field('property_type').choices}
+ROOM_TYPES = {choice for choice, _ in Room._meta.get_field('type').choices}
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+COLUMNS = {'name': 'property_name', 'label': 'bed_label'}  # model field -> input column, where they differ
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(path):
+    """
+    Yield (line_number, row) from a CSV or JSONL file without loading it. JSONL
+    lines are yielded undecoded; clean_row parses them, so a malformed line is
+    recorded as that row's error instead of aborting the import.
+    """
+    path = Path(path)
+    with path.open(newline='', encoding='utf-8') as handle:
+        if path.suffix.lower() in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_number, line
+        else:
+            for line_number, row in enumerate(csv.DictReader(handle), start=2):
+                yield line_number, row
+
+
+def _text(row, key):
+    value = row.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _decimal(row, key):
+    value = _text(row, key)
+    if value is None:
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise RowError(f"{key} is not a number: {value!r}")
+
+
+def _bool(row, key, default):
+    value = _text(row, key)
+    return default if value is None else value.lower() in TRUE_VALUES
+
+
+def _validate(model, values):
+    """Run each model field's clean() (max_length, max_digits, finite decimals...) on the given values."""
+    for name, value in values.items():
+        if value is None:
+            continue
+        try:
+            values[name] = model._meta.get_field(name).clean(value, None)
+        except ValidationError as exc:
+            raise RowError(f"{COLUMNS.get(name, name)}: {' '.join(exc.messages)}")
+    return values
+
+
+def clean_row(row):
+    """Validate one row (a dict, or a JSONL line) and split it into property / room / bed field dicts."""
+    if isinstance(row, str):
+        try:
+            row = json.loads(row)
+        except json.JSONDecodeError as exc:
+            raise RowError(f"invalid JSON: {exc.msg}")
+    if not isinstance(row, dict):
+        raise RowError("row is not a JSON object")
+    missing = [key for key in PROPERTY_REQUIRED + ROOM_REQUIRED + BED_REQUIRED if not _text(row, key)]
+    if missing:
+        raise RowError(f"missing {', '.join(missing)}")
+    property_type = _text(row, 'property_type').upper()
+    if property_type not in PROPERTY_TYPES:
+        raise RowError(f"invalid property_type {property_type!r}")
+    room_type = _text(row, 'room_type').upper()
+    if room_type not in ROOM_TYPES:
+        raise RowError(f"invalid room_type {room_type!r}")
+
+    latitude = _decimal(row, 'latitude')
+    longitude = _decimal(row, 'longitude')
+    prop = {
+        'name': _text(row, 'property_name'),
+        'address': _text(row, 'address'),
+        'city': _text(row, 'city'),
+        'state': _text(row, 'state'),
+        'pincode': _text(row, 'pincode'),
+        'property_type': property_type,
+        'latitude': latitude,
+        'longitude': longitude,
+        'total_floors': int(_text(row, 'total_floors') or 1),
+    }
+    room = {
+        'room_number': _text(row, 'room_number'),
+        'floor': _text(row, 'floor'),
+        'type': room_type,
+        'base_rent': _decimal(row, 'base_rent'),
+        'current_rent': _decimal(row, 'current_rent'),
+        'has_ac': _bool(row, 'has_ac', False),
+        'has_balcony': _bool(row, 'has_balcony', False),
+        'has_wifi': _bool(row, 'has_wifi', True),
+        'has_attached_bathroom': _bool(row, 'has_attached_bathroom', False),
+    }
+    bed = {
+        'label': _text(row, 'bed_label'),
+        'iot_meter_id': _text(row, 'iot_meter_id'),
+    }
+    return _validate(Property, prop), _validate(Room, room), _validate(Bed, bed)
+
+
+def import_chunk(owner_id, rows):
+    """
+    Insert one chunk of (line_number, row). Returns (created_counts, errors) where
+    errors is a list of (line_number, message). Runs in a single transaction.
+    """
+    created = {'properties': 0, 'rooms': 0, 'beds': 0}
+    errors = []
+    cleaned = []
+    for line_number, row in rows:
+        try:
+            cleaned.append((line_number, *clean_row(row)))
+        except ValueError as exc:
+            errors.append((line_number, str(exc)))
+    if not cleaned:
+        return created, errors
+
+    with transaction.atomic():
+        # Properties by (owner, name)
+        names = {prop['name'] for _, prop, _, _ in cleaned}
+        properties = {p.name: p for p in Property.objects.filter(owner_id=owner_id, name__in=names)}
+        new_properties = {}
+        for _, prop, _, _ in cleaned:
+            if prop['name'] not in properties and prop['name'] not in new_properties:
+                instance = Property(owner_id=owner_id, **prop)
+                if instance.latitude is not None and instance.longitude is not None:
+                    instance.geohash = geohash.encode(float(instance.latitude), float(instance.longitude), precision=12)
+                new_properties[prop['name']] = instance
+        Property.objects.bulk_create(new_properties.values())
+        properties.update(new_properties)
+        created['properties'] = len(new_properties)
+
+        # Rooms by (property, room_number)
+        property_ids = {properties[prop['name']].pk for _, prop, _, _ in cleaned}
+        room_numbers = {room['room_number'] for _, _, room, _ in cleaned}
+        rooms = {
+            (r.property_id, r.room_number): r
+            for r in Room.objects.filter(property_id__in=property_ids, room_number__in=room_numbers)
+        }
+        new_rooms = {}
+        for _, prop, room, _ in cleaned:
+            key = (properties[prop['name']].pk, room['room_number'])
+            if key not in rooms and key not in new_rooms:
+                new_rooms[key] = Room(property_id=key[0], **room)
+        Room.objects.bulk_create(new_rooms.values())
+        rooms.update(new_rooms)
+        created['rooms'] = len(new_rooms)
+
+        # Beds by (room, label); iot_meter_id must stay globally unique
+        room_ids = {room.pk for room in rooms.values()}
+        existing_beds = set(
+            Bed.objects.filter(room_id__in=room_ids, label__in={bed['label'] for _, _, _, bed in cleaned})
+            .values_list('room_id', 'label')
+        )
+        meter_ids = {bed['iot_meter_id'] for _, _, _, bed in cleaned if bed['iot_meter_id']}
+        taken_meters = set(Bed.objects.filter(iot_meter_id__in=meter_ids).values_list('iot_meter_id', flat=True))
+        new_beds = {}
+        for line_number, prop, room, bed in cleaned:
+            room_id = rooms[(properties[prop['name']].pk, room['room_number'])].pk
+            key = (room_id, bed['label'])
+            if key in existing_beds or key in new_beds:
+                continue
+            if bed['iot_meter_id'] and bed['iot_meter_id'] in taken_meters:
+                errors.append((line_number, f"iot_meter_id {bed['iot_meter_id']!r} already in use"))
+                continue
+            if bed['iot_meter_id']:
+                taken_meters.add(bed['iot_meter_id'])
+            new_beds[key] = Bed(room_id=room_id, **bed)
+        Bed.objects.bulk_create(new_beds.values())
+        created['beds'] = len(new_beds)
+
+        # bulk_create skips the signals that maintain the availability index and rollups
+        for property_id in property_ids:
+            availability_index.rebuild_property(property_id)
+            portfolio_rollups.reconcile_property(property_id)
+        portfolio_rollups.reconcile_owner(owner_id)
+
+    return created, errors
+
+
+def progress_path(path):
+    return Path(f"{path}.progress.json")
+
+
+def errors_path(path):
+    return Path(f"{path}.errors.jsonl")
+
+
+def load_progress(path):
+    progress_file = progress_path(path)
+    if progress_file.exists():
+        return json.loads(progress_file.read_text())
+    return {'rows_done': 0, 'properties': 0, 'rooms': 0, 'beds': 0, 'errors': 0}
+
+
+def reset_progress(path):
+    progress_path(path).unlink(missing_ok=True)
+    errors_path(path).unlink(missing_ok=True)
+
+
+def run_import(path, owner_id, chunk_size=1000, resume=True, on_progress=None):
+    """
+    Import a whole file chunk by chunk. Memory is bounded by chunk_size.
+    `on_progress(progress_dict)` is called after every committed chunk.
+    """
+    if not resume:
+        reset_progress(path)
+    progress = load_progress(path)
+    rows = read_rows(path)
+    skipped = progress['rows_done']
+    if skipped:
+        rows = islice(rows, skipped, None)
+
+    with errors_path(path).open('a', encoding='utf-8') as error_log:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            created, errors = import_chunk(owner_id, chunk)
+            for line_number, message in errors:
+                error_log.write(json.dumps({'line': line_number, 'error': message}) + '\n')
+            error_log.flush()
+
+            progress['rows_done'] += len(chunk)
+            progress['errors'] += len(errors)
+            for key, count in created.items():
+                progress[key] += count
+            progress_path(path).write_text(json.dumps(progress))
+            if on_progress is not None:
+                on_progress(progress)
+    return progress
@@ -0,0 +1,262 @@
+"""
+Monthly per-bed electricity billing (USP #5).
+
+A room's consumption for the month (sum of its beds' meter deltas, from
+MeterReadingBucket) is split across its occupancy periods in proportion to
+occupied days. A bed has one period for its current tenant and, if it changed
+hands during the month, one for the tenant who left (Bed.last_tenant, up to
+last_occupied_date), so each tenant is billed for their own days: one bill per
+(bed, tenant, month). Everything for a property is loaded in two queries and
+apportioned with NumPy over whole arrays; bills are written in bulk.
+
+Rounding is deterministic: amounts are integer paise, a room's total is rounded
+half-up once, and the paise left after flooring each share go to the periods with
+the largest remainders (ties broken by bed id, current tenant first), so the bills
+of a room always add up to exactly its total and a rerun produces the same figures.
+"""
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from apps.properties.models import Bed, ElectricityBill, MeterReadingBucket, Property
+
+DEFAULTS = {
+    'RATE_PER_UNIT': '8.00',
+}
+
+# Opening reading = last bucket before the month within this window
+OPENING_LOOKBACK = timedelta(days=31)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'ELECTRICITY_BILLING', {})}
+
+
+def month_bounds(month):
+    """'YYYY-MM' -> (first day, first day of the next month)."""
+    year, month_number = (int(part) for part in month.split('-'))
+    start = date(year, month_number, 1)
+    end = date(year + month_number // 12, month_number % 12 + 1, 1)
+    return start, end
+
+
+def occupancy_periods(month_start, month_end, has_tenant, check_in, exit_date, last_occupied, last_check_in=None):
+    """
+    (current tenant's days, departed tenant's days) per bed in [month_start, month_end).
+    Arrays of datetime64[D] (NaT for missing). A current tenant counts from check-in
+    (or the 1st) to their exit date inclusive (or month end); a previous tenant who
+    left during the month (last_occupied_date, set at check-out) counts from their
+    check-in (or the 1st) to that date. A turnover day both were in goes to the
+    tenant who left.
+    """
+    start = np.datetime64(month_start, 'D')
+    end = np.datetime64(month_end, 'D')
+    one = np.timedelta64(1, 'D')
+
+    tenant_from = np.where(np.isnat(check_in), start, np.maximum(check_in, start))
+    tenant_to = np.where(np.isnat(exit_date), end, np.minimum(exit_date + one, end))
+    tenant_days = np.clip((tenant_to - tenant_from).astype(np.int64), 0, None) * has_tenant
+
+    vacated = ~np.isnat(last_occupied) & (last_occupied >= start) & (last_occupied < end)
+    vacated_to = np.where(vacated, last_occupied + one, start)
+    if last_check_in is None:
+        vacated_from = np.full(len(vacated), start)
+    else:
+        # A check-in after the check-out belongs to a later stay elsewhere
+        known = ~np.isnat(last_check_in) & vacated & (last_check_in <= np.where(vacated, last_occupied, start))
+        vacated_from = np.where(known, np.maximum(last_check_in, start), start)
+    vacated_days = np.clip((vacated_to - vacated_from).astype(np.int64), 0, None)
+    overlap = np.minimum(vacated_to, tenant_to) - np.maximum(tenant_from, vacated_from)
+    overlap = np.clip(overlap.astype(np.int64), 0, None) * has_tenant * (vacated_days > 0)
+    return tenant_days - overlap, vacated_days
+
+
+def occupancy_days(month_start, month_end, has_tenant, check_in, exit_date, last_occupied, last_check_in=None):
+    """Days each bed was occupied in the month, by anyone (see occupancy_periods)."""
+    current, departed = occupancy_periods(month_start, month_end, has_tenant, check_in, exit_date, last_occupied, last_check_in)
+    return current + departed
+
+
+def apportion(room_index, bed_milli_kwh, days, rate_paise, tiebreak):
+    """
+    Split room consumption across shares (beds, or occupancy periods) by occupied days.
+
+    room_index: room number (0..R-1) per share; bed_milli_kwh: the meter consumption
+    in Wh each share contributes to its room (a bed's delta on one of its shares, 0
+    on the others); days: occupied days; tiebreak: distinct rank per share.
+    Returns (room_milli_kwh, units_milli_kwh, amount_paise) per share.
+    """
+    rooms = int(room_index.max()) + 1 if len(room_index) else 0
+    room_milli = np.zeros(rooms, dtype=np.int64)
+    np.add.at(room_milli, room_index, bed_milli_kwh)
+    room_days = np.zeros(rooms, dtype=np.int64)
+    np.add.at(room_days, room_index, days)
+    room_paise = (room_milli * rate_paise + 500) // 1000
+
+    bed_room_days = room_days[room_index]
+    billable = (bed_room_days > 0) & (days > 0)
+    denominator = np.where(bed_room_days > 0, bed_room_days, 1)
+
+    raw = room_paise[room_index] * days
+    amount = raw // denominator
+    remainder = raw % denominator
+    allocated = np.zeros(rooms, dtype=np.int64)
+    np.add.at(allocated, room_index, amount)
+    leftover = room_paise - allocated
+
+    # Largest remainder first within each room, bed rank breaks ties
+    order = np.lexsort((tiebreak, -remainder, room_index))
+    sorted_rooms = room_index[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_rooms, sorted_rooms, side='left')
+    amount[order] += (rank < leftover[sorted_rooms]) & billable[order]
+
+    units = room_milli[room_index] * days // denominator
+    return room_milli[room_index], units, np.where(billable, amount, 0)
+
+
+def _load(bed_filter, month_start, month_end):
+    beds = list(Bed.objects.filter(bed_filter).values_list(
+        'id', 'room_id', 'last_occupied_date', 'current_tenant_id',
+        'current_tenant__check_in_date', 'current_tenant__exit_date',
+        'last_tenant_id', 'last_tenant__check_in_date',
+    ))
+    opening_from = month_start - OPENING_LOOKBACK
+    readings = {
+        row['bed_id']: row
+        for row in MeterReadingBucket.objects.filter(
+            bed__in=Bed.objects.filter(bed_filter), bucket_start__gte=opening_from, bucket_start__lt=month_end,
+        ).values('bed_id').annotate(
+            closing=Max('last_kwh', filter=Q(bucket_start__gte=month_start)),
+            opening=Max('last_kwh', filter=Q(bucket_start__lt=month_start)),
+            first=Min('first_kwh', filter=Q(bucket_start__gte=month_start)),
+        )
+    }
+    return beds, readings
+
+
+def _meter_deltas(bed_ids, readings):
+    """Wh consumed per bed in the month: closing minus opening (or the month's first reading)."""
+    closing = np.array([float((readings.get(bed_id) or {}).get('closing') or 0) for bed_id in bed_ids])
+    opening = np.array([
+        float(row.get('opening') if row.get('opening') is not None else row.get('first') or 0) if row else 0.0
+        for row in (readings.get(bed_id) for bed_id in bed_ids)
+    ])
+    has_month = np.array([bool(readings.get(bed_id) and readings[bed_id].get('closing') is not None) for bed_id in bed_ids])
+    delta = np.where(has_month, np.rint((closing - opening) * 1000), 0).astype(np.int64)
+    return np.clip(delta, 0, None)
+
+
+@transaction.atomic
+def compute_bills(bed_filter, month, rate_per_unit=None):
+    """
+    Bill every occupancy period of the beds matching `bed_filter` (a Q on Bed) for
+    `month`; returns a summary. Bills of periods that no longer exist are removed.
+    """
+    month_start, month_end = month_bounds(month)
+    rate = Decimal(str(rate_per_unit or get_config()['RATE_PER_UNIT'])).quantize(Decimal('0.01'))
+    beds, readings = _load(bed_filter, month_start, month_end)
+    if not beds:
+        return {'month': month, 'beds': 0, 'billed': 0, 'total': Decimal('0.00')}
+
+    bed_ids, room_ids, last_occupied, tenant_ids, check_ins, exits, last_tenant_ids, last_check_ins = zip(*beds)
+    current_days, departed_days = occupancy_periods(
+        month_start, month_end,
+        np.array([tenant_id is not None for tenant_id in tenant_ids]),
+        np.array(check_ins, dtype='datetime64[D]'),
+        np.array(exits, dtype='datetime64[D]'),
+        np.array(last_occupied, dtype='datetime64[D]'),
+        np.array(last_check_ins, dtype='datetime64[D]'),
+    )
+    # Checked out and back into the same bed: one tenant, one period
+    same = np.array([a is not None and a == b for a, b in zip(tenant_ids, last_tenant_ids)], dtype=bool)
+    current_days = current_days + np.where(same, departed_days, 0)
+    departed_days = np.where(same, 0, departed_days)
+
+    # One share per bed for the current tenant (carrying the bed's meter delta), plus one
+    # per bed that changed hands for the tenant who left
+    departed = np.flatnonzero(departed_days > 0)
+    share_bed = np.concatenate([np.arange(len(bed_ids)), departed])
+    share_tenants = list(tenant_ids) + [last_tenant_ids[i] for i in departed]
+    days = np.concatenate([current_days, departed_days[departed]]).astype(np.int64)
+    milli = np.concatenate([_meter_deltas(bed_ids, readings), np.zeros(len(departed), dtype=np.int64)])
+    _, room_index = np.unique(np.array([str(room_ids[i]) for i in share_bed]), return_inverse=True)
+    bed_rank = np.argsort(np.argsort(np.array([str(bed_id) for bed_id in bed_ids])))
+    tiebreak = bed_rank[share_bed] * 2 + (np.arange(len(share_bed)) >= len(bed_ids))
+    room_milli, units, amount = apportion(room_index.astype(np.int64), milli, days, int(rate * 100), tiebreak)
+
+    existing = {
+        (bed_id, tenant_id): pk
+        for pk, bed_id, tenant_id in ElectricityBill.objects.select_for_update().filter(
+            bed_id__in=bed_ids, billing_month=month,
+        ).values_list('pk', 'bed_id', 'tenant_id')
+    }
+    now = timezone.now()
+    changed, created = [], []
+    for i, bed_position in enumerate(share_bed):
+        if days[i] <= 0:
+            continue
+        bed_id, tenant_id = bed_ids[bed_position], share_tenants[i]
+        pk = existing.pop((bed_id, tenant_id), None)
+        (created if pk is None else changed).append(ElectricityBill(
+            id=pk or uuid.uuid4(),
+            bed_id=bed_id,
+            tenant_id=tenant_id,
+            billing_month=month,
+            room_units=Decimal(int(room_milli[i])) / 1000,
+            units_consumed=Decimal(int(units[i])) / 1000,
+            occupied_days=int(days[i]),
+            rate_per_unit=rate,
+            cost_calculated=Decimal(int(amount[i])) / 100,
+            computed_at=now,
+        ))
+    # Matched on (bed, tenant) in Python: the tenant of a departed period may be gone (NULL)
+    if existing:
+        ElectricityBill.objects.filter(pk__in=existing.values()).delete()
+    ElectricityBill.objects.bulk_update(
+        changed,
+        ['room_units', 'units_consumed', 'occupied_days', 'rate_per_unit', 'cost_calculated', 'computed_at'],
+        batch_size=2000,
+    )
+    ElectricityBill.objects.bulk_create(created, batch_size=2000)
+    return {
+        'month': month,
+        'beds': len(bed_ids),
+        'billed': len(changed) + len(created),
+        'total': Decimal(int(amount.sum())) / 100,
+    }
+
+
+def bill_property(property_id, month, rate_per_unit=None):
+    return compute_bills(Q(room__property_id=property_id), month, rate_per_unit)
+
+
+def rebill_room(room_id, month, rate_per_unit=None):
+    """Incremental re-bill after a correction: only the affected room is reloaded and rewritten."""
+    return compute_bills(Q(room_id=room_id), month, rate_per_unit)
+
+
+def bill_month(month, rate_per_unit=None):
+    """Bill every IoT-enabled property, one property per transaction."""
+    summaries = []
+    for property_id in Property.objects.filter(iot_enabled=True).values_list('id', flat=True).iterator():
+        summaries.append(bill_property(property_id, month, rate_per_unit))
+    return summaries
+
+
+def readings_corrected(room_months):
+    """
+    (room_id, 'YYYY-MM') pairs whose readings changed after the fact: queue a re-bill
+    for those that were already billed.
+    """
+    from apps.properties.tasks import rebill_room_electricity
+
+    for room_id, month in set(room_months):
+        if ElectricityBill.objects.filter(bed__room_id=room_id, billing_month=month).exists():
+            transaction.on_commit(lambda room_id=room_id, month=month: rebill_room_electricity.delay(str(room_id), month))
@@ -0,0 +1,69 @@
+import numpy as np
+from django.db.models import Exists, OuterRef, Q
+
+from apps.properties.models import BedAvailability, Property
+from shared.utils import geohash
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distance from one point to arrays of points, in km."""
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlng = np.radians(longitudes - longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * geohash.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def candidates(latitude, longitude, radius_km, property_type=None, vacant_only=False):
+    """
+    Properties inside the circle's bounding box, narrowed first by geohash prefix
+    (indexed range scans) and then by the lat/lng box.
+    """
+    min_lat, max_lat, min_lng, max_lng = geohash.bounding_box(latitude, longitude, radius_km)
+    prefix_filter = Q()
+    for prefix in geohash.covering_prefixes(latitude, longitude, radius_km):
+        prefix_filter |= Q(geohash__startswith=prefix)
+
+    queryset = Property.objects.filter(
+        prefix_filter,
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng,
+    )
+    if property_type:
+        queryset = queryset.filter(property_type=property_type)
+    if vacant_only:
+        queryset = queryset.filter(Exists(BedAvailability.objects.filter(property_id=OuterRef('pk'), vacant_beds__gt=0)))
+    return queryset
+
+
+def search_nearby(latitude, longitude, radius_km, property_type=None, vacant_only=False, page=1, page_size=20):
+    """
+    Properties within radius_km, nearest first. Exact distances are computed for
+    the whole prefiltered set in one vectorized pass; only the requested page of
+    Property rows is then loaded.
+    Returns {'count': int, 'results': [(Property, distance_km), ...]}.
+    """
+    rows = list(
+        candidates(latitude, longitude, radius_km, property_type, vacant_only)
+        .values_list('id', 'latitude', 'longitude')
+    )
+    if not rows:
+        return {'count': 0, 'results': []}
+
+    ids = np.array([row[0] for row in rows], dtype=object)
+    coords = np.array([(row[1], row[2]) for row in rows], dtype=np.float64)
+    distances = haversine_km(latitude, longitude, coords[:, 0], coords[:, 1])
+
+    inside = distances <= radius_km
+    ids, distances = ids[inside], distances[inside]
+    order = np.argsort(distances, kind='stable')
+
+    start = (page - 1) * page_size
+    page_order = order[start:start + page_size]
+    page_ids = list(ids[page_order])
+    properties = Property.objects.in_bulk(page_ids)
+    return {
+        'count': int(inside.sum()),
+        'results': [(properties[pk], float(distances[i])) for pk, i in zip(page_ids, page_order) if pk in properties],
+    }
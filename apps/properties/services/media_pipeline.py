@@ -0,0 +1,356 @@
+"""
+Image pipeline for KYC documents, check-in/inspection photos and room/property galleries.
+
+Uploads are streamed to MEDIA_ROOT while being hashed, so the request thread only
+reads the image header and never decodes pixels. Identical content (same sha256)
+is stored and processed once, however many profiles or rooms reference it.
+
+Decoding and resizing run outside the web workers: in Celery (process_media_assets,
+fanned out CHUNK_SIZE assets per task, since prefork children cannot start process
+pools of their own) or, for backfills and retries, in a ProcessPoolExecutor
+(manage.py process_pending_media). Each asset gets a square thumbnail and
+responsive widths in WebP and JPEG with EXIF stripped. Finished assets are written
+into their target fields with one locked bulk_update per model.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import defaultdict
+from itertools import repeat
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.properties.models import MediaAsset, MediaAttachment, Property, Room
+from apps.properties.services import public_listing
+from apps.users.models import TenantProfile
+
+DEFAULTS = {
+    'WIDTHS': (320, 640, 1280, 1920),
+    'THUMBNAIL_SIZE': 200,
+    'WEBP_QUALITY': 80,
+    'JPEG_QUALITY': 82,
+    'MAX_UPLOAD_BYTES': 15 * 1024 * 1024,
+    'MAX_PIXELS': 50_000_000,
+    'MAX_FILES_PER_REQUEST': 50,
+    'CHUNK_SIZE': 8,            # assets per Celery task
+    'WORKERS': None,            # process pool size for process_pending_media; None = CPU count
+    'BATCH_SIZE': 500,
+}
+
+ORIGINALS_DIR = 'uploads/originals'
+DERIVED_DIR = 'uploads/derived'
+TMP_DIR = 'uploads/tmp'
+
+FORMATS = {'JPEG': 'jpg', 'MPO': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+SINGLE, LIST = 'single', 'list'
+
+# target_type -> (model, {field: kind})
+TARGETS = {
+    'TENANT': (TenantProfile, {
+        'aadhaar_url': SINGLE,
+        'id_proof_url': SINGLE,
+        'check_in_photos': LIST,
+        'room_inspection_photos': LIST,
+    }),
+    'ROOM': (Room, {'images_url': LIST}),
+    'PROPERTY': (Property, {'images_url': LIST}),
+}
+
+
+class UploadRejected(ValueError):
+    pass
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'MEDIA_PIPELINE', {})}
+
+
+def media_url(relative):
+    return f"{settings.MEDIA_URL}{relative}"
+
+
+def _probe(path, config):
+    """Format and size from the header only; Pillow decodes pixels lazily."""
+    try:
+        with Image.open(path) as image:
+            fmt, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, OSError):
+        raise UploadRejected("Not a supported image")
+    if fmt not in FORMATS:
+        raise UploadRejected(f"Unsupported image format {fmt}")
+    if width * height > config['MAX_PIXELS']:
+        raise UploadRejected("Image dimensions are too large")
+    return fmt, width, height
+
+
+def store_upload(upload, user=None):
+    """
+    Stream an UploadedFile to MEDIA_ROOT, hashing as it goes.
+    Returns (asset, created); a known hash reuses the existing asset and discards the copy.
+    """
+    config = get_config()
+    media_root = Path(settings.MEDIA_ROOT)
+    tmp_dir = media_root / TMP_DIR
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as handle:
+        tmp_path = Path(handle.name)
+        try:
+            for chunk in upload.chunks():
+                size += len(chunk)
+                if size > config['MAX_UPLOAD_BYTES']:
+                    raise UploadRejected(f"{upload.name} exceeds {config['MAX_UPLOAD_BYTES'] // (1024 * 1024)} MB")
+                digest.update(chunk)
+                handle.write(chunk)
+        except BaseException:
+            handle.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    sha = digest.hexdigest()
+    existing = MediaAsset.objects.filter(sha256=sha).first()
+    if existing is not None:
+        tmp_path.unlink(missing_ok=True)
+        return existing, False
+
+    try:
+        fmt, width, height = _probe(tmp_path, config)
+    except UploadRejected:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    relative = f"{ORIGINALS_DIR}/{sha[:2]}/{sha}.{FORMATS[fmt]}"
+    destination = media_root / relative
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp_path, destination)
+
+    try:
+        with transaction.atomic():
+            asset = MediaAsset.objects.create(
+                sha256=sha,
+                original_path=relative,
+                content_type=Image.MIME[fmt],
+                size_bytes=size,
+                width=width,
+                height=height,
+                uploaded_by=user,
+            )
+    except IntegrityError:
+        # Same content uploaded concurrently; the file on disk is byte-identical
+        return MediaAsset.objects.get(sha256=sha), False
+    return asset, True
+
+
+def _flatten(image):
+    if image.mode == 'RGB':
+        return image
+    if image.mode in ('RGBA', 'LA', 'P'):
+        rgba = image.convert('RGBA')
+        background = Image.new('RGB', rgba.size, 'white')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _save(image, directory, relative_dir, name, webp_quality, jpeg_quality):
+    image.save(directory / f"{name}.webp", 'WEBP', quality=webp_quality)
+    image.save(directory / f"{name}.jpg", 'JPEG', quality=jpeg_quality, optimize=True, progressive=True)
+    return {'webp': f"{relative_dir}/{name}.webp", 'jpeg': f"{relative_dir}/{name}.jpg"}
+
+
+def render_variants(media_root, original_path, sha, widths, thumbnail_size, webp_quality, jpeg_quality):
+    """
+    Decode one original and write its derived files (runs in a pool or Celery worker).
+    Widths are produced largest first, each resized from the previous one, and never upscaled.
+    """
+    media_root = Path(media_root)
+    relative_dir = f"{DERIVED_DIR}/{sha[:2]}/{sha}"
+    directory = media_root / relative_dir
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(media_root / original_path) as source:
+        width, height = source.size
+        rotated = source.getexif().get(0x0112) in (5, 6, 7, 8)
+        if rotated:
+            width, height = height, width
+        # JPEG only: let the decoder downscale by 1/2..1/8 while the (oriented) width stays >= the largest target
+        source.draft('RGB', (1, max(widths)) if rotated else (max(widths), 1))
+        image = _flatten(ImageOps.exif_transpose(source))
+
+    variants = {}
+    current = image
+    for target in sorted({min(target, image.width) for target in widths}, reverse=True):
+        if target != current.width:
+            current = current.resize(
+                (target, max(1, round(current.height * target / current.width))),
+                Image.Resampling.LANCZOS,
+                reducing_gap=3.0,
+            )
+        variants[f"w{target}"] = {
+            **_save(current, directory, relative_dir, f"w{target}", webp_quality, jpeg_quality),
+            'width': current.width,
+            'height': current.height,
+        }
+    side = min(thumbnail_size, current.width, current.height)
+    thumbnail = ImageOps.fit(current, (side, side), Image.Resampling.LANCZOS)
+    variants['thumb'] = {
+        **_save(thumbnail, directory, relative_dir, 'thumb', webp_quality, jpeg_quality),
+        'width': thumbnail.width,
+        'height': thumbnail.height,
+    }
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+def _render_safely(*args):
+    try:
+        return render_variants(*args)
+    except Exception as exc:
+        return {'error': f"{type(exc).__name__}: {exc}"}
+
+
+def render_args(assets, config=None):
+    """Argument columns for render_variants over many assets, for map()/pool.map()."""
+    config = config or get_config()
+    return (
+        repeat(str(settings.MEDIA_ROOT)),
+        [asset.original_path for asset in assets],
+        [asset.sha256 for asset in assets],
+        repeat(tuple(config['WIDTHS'])),
+        repeat(config['THUMBNAIL_SIZE']),
+        repeat(config['WEBP_QUALITY']),
+        repeat(config['JPEG_QUALITY']),
+    )
+
+
+def process_assets(asset_ids, pool=None):
+    """
+    Render every PENDING asset among `asset_ids` (in `pool` when given, else inline),
+    record the outcome in one bulk_update and apply their attachments.
+    """
+    config = get_config()
+    assets = list(MediaAsset.objects.filter(pk__in=asset_ids, status='PENDING').only('id', 'sha256', 'original_path'))
+    if assets:
+        mapper = pool.map if pool is not None else map
+        results = mapper(_render_safely, *render_args(assets, config))
+        now = timezone.now()
+        for asset, result in zip(assets, results):
+            asset.processed_at = now
+            if 'error' in result:
+                asset.status, asset.error = 'FAILED', result['error']
+                continue
+            asset.status, asset.error = 'READY', None
+            asset.width, asset.height, asset.variants = result['width'], result['height'], result['variants']
+        MediaAsset.objects.bulk_update(
+            assets, ['status', 'error', 'width', 'height', 'variants', 'processed_at'], batch_size=config['BATCH_SIZE'],
+        )
+    # Also covers attachments created after an asset had already finished
+    apply_attachments(asset_ids)
+    return sum(1 for asset in assets if asset.status == 'READY')
+
+
+def image_entry(asset):
+    """What a gallery field stores for one image."""
+    sized = sorted((variant for name, variant in asset.variants.items() if name != 'thumb'), key=lambda v: v['width'])
+    return {
+        'asset': str(asset.pk),
+        'url': media_url(sized[-1]['jpeg']),
+        'thumbnail': media_url(asset.variants['thumb']['webp']),
+        'width': asset.width,
+        'height': asset.height,
+        'srcset': {
+            fmt: ', '.join(f"{media_url(variant[fmt])} {variant['width']}w" for variant in sized)
+            for fmt in ('webp', 'jpeg')
+        },
+    }
+
+
+def _apply(row, field, kind, entry):
+    if kind == SINGLE:
+        setattr(row, field, entry['url'])
+        return
+    images = [
+        image for image in (getattr(row, field) or [])
+        if not (isinstance(image, dict) and image.get('asset') == entry['asset'])
+    ]
+    images.append(entry)
+    setattr(row, field, images)
+
+
+def _invalidate_listings(touched):
+    for room_id in touched.get('ROOM', ()):
+        public_listing.invalidate_room(room_id)
+    for property_id in touched.get('PROPERTY', ()):
+        public_listing.invalidate_property(property_id)
+
+
+def apply_attachments(asset_ids):
+    """Write READY assets into their pending target fields: one locked bulk_update per model."""
+    attachments = list(
+        MediaAttachment.objects.filter(asset_id__in=asset_ids, applied_at__isnull=True, asset__status='READY')
+        .select_related('asset')
+        .order_by('created_at')
+    )
+    if not attachments:
+        return 0
+
+    grouped = defaultdict(lambda: defaultdict(list))
+    for attachment in attachments:
+        grouped[attachment.target_type][attachment.target_id].append(attachment)
+
+    touched = {}
+    batch_size = get_config()['BATCH_SIZE']
+    with transaction.atomic():
+        for target_type, by_target in grouped.items():
+            model, fields = TARGETS[target_type]
+            names = sorted({attachment.field for pending in by_target.values() for attachment in pending})
+            rows = list(model.objects.select_for_update().filter(pk__in=by_target.keys()).only('pk', *names))
+            for row in rows:
+                for attachment in by_target[row.pk]:
+                    _apply(row, attachment.field, fields[attachment.field], image_entry(attachment.asset))
+            model.objects.bulk_update(rows, names, batch_size=batch_size)
+            touched[target_type] = [row.pk for row in rows]
+        # Attachments whose target has since been deleted are settled too
+        MediaAttachment.objects.filter(pk__in=[attachment.pk for attachment in attachments]).update(applied_at=timezone.now())
+        transaction.on_commit(lambda: _invalidate_listings(touched))
+    return len(attachments)
+
+
+def attach_uploads(uploads, target_type, target_id, field, user=None):
+    """
+    Store `uploads` and link them to target_type/target_id.field. Returns the
+    (asset, created) pairs and the asset ids still to be rendered; duplicates of
+    already-processed images are applied straight away.
+    """
+    _, fields = TARGETS[target_type]
+    if field not in fields:
+        raise UploadRejected(f"{field} is not an image field of {target_type.lower()}")
+    if fields[field] == SINGLE and len(uploads) != 1:
+        raise UploadRejected(f"{field} takes a single image")
+
+    stored = [store_upload(upload, user) for upload in uploads]
+    failed = [asset for asset, _ in stored if asset.status == 'FAILED']
+    if failed:
+        raise UploadRejected(f"{len(failed)} image(s) could not be processed previously")
+
+    assets = list({asset.pk: asset for asset, _ in stored}.values())
+    MediaAttachment.objects.bulk_create([
+        MediaAttachment(asset=asset, target_type=target_type, target_id=target_id, field=field)
+        for asset in assets
+    ])
+    statuses = dict(MediaAsset.objects.filter(pk__in=[asset.pk for asset in assets]).values_list('pk', 'status'))
+    apply_attachments([pk for pk, status in statuses.items() if status == 'READY'])
+    pending = [str(pk) for pk, status in statuses.items() if status == 'PENDING']
+    return stored, pending
+
+
+def chunked(ids, size=None):
+    size = size or get_config()['CHUNK_SIZE']
+    ids = list(ids)
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
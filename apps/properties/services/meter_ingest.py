@@ -0,0 +1,288 @@
+"""
+Smart-meter reading ingestion.
+
+Readings (meter_id, cumulative kWh, epoch seconds) are resolved to beds through an
+in-memory iot_meter_id map and folded into per-(bed, bucket) aggregates in memory.
+flush() writes all touched buckets in three statements: insert missing bucket rows
+(ignore_conflicts), lock the rows, bulk_update the merged values - so concurrent
+writers (several HTTP workers, a UDP listener) merge instead of overwriting.
+Room.electricity_reading is refreshed at most once per ROOM_DEBOUNCE seconds per room.
+
+The monotonicity check (a bed's readings must move forward in time and kWh) uses
+state local to one ingestor, i.e. one process. Readings for the same meter that
+reach different workers are not checked against each other; flush() still keeps
+the earliest and latest sample of each bucket by timestamp, so only sample_count
+can include such cross-process duplicates. Route a meter to a single listener
+where exact counts matter.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from apps.properties.models import Bed, MeterReadingBucket, Room
+from apps.properties.services import electricity_billing
+
+DEFAULTS = {
+    'BUCKET_SECONDS': 3600,
+    'BATCH_SIZE': 20000,          # flush once this many buckets are dirty
+    'FLUSH_INTERVAL': 2.0,        # ... or after this many seconds (listener)
+    'MAP_REFRESH_INTERVAL': 300,  # full reload of the meter -> bed map
+    'MAP_MISS_RELOAD': 30,        # an unknown meter triggers a reload at most this often
+    'ROOM_DEBOUNCE': 300,
+    'MAX_CLOCK_SKEW': 300,        # readings further in the future are rejected
+    'API_KEYS': (),
+}
+
+KWH = Decimal('0.001')
+ROOM_KWH = Decimal('0.01')
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'IOT_INGEST', {})}
+
+
+class MeterMap:
+    """iot_meter_id -> (bed_id, room_id), reloaded periodically and (rate limited) on unknown meters."""
+
+    def __init__(self, refresh_interval, miss_reload):
+        self.refresh_interval = refresh_interval
+        self.miss_reload = miss_reload
+        self._map = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def reload(self):
+        # One thread queries; the others keep resolving against the current map
+        # (only the first load makes them wait)
+        requested_at = time.monotonic()
+        if not self._lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self._loaded_at is not None and self._loaded_at >= requested_at:
+                return  # loaded by another thread while this one waited
+            rows = Bed.objects.filter(iot_meter_id__isnull=False).values_list('iot_meter_id', 'id', 'room_id')
+            self._map = {meter_id: (bed_id, room_id) for meter_id, bed_id, room_id in rows.iterator(chunk_size=5000)}
+            self._loaded_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def resolve(self, meter_id):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > self.refresh_interval:
+            self.reload()
+        hit = self._map.get(meter_id)
+        if hit is None and now - self._loaded_at > self.miss_reload:
+            self.reload()
+            hit = self._map.get(meter_id)
+        return hit
+
+    def __len__(self):
+        return len(self._map)
+
+
+def _merge(a, b):
+    """Merge two [first_at, first_kwh, last_at, last_kwh, count] aggregates."""
+    if a is None:
+        return b
+    first = a if a[0] <= b[0] else b
+    last = a if a[2] >= b[2] else b
+    return [first[0], first[1], last[2], last[3], a[4] + b[4]]
+
+
+def _to_datetime(epoch):
+    return datetime.fromtimestamp(epoch, tz=dt_timezone.utc)
+
+
+class MeterIngestor:
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self.meters = MeterMap(self.config['MAP_REFRESH_INTERVAL'], self.config['MAP_MISS_RELOAD'])
+        self._buckets = {}
+        self._latest = {}           # bed_id -> (epoch, kwh) for monotonicity checks
+        self._room_of = {}
+        self._dirty_rooms = set()
+        self._room_written = {}
+        self._lock = threading.Lock()
+        self.counters = {'accepted': 0, 'unknown_meter': 0, 'rejected': 0, 'buckets_written': 0, 'rooms_written': 0}
+
+    def ingest(self, readings):
+        """
+        Fold (meter_id, kwh, epoch_seconds) tuples into the pending buckets.
+        Returns per-call counts of accepted / unknown_meter / rejected readings.
+        """
+        bucket_seconds = self.config['BUCKET_SECONDS']
+        horizon = time.time() + self.config['MAX_CLOCK_SKEW']
+        result = {'accepted': 0, 'unknown_meter': 0, 'rejected': 0}
+        # Resolve first: a map reload queries the database and must not hold up other writers
+        resolved = [(self.meters.resolve(meter_id), kwh, epoch) for meter_id, kwh, epoch in readings]
+        with self._lock:
+            buckets = self._buckets
+            latest = self._latest
+            for target, kwh, epoch in resolved:
+                if target is None:
+                    result['unknown_meter'] += 1
+                    continue
+                bed_id, room_id = target
+                previous = latest.get(bed_id)
+                # Cumulative meters never go backwards; equal timestamps are duplicates
+                if epoch > horizon or (previous is not None and (epoch <= previous[0] or kwh < previous[1])):
+                    result['rejected'] += 1
+                    continue
+                latest[bed_id] = (epoch, kwh)
+                key = (bed_id, int(epoch // bucket_seconds) * bucket_seconds)
+                entry = buckets.get(key)
+                if entry is None:
+                    buckets[key] = [epoch, kwh, epoch, kwh, 1]
+                else:
+                    entry[2] = epoch
+                    entry[3] = kwh
+                    entry[4] += 1
+                self._room_of[bed_id] = room_id
+                self._dirty_rooms.add(room_id)
+                result['accepted'] += 1
+            for key, value in result.items():
+                self.counters[key] += value
+        return result
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def pending(self):
+        return len(self._buckets)
+
+    def flush(self):
+        """Write all pending buckets, then any debounced room readings that are due. Returns buckets written."""
+        with self._lock:
+            buckets, self._buckets = self._buckets, {}
+        if buckets:
+            try:
+                self._write_buckets(buckets)
+            except Exception:
+                # Put them back (merged with anything ingested meanwhile) for the next flush
+                with self._lock:
+                    for key, entry in buckets.items():
+                        self._buckets[key] = _merge(self._buckets.get(key), entry)
+                raise
+            with self._lock:
+                self.counters['buckets_written'] += len(buckets)
+            self._rebill_late(buckets)
+        self._write_rooms()
+        return len(buckets)
+
+    def _write_buckets(self, buckets):
+        starts = {_to_datetime(start) for _, start in buckets}
+        bed_ids = {bed_id for bed_id, _ in buckets}
+        with transaction.atomic():
+            MeterReadingBucket.objects.bulk_create(
+                [
+                    MeterReadingBucket(
+                        bed_id=bed_id, bucket_start=_to_datetime(start),
+                        first_kwh=0, last_kwh=0, first_at=_to_datetime(start), last_at=_to_datetime(start),
+                        sample_count=0,
+                    )
+                    for bed_id, start in buckets
+                ],
+                ignore_conflicts=True,
+                batch_size=2000,
+            )
+            rows = MeterReadingBucket.objects.select_for_update().filter(bed_id__in=bed_ids, bucket_start__in=starts)
+            changed = []
+            for row in rows:
+                ours = buckets.get((row.bed_id, int(row.bucket_start.timestamp())))
+                if ours is None:
+                    continue
+                stored = None
+                if row.sample_count:
+                    stored = [row.first_at.timestamp(), float(row.first_kwh), row.last_at.timestamp(), float(row.last_kwh), row.sample_count]
+                merged = _merge(stored, ours)
+                row.first_at = _to_datetime(merged[0])
+                row.first_kwh = Decimal(repr(merged[1])).quantize(KWH)
+                row.last_at = _to_datetime(merged[2])
+                row.last_kwh = Decimal(repr(merged[3])).quantize(KWH)
+                row.sample_count = merged[4]
+                changed.append(row)
+            MeterReadingBucket.objects.bulk_update(
+                changed, ['first_at', 'first_kwh', 'last_at', 'last_kwh', 'sample_count'], batch_size=2000
+            )
+
+    def _rebill_late(self, buckets):
+        # Late readings for an earlier month change bills that may already be out
+        now = _to_datetime(time.time())
+        month_start = datetime(now.year, now.month, 1, tzinfo=dt_timezone.utc).timestamp()
+        late = {
+            (self._room_of[bed_id], _to_datetime(start).strftime('%Y-%m'))
+            for bed_id, start in buckets if start < month_start
+        }
+        if late:
+            electricity_billing.readings_corrected(late)
+
+    def _write_rooms(self, force=False):
+        now = time.monotonic()
+        debounce = self.config['ROOM_DEBOUNCE']
+        with self._lock:
+            due = {
+                room_id for room_id in self._dirty_rooms
+                if force or now - self._room_written.get(room_id, float('-inf')) >= debounce
+            }
+            self._dirty_rooms -= due
+        if not due:
+            return
+        # A room's reading is the sum of the latest cumulative reading of each of its beds
+        latest = MeterReadingBucket.objects.filter(bed_id=OuterRef('pk')).order_by('-bucket_start').values('last_kwh')[:1]
+        totals = {}
+        for room_id, kwh in Bed.objects.filter(room_id__in=due).annotate(kwh=Subquery(latest)).values_list('room_id', 'kwh'):
+            totals[room_id] = totals.get(room_id, Decimal('0')) + (kwh or 0)
+        Room.objects.bulk_update(
+            [Room(pk=room_id, electricity_reading=total.quantize(ROOM_KWH)) for room_id, total in totals.items()],
+            ['electricity_reading'],
+            batch_size=1000,
+        )
+        with self._lock:
+            for room_id in due:
+                self._room_written[room_id] = now
+            self.counters['rooms_written'] += len(totals)
+
+    def close(self):
+        """Flush everything, including room readings still inside their debounce window."""
+        self.flush()
+        self._write_rooms(force=True)
+
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+
+def get_ingestor():
+    global _ingestor
+    if _ingestor is None:
+        with _ingestor_lock:
+            if _ingestor is None:
+                _ingestor = MeterIngestor()
+    return _ingestor
+
+
+def parse_line(line):
+    """'meter_id,kwh,epoch_seconds' (the UDP/simulator wire format) -> tuple, or None if malformed."""
+    parts = line.split(',')
+    if len(parts) != 3:
+        return None
+    try:
+        kwh, epoch = float(parts[1]), float(parts[2])
+    except ValueError:
+        return None
+    if not valid_reading(kwh, epoch):
+        return None
+    return parts[0].strip(), kwh, epoch
+
+
+def valid_reading(kwh, epoch):
+    """Cumulative kWh and epoch seconds must be finite and non-negative ('nan', 'inf' parse as floats)."""
+    return math.isfinite(kwh) and math.isfinite(epoch) and kwh >= 0 and epoch >= 0
@@ -0,0 +1,188 @@
+"""
+Owner portfolio exports (properties, rooms, beds, tenants, staff) as CSV or XLSX.
+
+Each dataset is a single values_list query with its FK columns pulled in through
+joins, so a row costs no extra queries and no model instances. Rows are read in
+keyset batches on the primary key (WHERE pk > last ORDER BY pk LIMIT n): MySQL's
+default client buffers a whole result set even under .iterator(), whereas a
+keyset walk keeps memory bounded by one batch on any backend. The writers in
+shared.utils.streaming_export turn the rows into bytes as they are consumed, so
+the same generator feeds a StreamingHttpResponse or a file written by Celery.
+"""
+
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from apps.properties.models import Bed, Property, Room
+from apps.users.models import StaffProfile, TenantProfile
+from shared.utils import streaming_export
+
+DEFAULTS = {
+    'CHUNK_SIZE': 2000,
+    'FLUSH_EVERY': 1000,
+    'STREAM_MAX_ROWS': 200000,   # larger exports are refused inline and must run in the background
+    'EXPORT_DIR': None,          # defaults to MEDIA_ROOT/exports
+    'RETENTION_HOURS': 24,
+}
+
+FORMATS = {
+    'csv': (streaming_export.iter_csv, streaming_export.CSV_CONTENT_TYPE),
+    'xlsx': (streaming_export.iter_xlsx, streaming_export.XLSX_CONTENT_TYPE),
+}
+
+# dataset -> (model, owner lookup, [(header, field path)])
+DATASETS = {
+    'properties': (Property, 'owner_id', [
+        ('property_id', 'id'),
+        ('name', 'name'),
+        ('type', 'property_type'),
+        ('address', 'address'),
+        ('city', 'city'),
+        ('state', 'state'),
+        ('pincode', 'pincode'),
+        ('total_floors', 'total_floors'),
+        ('monthly_revenue', 'monthly_revenue'),
+        ('hygiene_score', 'hygiene_score'),
+        ('iot_enabled', 'iot_enabled'),
+        ('created_at', 'created_at'),
+    ]),
+    'rooms': (Room, 'property__owner_id', [
+        ('room_id', 'id'),
+        ('property', 'property__name'),
+        ('room_number', 'room_number'),
+        ('floor', 'floor'),
+        ('type', 'type'),
+        ('status', 'status'),
+        ('base_rent', 'base_rent'),
+        ('current_rent', 'current_rent'),
+        ('has_ac', 'has_ac'),
+        ('has_attached_bathroom', 'has_attached_bathroom'),
+        ('electricity_reading', 'electricity_reading'),
+        ('last_maintenance_date', 'last_maintenance_date'),
+    ]),
+    'beds': (Bed, 'room__property__owner_id', [
+        ('bed_id', 'id'),
+        ('property', 'room__property__name'),
+        ('room_number', 'room__room_number'),
+        ('label', 'label'),
+        ('is_occupied', 'is_occupied'),
+        ('tenant_phone', 'current_tenant__user__phone_number'),
+        ('tenant_first_name', 'current_tenant__user__first_name'),
+        ('tenant_last_name', 'current_tenant__user__last_name'),
+        ('last_occupied_date', 'last_occupied_date'),
+        ('iot_meter_id', 'iot_meter_id'),
+    ]),
+    'tenants': (TenantProfile, 'property__owner_id', [
+        ('tenant_id', 'id'),
+        ('first_name', 'user__first_name'),
+        ('last_name', 'user__last_name'),
+        ('phone_number', 'user__phone_number'),
+        ('email', 'user__email'),
+        ('property', 'property__name'),
+        ('room_number', 'room__room_number'),
+        ('bed', 'bed__label'),
+        ('check_in_date', 'check_in_date'),
+        ('exit_date', 'exit_date'),
+        ('wallet_balance', 'wallet_balance'),
+        ('pg_credit_score', 'pg_credit_score'),
+        ('police_verification_status', 'police_verification_status'),
+        ('guardian_name', 'guardian_name'),
+        ('guardian_phone', 'guardian_phone'),
+    ]),
+    'staff': (StaffProfile, 'property__owner_id', [
+        ('staff_id', 'id'),
+        ('first_name', 'user__first_name'),
+        ('last_name', 'user__last_name'),
+        ('phone_number', 'user__phone_number'),
+        ('property', 'property__name'),
+        ('role', 'role'),
+        ('salary', 'salary'),
+        ('contract_start_date', 'contract_start_date'),
+        ('contract_end_date', 'contract_end_date'),
+        ('employment_status', 'employment_status'),
+        ('police_verification_status', 'police_verification_status'),
+        ('joined_at', 'joined_at'),
+    ]),
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'PORTFOLIO_EXPORT', {})}
+
+
+def export_dir():
+    configured = get_config()['EXPORT_DIR']
+    return Path(configured) if configured else Path(settings.MEDIA_ROOT) / 'exports'
+
+
+def header(dataset):
+    return [name for name, _ in DATASETS[dataset][2]]
+
+
+def queryset(dataset, owner_id):
+    model, owner_lookup, columns = DATASETS[dataset]
+    return model.objects.filter(**{owner_lookup: owner_id}).values_list(*[path for _, path in columns])
+
+
+def count_rows(dataset, owner_id):
+    model, owner_lookup, _ = DATASETS[dataset]
+    return model.objects.filter(**{owner_lookup: owner_id}).count()
+
+
+def iter_rows(qs, chunk_size=None):
+    """
+    Walk a values_list queryset whose first column is the pk, `chunk_size` rows per query.
+    Only one batch of tuples is alive at a time.
+    """
+    chunk_size = chunk_size or get_config()['CHUNK_SIZE']
+    qs = qs.order_by('pk')
+    last = None
+    while True:
+        page = qs.filter(pk__gt=last) if last is not None else qs
+        batch = list(page[:chunk_size])
+        if not batch:
+            return
+        yield from batch
+        if len(batch) < chunk_size:
+            return
+        last = batch[-1][0]
+
+
+def iter_export(dataset, owner_id, fmt):
+    """Byte chunks of one dataset export for an owner."""
+    config = get_config()
+    writer, _ = FORMATS[fmt]
+    rows = iter_rows(queryset(dataset, owner_id), config['CHUNK_SIZE'])
+    return writer(header(dataset), rows, flush_every=config['FLUSH_EVERY'])
+
+
+def filename(dataset, fmt, export_id=None):
+    suffix = f"-{export_id}" if export_id else ''
+    return f"portfolio-{dataset}{suffix}.{fmt}"
+
+
+def purge_expired(now=None):
+    """Delete generated exports older than RETENTION_HOURS."""
+    directory = export_dir()
+    if not directory.exists():
+        return 0
+    cutoff = (now or time.time()) - get_config()['RETENTION_HOURS'] * 3600
+    removed = 0
+    for path in directory.glob('portfolio-*'):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def write_export(export_id, dataset, owner_id, fmt):
+    """Generate an export into EXPORT_DIR (used by the Celery task); returns (path, size)."""
+    directory = export_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / filename(dataset, fmt, export_id)
+    partial = path.with_suffix(path.suffix + '.part')
+    size = streaming_export.write_to_file(iter_export(dataset, owner_id, fmt), partial)
+    partial.replace(path)
+    return path, size
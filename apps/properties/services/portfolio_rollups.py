@@ -0,0 +1,195 @@
+"""
+Per-property and per-owner occupancy / rent-roll rollups.
+
+Bed and Room changes are turned into (total, occupied, rent) deltas and applied
+with F() updates, so dashboards read one row instead of aggregating an owner's
+whole portfolio. The legacy stored metrics Property.monthly_revenue and
+OwnerProfile.total_properties_count are kept in step. reconcile_* recomputes from
+source rows and corrects any drift left by writes that bypass signals.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.properties.models import Bed, OwnerStats, Property, PropertyStats
+from apps.users.models import OwnerProfile
+
+ZERO = Decimal('0.00')
+
+
+def bed_rent(room):
+    """Monthly rent charged per bed in a room."""
+    rent = room.current_rent if room.current_rent is not None else room.base_rent
+    return rent or ZERO
+
+
+def _bump(model, lookup, create_defaults, **deltas):
+    """
+    F() increment of a stats row, creating it on first use. A missing row is never
+    created from a negative delta: it was deleted along with its property or owner
+    (or has not been built yet), and reconcile_* restores it from source rows.
+    """
+    updates = {field: F(field) + value for field, value in deltas.items() if value}
+    if not updates:
+        return
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    if any(value < 0 for value in deltas.values()):
+        return
+    row, created = model.objects.get_or_create(**lookup, defaults={**create_defaults, **deltas})
+    if not created:
+        model.objects.filter(pk=row.pk).update(**updates)
+
+
+def apply_delta(property_id, total=0, occupied=0, rent=ZERO, owner_id=None):
+    """Shift a property's rollup, its owner's rollup and Property.monthly_revenue."""
+    if not total and not occupied and not rent:
+        return
+    if owner_id is None:
+        owner_id = Property.objects.filter(pk=property_id).values_list('owner_id', flat=True).first()
+        if owner_id is None:
+            return  # property is being deleted
+    _bump(PropertyStats, {'property_id': property_id}, {}, total_beds=total, occupied_beds=occupied, rent_roll=rent)
+    _bump(OwnerStats, {'owner_id': owner_id}, {'property_count': 0}, total_beds=total, occupied_beds=occupied, rent_roll=rent)
+    if rent:
+        Property.objects.filter(pk=property_id).update(monthly_revenue=F('monthly_revenue') + rent)
+
+
+def apply_deltas(deltas):
+    """
+    Many properties' deltas at once: {property_id: (total, occupied, rent)}. Rows are
+    bumped table by table in sorted key order (PropertyStats, OwnerStats, Property),
+    so concurrent batches take the shared counter locks in the same order.
+    """
+    owners = dict(Property.objects.filter(pk__in=list(deltas)).values_list('pk', 'owner_id'))
+    owner_deltas = {}
+    for property_id in sorted(owners, key=str):
+        total, occupied, rent = deltas[property_id]
+        _bump(PropertyStats, {'property_id': property_id}, {}, total_beds=total, occupied_beds=occupied, rent_roll=rent)
+        owner_total = owner_deltas.setdefault(owners[property_id], [0, 0, ZERO])
+        owner_total[0] += total
+        owner_total[1] += occupied
+        owner_total[2] += rent
+    for owner_id in sorted(owner_deltas, key=str):
+        total, occupied, rent = owner_deltas[owner_id]
+        _bump(OwnerStats, {'owner_id': owner_id}, {'property_count': 0}, total_beds=total, occupied_beds=occupied, rent_roll=rent)
+    for property_id in sorted(owners, key=str):
+        rent = deltas[property_id][2]
+        if rent:
+            Property.objects.filter(pk=property_id).update(monthly_revenue=F('monthly_revenue') + rent)
+
+
+def apply_bed(room, total=0, occupied=0):
+    """Delta for beds added/removed/(un)occupied in one room."""
+    apply_delta(room.property_id, total=total, occupied=occupied, rent=bed_rent(room) * occupied)
+
+
+def property_added(prop):
+    _bump(OwnerStats, {'owner_id': prop.owner_id}, {}, property_count=1)
+    OwnerProfile.objects.filter(pk=prop.owner_id).update(total_properties_count=F('total_properties_count') + 1)
+
+
+def property_rollup(property_id):
+    """(total_beds, occupied_beds, rent_roll) of a property's rollup row, or None."""
+    return PropertyStats.objects.filter(property_id=property_id).values_list(
+        'total_beds', 'occupied_beds', 'rent_roll'
+    ).first()
+
+
+def property_removed(owner_id, rollup=None):
+    """
+    A property was deleted. Its beds' deltas are skipped on that cascade, so its
+    last rollup (property_rollup() read before the delete) leaves the owner's totals here.
+    """
+    total, occupied, rent = rollup or (0, 0, ZERO)
+    OwnerStats.objects.filter(owner_id=owner_id).update(
+        property_count=F('property_count') - 1,
+        total_beds=F('total_beds') - total,
+        occupied_beds=F('occupied_beds') - occupied,
+        rent_roll=F('rent_roll') - rent,
+    )
+    OwnerProfile.objects.filter(pk=owner_id).update(total_properties_count=F('total_properties_count') - 1)
+
+
+def _actual_property_stats(property_id):
+    rent = Coalesce(F('room__current_rent'), F('room__base_rent'), output_field=DecimalField())
+    result = Bed.objects.filter(room__property_id=property_id).aggregate(
+        total_beds=Count('id'),
+        occupied_beds=Count('id', filter=Q(is_occupied=True)),
+        rent_roll=Sum(rent, filter=Q(is_occupied=True)),
+    )
+    result['rent_roll'] = result['rent_roll'] or ZERO
+    return result
+
+
+@transaction.atomic
+def reconcile_property(property_id):
+    """Recompute one property's rollup from Bed/Room. Returns True if it had drifted."""
+    actual = _actual_property_stats(property_id)
+    stats, created = PropertyStats.objects.select_for_update().get_or_create(property_id=property_id, defaults=actual)
+    drifted = created or any(getattr(stats, field) != value for field, value in actual.items())
+    PropertyStats.objects.filter(pk=stats.pk).update(reconciled_at=timezone.now(), **actual)
+    Property.objects.filter(pk=property_id).exclude(monthly_revenue=actual['rent_roll']).update(monthly_revenue=actual['rent_roll'])
+    return drifted
+
+
+@transaction.atomic
+def reconcile_owner(owner_id):
+    """Recompute an owner's rollup from their (already reconciled) property rollups."""
+    totals = PropertyStats.objects.filter(property__owner_id=owner_id).aggregate(
+        total_beds=Coalesce(Sum('total_beds'), 0),
+        occupied_beds=Coalesce(Sum('occupied_beds'), 0),
+        rent_roll=Coalesce(Sum('rent_roll'), ZERO, output_field=DecimalField()),
+    )
+    totals['property_count'] = Property.objects.filter(owner_id=owner_id).count()
+    stats, created = OwnerStats.objects.select_for_update().get_or_create(owner_id=owner_id, defaults=totals)
+    drifted = created or any(getattr(stats, field) != value for field, value in totals.items())
+    OwnerStats.objects.filter(pk=stats.pk).update(reconciled_at=timezone.now(), **totals)
+    OwnerProfile.objects.filter(pk=owner_id).exclude(total_properties_count=totals['property_count']).update(
+        total_properties_count=totals['property_count']
+    )
+    return drifted
+
+
+def reconcile_all(batch_size=500):
+    """Reconcile every property, then every owner. Returns the number of rows that had drifted."""
+    drifted = 0
+    for property_id in Property.objects.values_list('id', flat=True).iterator(chunk_size=batch_size):
+        drifted += reconcile_property(property_id)
+    for owner_id in OwnerProfile.objects.values_list('id', flat=True).iterator(chunk_size=batch_size):
+        drifted += reconcile_owner(owner_id)
+    return drifted
+
+
+def _dashboard(stats, **extra):
+    total = stats['total_beds'] if stats else 0
+    occupied = stats['occupied_beds'] if stats else 0
+    return {
+        **extra,
+        'total_beds': total,
+        'occupied_beds': occupied,
+        'vacant_beds': total - occupied,
+        'occupancy_rate': round(occupied / total, 4) if total else 0.0,
+        'rent_roll': stats['rent_roll'] if stats else ZERO,
+        'reconciled_at': stats['reconciled_at'] if stats else None,
+    }
+
+
+def property_dashboard(property_id):
+    """Dashboard numbers for one property from its single rollup row."""
+    stats = PropertyStats.objects.filter(property_id=property_id).values(
+        'total_beds', 'occupied_beds', 'rent_roll', 'reconciled_at'
+    ).first()
+    return _dashboard(stats, property_id=str(property_id))
+
+
+def owner_dashboard(owner_id):
+    """Dashboard numbers for an owner's whole portfolio from its single rollup row."""
+    stats = OwnerStats.objects.filter(owner_id=owner_id).values(
+        'property_count', 'total_beds', 'occupied_beds', 'rent_roll', 'reconciled_at'
+    ).first()
+    return _dashboard(stats, owner_id=str(owner_id), property_count=stats['property_count'] if stats else 0)
@@ -0,0 +1,34 @@
+"""
+Which properties an owner (SUPERADMIN) or manager may administer.
+
+Owners administer every property of their OwnerProfile; managers administer the
+property of their active StaffProfile. The helpers return querysets, so callers
+can use them as subqueries (`property_id__in=managed_properties(user).values('pk')`)
+without loading the ids first.
+"""
+
+from apps.properties.models import Property
+
+
+def managed_properties(user):
+    if user.role == 'SUPERADMIN':
+        return Property.objects.filter(owner__user_id=user.pk)
+    if user.role == 'MANAGER':
+        return Property.objects.filter(staffprofile__user_id=user.pk, staffprofile__employment_status='ACTIVE')
+    return Property.objects.none()
+
+
+def managed_property_ids(user):
+    return managed_properties(user).values('pk')
+
+
+def managed_owner_ids(user):
+    return managed_properties(user).values('owner_id').distinct()
+
+
+def can_manage_property(user, property_id):
+    return managed_properties(user).filter(pk=property_id).exists()
+
+
+def can_manage_owner(user, owner_id):
+    return managed_properties(user).filter(owner_id=owner_id).exists()
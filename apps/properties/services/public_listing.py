@@ -0,0 +1,155 @@
+"""
+Public bed share links (USP #3): GET /api/v1/properties/public/bed/<public_uid>/.
+
+Each bed's page is a denormalized snapshot of bed, room and property rendered
+once to JSON bytes, stored with its strong ETag in the shared cache and, for a few
+seconds, in a per-process TTLCache. A request is answered from the local cache
+(or one shared-cache GET); a matching If-None-Match gets a 304 from the same entry.
+Bed/Room/Property changes delete the snapshots of the affected beds; other
+processes may serve their local copy for at most LOCAL_TTL seconds more.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.properties.models import Bed
+from shared.utils import metrics
+from shared.utils.lru_cache import TTLCache
+
+DEFAULTS = {
+    'LOCAL_MAX_ENTRIES': 50000,
+    'LOCAL_TTL': 5,
+    'SHARED_TTL': 3600,
+    'MISSING_TTL': 60,
+    'MAX_AGE': 60,             # browsers
+    'S_MAXAGE': 300,           # CDN / shared caches
+    'STALE_WHILE_REVALIDATE': 600,
+}
+
+# Cache entries are (status, etag, body)
+NOT_FOUND = (404, None, b'{"success":false,"error":{"code":"RESOURCE_NOT_FOUND","message":"Link not found"}}')
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'PUBLIC_LISTING', {})}
+
+
+_config = get_config()
+local_cache = TTLCache(max_entries=_config['LOCAL_MAX_ENTRIES'], ttl=_config['LOCAL_TTL'])
+metrics.register_cache_stats('public_listing_local', local_cache.stats)
+
+
+def _key(public_uid):
+    return f"public-bed:{public_uid}"
+
+
+def build_snapshot(public_uid):
+    """Snapshot dict for a bed, or None. One query."""
+    bed = (
+        Bed.objects.filter(public_uid=public_uid)
+        .select_related('room__property')
+        .only(
+            'label', 'is_occupied', 'public_uid',
+            'room__room_number', 'room__floor', 'room__type', 'room__base_rent', 'room__current_rent',
+            'room__has_ac', 'room__has_balcony', 'room__has_wifi', 'room__has_attached_bathroom',
+            'room__window_count', 'room__carpet_area_sqft', 'room__images_url', 'room__status',
+            'room__property__name', 'room__property__address', 'room__property__city', 'room__property__state',
+            'room__property__pincode', 'room__property__property_type', 'room__property__latitude',
+            'room__property__longitude', 'room__property__images_url', 'room__property__hygiene_score',
+        )
+        .first()
+    )
+    if bed is None:
+        return None
+    room = bed.room
+    prop = room.property
+    return {
+        'public_uid': bed.public_uid,
+        'label': bed.label,
+        'is_available': not bed.is_occupied and room.status != 'MAINTENANCE',
+        'rent': room.current_rent if room.current_rent is not None else room.base_rent,
+        'room': {
+            'room_number': room.room_number,
+            'floor': room.floor,
+            'type': room.type,
+            'amenities': {
+                'ac': room.has_ac,
+                'balcony': room.has_balcony,
+                'wifi': room.has_wifi,
+                'attached_bathroom': room.has_attached_bathroom,
+            },
+            'window_count': room.window_count,
+            'carpet_area_sqft': room.carpet_area_sqft,
+            'images_url': room.images_url,
+        },
+        'property': {
+            'name': prop.name,
+            'address': prop.address,
+            'city': prop.city,
+            'state': prop.state,
+            'pincode': prop.pincode,
+            'property_type': prop.property_type,
+            'latitude': prop.latitude,
+            'longitude': prop.longitude,
+            'images_url': prop.images_url,
+            'hygiene_score': prop.hygiene_score,
+        },
+    }
+
+
+def render(snapshot):
+    body = json.dumps({'success': True, 'data': snapshot}, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    return 200, etag, body
+
+
+def get_listing(public_uid):
+    """(status, etag, body) for a share link; builds and caches the snapshot on a miss."""
+    key = _key(public_uid)
+    entry = local_cache.get(key)
+    if entry is not None:
+        return entry
+    entry = cache.get(key)
+    if entry is None:
+        snapshot = build_snapshot(public_uid)
+        config = get_config()
+        if snapshot is None:
+            entry = NOT_FOUND
+            cache.set(key, entry, config['MISSING_TTL'])
+        else:
+            entry = render(snapshot)
+            cache.set(key, entry, config['SHARED_TTL'])
+    local_cache.set(key, entry)
+    return entry
+
+
+def invalidate(public_uids):
+    keys = [_key(public_uid) for public_uid in public_uids if public_uid]
+    for key in keys:
+        local_cache.delete(key)
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_beds(bed_ids):
+    invalidate(Bed.objects.filter(pk__in=list(bed_ids)).values_list('public_uid', flat=True))
+
+
+def invalidate_room(room_id):
+    invalidate(Bed.objects.filter(room_id=room_id).values_list('public_uid', flat=True))
+
+
+def invalidate_property(property_id):
+    invalidate(Bed.objects.filter(room__property_id=property_id).values_list('public_uid', flat=True))
+
+
+def cache_control():
+    config = get_config()
+    return (
+        f"public, max-age={config['MAX_AGE']}, s-maxage={config['S_MAXAGE']}, "
+        f"stale-while-revalidate={config['STALE_WHILE_REVALIDATE']}"
+    )
@@ -0,0 +1,217 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.properties.models import Bed, BedAvailability, MeterReadingBucket, Property, Room
+from apps.properties.services import availability_index, electricity_billing, portfolio_rollups, public_listing
+from shared.utils import geohash
+
+
+def _cascade_from_property(origin):
+    """True when a delete cascades from a Property: its index rows and rollup go with it."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, Property)
+
+
+@receiver(pre_save, sender=Bed)
+def remember_bed_state(sender, instance, **kwargs):
+    # Previous (room_id, is_occupied) so post_save handlers can apply deltas
+    instance._prev_state = None
+    instance._prev_public_uid = None
+    if instance._state.adding:
+        return
+    row = Bed.objects.filter(pk=instance.pk).values_list('room_id', 'is_occupied', 'public_uid').first()
+    if row is not None:
+        instance._prev_state = row[:2]
+        instance._prev_public_uid = row[2]
+
+
+@receiver(post_save, sender=Bed)
+def update_availability_on_bed_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    prev = getattr(instance, '_prev_state', None)
+    vacant = 0 if instance.is_occupied else 1
+    if prev is None:
+        room = instance.room
+        availability_index.apply_delta(room.property_id, availability_index.room_facet(room), 1, vacant)
+        return
+
+    prev_room_id, prev_occupied = prev
+    prev_vacant = 0 if prev_occupied else 1
+    if prev_room_id == instance.room_id:
+        if vacant != prev_vacant:
+            room = instance.room
+            availability_index.apply_delta(room.property_id, availability_index.room_facet(room), 0, vacant - prev_vacant)
+        return
+
+    prev_room = Room.objects.filter(pk=prev_room_id).first()
+    if prev_room is not None:
+        availability_index.apply_delta(prev_room.property_id, availability_index.room_facet(prev_room), -1, -prev_vacant)
+    room = instance.room
+    availability_index.apply_delta(room.property_id, availability_index.room_facet(room), 1, vacant)
+
+
+@receiver(post_delete, sender=Bed)
+def update_availability_on_bed_delete(sender, instance, origin=None, **kwargs):
+    if _cascade_from_property(origin):
+        return
+    # Beds are collected before their room on cascades, so the room row still exists here
+    room = Room.objects.filter(pk=instance.room_id).first()
+    if room is None:
+        return
+    vacant = 0 if instance.is_occupied else 1
+    availability_index.apply_delta(room.property_id, availability_index.room_facet(room), -1, -vacant)
+
+
+@receiver(pre_save, sender=Room)
+def remember_room_state(sender, instance, **kwargs):
+    instance._prev_state = None
+    if instance._state.adding:
+        return
+    instance._prev_state = Room.objects.filter(pk=instance.pk).values(
+        'property_id', 'type', 'has_ac', 'has_attached_bathroom', 'current_rent', 'base_rent'
+    ).first()
+
+
+@receiver(post_save, sender=Room)
+def update_availability_on_room_save(sender, instance, created, raw=False, **kwargs):
+    prev = getattr(instance, '_prev_state', None)
+    if raw or prev is None:
+        return
+    prev_property_id = prev['property_id']
+    prev_facet = {'room_type': prev['type'], 'has_ac': prev['has_ac'], 'has_attached_bathroom': prev['has_attached_bathroom']}
+    facet = availability_index.room_facet(instance)
+    if prev_property_id == instance.property_id and prev_facet == facet:
+        return
+    total, vacant = availability_index.room_bed_counts(instance.pk)
+    availability_index.apply_delta(prev_property_id, prev_facet, -total, -vacant)
+    availability_index.apply_delta(instance.property_id, facet, total, vacant)
+
+
+@receiver(post_save, sender=Bed)
+def update_rollups_on_bed_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    prev = getattr(instance, '_prev_state', None)
+    occupied = int(instance.is_occupied)
+    if prev is None:
+        portfolio_rollups.apply_bed(instance.room, total=1, occupied=occupied)
+        return
+
+    prev_room_id, prev_occupied = prev
+    if prev_room_id == instance.room_id:
+        if occupied != int(prev_occupied):
+            portfolio_rollups.apply_bed(instance.room, occupied=occupied - int(prev_occupied))
+        return
+
+    prev_room = Room.objects.filter(pk=prev_room_id).first()
+    if prev_room is not None:
+        portfolio_rollups.apply_bed(prev_room, total=-1, occupied=-int(prev_occupied))
+    portfolio_rollups.apply_bed(instance.room, total=1, occupied=occupied)
+
+
+@receiver(post_delete, sender=Bed)
+def update_rollups_on_bed_delete(sender, instance, origin=None, **kwargs):
+    if _cascade_from_property(origin):
+        return
+    room = Room.objects.filter(pk=instance.room_id).first()
+    if room is not None:
+        portfolio_rollups.apply_bed(room, total=-1, occupied=-int(instance.is_occupied))
+
+
+@receiver(post_save, sender=Room)
+def update_rollups_on_room_save(sender, instance, created, raw=False, **kwargs):
+    prev = getattr(instance, '_prev_state', None)
+    if raw or prev is None:
+        return
+    prev_rent = prev['current_rent'] if prev['current_rent'] is not None else prev['base_rent']
+    rent = portfolio_rollups.bed_rent(instance)
+    if prev['property_id'] == instance.property_id and prev_rent == rent:
+        return
+    total, vacant = availability_index.room_bed_counts(instance.pk)
+    occupied = total - vacant
+    if prev['property_id'] == instance.property_id:
+        portfolio_rollups.apply_delta(instance.property_id, rent=(rent - prev_rent) * occupied)
+        return
+    portfolio_rollups.apply_delta(prev['property_id'], total=-total, occupied=-occupied, rent=-prev_rent * occupied)
+    portfolio_rollups.apply_delta(instance.property_id, total=total, occupied=occupied, rent=rent * occupied)
+
+
+@receiver(pre_save, sender=Property)
+def remember_property_owner(sender, instance, **kwargs):
+    instance._prev_owner_id = None
+    if not instance._state.adding:
+        instance._prev_owner_id = Property.objects.filter(pk=instance.pk).values_list('owner_id', flat=True).first()
+
+
+@receiver(post_save, sender=Property)
+def update_rollups_on_property_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        portfolio_rollups.property_added(instance)
+        return
+    prev_owner_id = getattr(instance, '_prev_owner_id', None)
+    if prev_owner_id is not None and prev_owner_id != instance.owner_id:
+        portfolio_rollups.reconcile_owner(prev_owner_id)
+        portfolio_rollups.reconcile_owner(instance.owner_id)
+
+
+@receiver(pre_delete, sender=Property)
+def remember_property_rollup(sender, instance, **kwargs):
+    # Read before the cascade fast-deletes PropertyStats
+    instance._prev_rollup = portfolio_rollups.property_rollup(instance.pk)
+
+
+@receiver(post_delete, sender=Property)
+def update_rollups_on_property_delete(sender, instance, **kwargs):
+    portfolio_rollups.property_removed(instance.owner_id, getattr(instance, '_prev_rollup', None))
+
+
+@receiver(post_save, sender=Property)
+def sync_availability_location(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    BedAvailability.objects.filter(property=instance).exclude(
+        city=instance.city, property_type=instance.property_type
+    ).update(city=instance.city, property_type=instance.property_type)
+
+
+@receiver(pre_save, sender=Property)
+def set_property_geohash(sender, instance, **kwargs):
+    if instance.latitude is None or instance.longitude is None:
+        instance.geohash = None
+    else:
+        instance.geohash = geohash.encode(float(instance.latitude), float(instance.longitude), precision=12)
+
+
+@receiver(post_save, sender=MeterReadingBucket)
+def rebill_on_reading_correction(sender, instance, created, raw=False, **kwargs):
+    # Ingestion writes buckets in bulk (no signals); this catches manual corrections
+    if raw or created:
+        return
+    room_id = Bed.objects.filter(pk=instance.bed_id).values_list('room_id', flat=True).first()
+    if room_id is not None:
+        electricity_billing.readings_corrected([(room_id, instance.bucket_start.strftime('%Y-%m'))])
+
+
+@receiver([post_save, post_delete], sender=Bed)
+def invalidate_public_listing_on_bed_change(sender, instance, **kwargs):
+    # A regenerated public_uid must stop serving the old link too; after commit, so
+    # a request in between cannot re-cache the old snapshot
+    uids = {instance.public_uid, getattr(instance, '_prev_public_uid', None)}
+    transaction.on_commit(lambda uids=uids: public_listing.invalidate(uids))
+
+
+@receiver(post_save, sender=Room)
+def invalidate_public_listing_on_room_change(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        transaction.on_commit(lambda room_id=instance.pk: public_listing.invalidate_room(room_id))
+
+
+@receiver(post_save, sender=Property)
+def invalidate_public_listing_on_property_change(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        transaction.on_commit(lambda property_id=instance.pk: public_listing.invalidate_property(property_id))
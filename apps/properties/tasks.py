@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+from celery import shared_task
+from django.core.cache import cache
+
+from apps.properties.services import bulk_import, electricity_billing, media_pipeline, portfolio_export, portfolio_rollups
+
+
+def import_status_key(import_id):
+    return f"inventory-import:{import_id}"
+
+
+@shared_task(bind=True, acks_late=True)
+def import_inventory(self, import_id, path, owner_id, chunk_size=1000, user_id=None):
+    """Run an uploaded inventory import; progress is published to the cache for the status endpoint."""
+    key = import_status_key(import_id)
+    base = {'user_id': user_id}
+
+    def publish(progress):
+        cache.set(key, {'status': 'RUNNING', **base, **progress}, 24 * 3600)
+
+    try:
+        progress = bulk_import.run_import(path, owner_id, chunk_size=chunk_size, on_progress=publish)
+    except Exception as exc:
+        cache.set(key, {'status': 'FAILED', 'error': str(exc), **base, **bulk_import.load_progress(path)}, 24 * 3600)
+        raise
+    cache.set(key, {'status': 'DONE', **base, **progress}, 24 * 3600)
+    return progress
+
+
+def export_status_key(export_id):
+    return f"portfolio-export:{export_id}"
+
+
+@shared_task(bind=True, acks_late=True)
+def export_portfolio(self, export_id, dataset, owner_id, fmt, user_id):
+    """Write a portfolio export under MEDIA_ROOT/exports for the download endpoint."""
+    key = export_status_key(export_id)
+    base = {'dataset': dataset, 'format': fmt, 'user_id': user_id}
+    ttl = portfolio_export.get_config()['RETENTION_HOURS'] * 3600
+    cache.set(key, {'status': 'RUNNING', **base}, ttl)
+    portfolio_export.purge_expired()
+    try:
+        path, size = portfolio_export.write_export(export_id, dataset, owner_id, fmt)
+    except Exception as exc:
+        cache.set(key, {'status': 'FAILED', 'error': str(exc), **base}, ttl)
+        raise
+    cache.set(key, {'status': 'DONE', 'path': str(path), 'size': size, **base}, ttl)
+    return size
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def process_media_assets(asset_ids):
+    """Render thumbnails/responsive sizes for a chunk of uploaded images and write their URLs back."""
+    return media_pipeline.process_assets(asset_ids)
+
+
+@shared_task(ignore_result=True)
+def reconcile_portfolio_rollups():
+    """Periodic drift correction for PropertyStats / OwnerStats (see CELERY_BEAT_SCHEDULE)."""
+    return portfolio_rollups.reconcile_all()
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def rebill_room_electricity(room_id, month):
+    """Recompute one room's electricity bills after a reading correction."""
+    return electricity_billing.rebill_room(room_id, month)
+
+
+@shared_task(ignore_result=True)
+def bill_previous_month_electricity():
+    """Monthly run (see CELERY_BEAT_SCHEDULE): bill last month for every IoT-enabled property."""
+    month = (date.today().replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
+    return len(electricity_billing.bill_month(month))
@@ -0,0 +1,92 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.properties.models import Bed, ElectricityBill, MeterReadingBucket, Property, Room
+from apps.properties.services import bed_assignment, electricity_billing
+from apps.users.models import CustomUser, OwnerProfile, TenantProfile
+
+
+def make_user(tag, role='TENANT'):
+    return CustomUser.objects.create(
+        username=f"user-{tag}", phone_number=f"9{tag:0>9}", email=f"user-{tag}@example.com", role=role,
+    )
+
+
+def add_bucket(bed, day, kwh):
+    moment = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    MeterReadingBucket.objects.create(
+        bed=bed, bucket_start=moment, first_kwh=kwh, last_kwh=kwh, first_at=moment, last_at=moment, sample_count=1,
+    )
+
+
+class TurnoverBillingTests(TestCase):
+    """
+    Bed A changes hands on 10 March: the tenant who left pays for 1-10 March and
+    the newcomer for 11-31 March. Bed B is occupied all month.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = OwnerProfile.objects.create(user=make_user('owner', 'SUPERADMIN'), business_name="Owner")
+        prop = Property.objects.create(
+            owner=owner, name="Billing PG", address="1 Main Road", city="Pune", state="MH", property_type='CO_ED',
+            iot_enabled=True,
+        )
+        room = Room.objects.create(property=prop, room_number="101", type='DOUBLE', base_rent=Decimal('6000'))
+        cls.bed_a = Bed.objects.create(room=room, label='A')
+        cls.bed_b = Bed.objects.create(room=room, label='B')
+        cls.leaver, cls.newcomer, cls.stayer = (
+            TenantProfile.objects.create(user=make_user(tag)) for tag in ('leaver', 'newcomer', 'stayer')
+        )
+
+        bed_assignment.bulk_check_in([(cls.leaver.pk, cls.bed_a.pk)], check_in_date=date(2026, 2, 10))
+        bed_assignment.bulk_check_in([(cls.stayer.pk, cls.bed_b.pk)], check_in_date=date(2026, 1, 1))
+        bed_assignment.bulk_check_out([cls.leaver.pk], check_out_date=date(2026, 3, 10))
+        bed_assignment.bulk_check_in([(cls.newcomer.pk, cls.bed_a.pk)], check_in_date=date(2026, 3, 11))
+
+        # 100 kWh on bed A and 50 kWh on bed B in March: 150 kWh at 8.00 = 1200.00
+        add_bucket(cls.bed_a, date(2026, 2, 28), 1000)
+        add_bucket(cls.bed_a, date(2026, 3, 31), 1100)
+        add_bucket(cls.bed_b, date(2026, 2, 28), 500)
+        add_bucket(cls.bed_b, date(2026, 3, 31), 550)
+
+    def bills(self):
+        return {
+            bill.tenant_id: bill
+            for bill in ElectricityBill.objects.filter(bed__room__property__name="Billing PG", billing_month='2026-03')
+        }
+
+    def test_check_out_remembers_the_tenant(self):
+        self.bed_a.refresh_from_db()
+        self.assertEqual(self.bed_a.last_tenant_id, self.leaver.pk)
+        self.assertEqual(self.bed_a.last_occupied_date, date(2026, 3, 10))
+        self.assertEqual(self.bed_a.current_tenant_id, self.newcomer.pk)
+
+    def test_each_tenant_is_billed_for_their_own_days(self):
+        summary = electricity_billing.bill_property(self.bed_a.room.property_id, '2026-03', rate_per_unit='8.00')
+
+        bills = self.bills()
+        self.assertEqual(summary['billed'], 3)
+        self.assertEqual(set(bills), {self.leaver.pk, self.newcomer.pk, self.stayer.pk})
+        self.assertEqual(bills[self.leaver.pk].bed_id, self.bed_a.pk)
+        self.assertEqual(bills[self.newcomer.pk].bed_id, self.bed_a.pk)
+        self.assertEqual(
+            {tenant_id: bill.occupied_days for tenant_id, bill in bills.items()},
+            {self.leaver.pk: 10, self.newcomer.pk: 21, self.stayer.pk: 31},
+        )
+        self.assertEqual(sum(bill.cost_calculated for bill in bills.values()), Decimal('1200.00'))
+        self.assertEqual(summary['total'], Decimal('1200.00'))
+        # 10 of the room's 62 occupied days
+        self.assertEqual(bills[self.leaver.pk].cost_calculated, Decimal('193.55'))
+
+    def test_rerun_updates_the_same_bills(self):
+        electricity_billing.bill_property(self.bed_a.room.property_id, '2026-03', rate_per_unit='8.00')
+        first = {tenant_id: bill.pk for tenant_id, bill in self.bills().items()}
+
+        electricity_billing.bill_property(self.bed_a.room.property_id, '2026-03', rate_per_unit='10.00')
+
+        bills = self.bills()
+        self.assertEqual({tenant_id: bill.pk for tenant_id, bill in bills.items()}, first)
+        self.assertEqual(sum(bill.cost_calculated for bill in bills.values()), Decimal('1500.00'))
@@ -0,0 +1,20 @@
+from django.urls import path
+from apps.properties.views import bed_views, dashboard_views, export_views, import_views, iot_views, matching_views, media_views, public_views, search_views
+
+urlpatterns = [
+    path('beds/bulk-check-in/', bed_views.BulkCheckInView.as_view(), name='bed-bulk-check-in'),
+    path('beds/bulk-check-out/', bed_views.BulkCheckOutView.as_view(), name='bed-bulk-check-out'),
+    path('search/nearby/', search_views.NearbyPropertySearchView.as_view(), name='property-search-nearby'),
+    path('import/', import_views.InventoryImportView.as_view(), name='inventory-import'),
+    path('import/<uuid:import_id>/', import_views.InventoryImportStatusView.as_view(), name='inventory-import-status'),
+    path('portfolio/dashboard/', dashboard_views.OwnerDashboardView.as_view(), name='owner-dashboard'),
+    path('portfolio/export/', export_views.PortfolioExportView.as_view(), name='portfolio-export'),
+    path('portfolio/export/<uuid:export_id>/', export_views.PortfolioExportStatusView.as_view(), name='portfolio-export-status'),
+    path('portfolio/export/<uuid:export_id>/download/', export_views.PortfolioExportDownloadView.as_view(), name='portfolio-export-download'),
+    path('<uuid:property_id>/dashboard/', dashboard_views.PropertyDashboardView.as_view(), name='property-dashboard'),
+    path('public/bed/<uuid:public_uid>/', public_views.public_bed_view, name='public-bed'),
+    path('iot/meter-reading/', iot_views.MeterReadingIngestView.as_view(), name='iot-meter-reading'),
+    path('media/upload/', media_views.MediaUploadView.as_view(), name='media-upload'),
+    path('media/<uuid:asset_id>/', media_views.MediaAssetView.as_view(), name='media-asset'),
+    path('matching/', matching_views.RoommateMatchView.as_view(), name='roommate-match'),
+]
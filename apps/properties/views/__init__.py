@@ -0,0 +1,10 @@
+# Init file for views
+from .bed_views import BulkCheckInView, BulkCheckOutView
+from .matching_views import RoommateMatchView
+from .search_views import NearbyPropertySearchView
+from .import_views import InventoryImportView, InventoryImportStatusView
+from .dashboard_views import PropertyDashboardView, OwnerDashboardView
+from .iot_views import MeterReadingIngestView
+from .public_views import public_bed_view
+from .export_views import PortfolioExportView, PortfolioExportStatusView, PortfolioExportDownloadView
+from .media_views import MediaUploadView, MediaAssetView
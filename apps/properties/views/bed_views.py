@@ -0,0 +1,57 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.permissions import IsPropertyOwnerOrManager
+from apps.properties.serializers import BulkCheckInSerializer, BulkCheckOutSerializer
+from apps.properties.services import bed_assignment, property_access
+from apps.users.services import activity_logger
+
+
+class BulkCheckInView(APIView):
+    """
+    POST /api/v1/properties/beds/bulk-check-in/
+    Assigns a batch of tenants to beds in a single transaction. Only beds of the
+    requester's properties (owned, or managed via StaffProfile) can be assigned.
+    """
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def post(self, request):
+        serializer = BulkCheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = bed_assignment.bulk_check_in(
+            [(item['tenant'], item['bed']) for item in serializer.validated_data['assignments']],
+            check_in_date=serializer.validated_data.get('check_in_date'),
+            property_ids=property_access.managed_property_ids(request.user),
+        )
+        if result['assigned']:
+            activity_logger.log_request(request, 'BULK_CHECK_IN', details=f"Tenants: {', '.join(result['assigned'])}")
+        return Response({
+            'success': True,
+            'message': f"{len(result['assigned'])} tenants checked in",
+            'data': result,
+        }, status=status.HTTP_200_OK)
+
+
+class BulkCheckOutView(APIView):
+    """
+    POST /api/v1/properties/beds/bulk-check-out/
+    Releases the beds held by a batch of tenants in the requester's properties.
+    """
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def post(self, request):
+        serializer = BulkCheckOutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = bed_assignment.bulk_check_out(
+            serializer.validated_data['tenants'],
+            check_out_date=serializer.validated_data.get('check_out_date'),
+            property_ids=property_access.managed_property_ids(request.user),
+        )
+        if result['released']:
+            activity_logger.log_request(request, 'BULK_CHECK_OUT', details=f"Tenants: {', '.join(result['released'])}")
+        return Response({
+            'success': True,
+            'message': f"{len(result['released'])} tenants checked out",
+            'data': result,
+        }, status=status.HTTP_200_OK)
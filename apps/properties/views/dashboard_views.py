@@ -0,0 +1,32 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.permissions import IsPropertyOwnerOrManager
+from apps.properties.services import portfolio_rollups, property_access
+from apps.users.models import OwnerProfile
+from shared.mixins import ReplicaReadMixin
+
+
+class PropertyDashboardView(ReplicaReadMixin, APIView):
+    """GET /api/v1/properties/<property_id>/dashboard/ - occupancy and rent roll for a property the requester manages."""
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def get(self, request, property_id):
+        get_object_or_404(property_access.managed_properties(request.user).only('id'), pk=property_id)
+        return Response({'success': True, 'data': portfolio_rollups.property_dashboard(property_id)}, status=status.HTTP_200_OK)
+
+
+class OwnerDashboardView(ReplicaReadMixin, APIView):
+    """GET /api/v1/properties/portfolio/dashboard/ - portfolio totals for the signed-in owner."""
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def get(self, request):
+        owner_id = OwnerProfile.objects.filter(user_id=request.user.pk).values_list('id', flat=True).first()
+        if owner_id is None:
+            return Response({
+                'success': False,
+                'error': {'code': 'RESOURCE_NOT_FOUND', 'message': "Owner profile not found"},
+            }, status=status.HTTP_404_NOT_FOUND)
+        return Response({'success': True, 'data': portfolio_rollups.owner_dashboard(owner_id)}, status=status.HTTP_200_OK)
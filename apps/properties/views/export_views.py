@@ -0,0 +1,129 @@
+import uuid
+from pathlib import Path
+
+from django.core.cache import cache
+from django.http import FileResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.permissions import IsPropertyOwnerOrManager
+from apps.properties.services import portfolio_export, property_access
+from apps.properties.tasks import export_portfolio, export_status_key
+from apps.users.models import OwnerProfile
+from apps.users.services import activity_logger
+
+
+def _not_found(message):
+    return Response({
+        'success': False,
+        'error': {'code': 'RESOURCE_NOT_FOUND', 'message': message},
+    }, status=status.HTTP_404_NOT_FOUND)
+
+
+class PortfolioExportView(APIView):
+    """
+    GET  /api/v1/properties/portfolio/export/?dataset=tenants&file_format=csv
+         Streams the export (properties, rooms, beds, tenants or staff; csv or xlsx).
+    POST /api/v1/properties/portfolio/export/ (same fields in the body)
+         Queues generation into MEDIA_ROOT/exports; poll the status endpoint for the download.
+    Exports above PORTFOLIO_EXPORT['STREAM_MAX_ROWS'] rows are always queued.
+    Managers pass `owner` (one whose property they manage); owners export their own portfolio.
+    """
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def _resolve(self, request, params):
+        dataset = params.get('dataset')
+        fmt = (params.get('file_format') or 'csv').lower()
+        if dataset not in portfolio_export.DATASETS or fmt not in portfolio_export.FORMATS:
+            return None, Response({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f"dataset must be one of {', '.join(portfolio_export.DATASETS)}; file_format csv or xlsx",
+                },
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.user.role == 'SUPERADMIN':
+            owner_id = OwnerProfile.objects.filter(user_id=request.user.pk).values_list('id', flat=True).first()
+        else:
+            owner_id = params.get('owner')
+            if owner_id is not None and not property_access.can_manage_owner(request.user, owner_id):
+                owner_id = None
+        if owner_id is None or not OwnerProfile.objects.filter(pk=owner_id).exists():
+            return None, _not_found("Owner profile not found")
+        return (dataset, str(owner_id), fmt), None
+
+    def _log(self, request, dataset, owner_id, fmt):
+        activity_logger.log_request(request, 'PORTFOLIO_EXPORT', details=f"{dataset}.{fmt} of owner {owner_id}")
+
+    def _queue(self, request, dataset, owner_id, fmt):
+        self._log(request, dataset, owner_id, fmt)
+        export_id = str(uuid.uuid4())
+        ttl = portfolio_export.get_config()['RETENTION_HOURS'] * 3600
+        cache.set(export_status_key(export_id), {
+            'status': 'QUEUED', 'dataset': dataset, 'format': fmt, 'user_id': str(request.user.pk),
+        }, ttl)
+        export_portfolio.delay(export_id, dataset, owner_id, fmt, str(request.user.pk))
+        return Response({
+            'success': True,
+            'message': "Export queued",
+            'data': {'export_id': export_id},
+        }, status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request):
+        resolved, error = self._resolve(request, request.query_params)
+        if error is not None:
+            return error
+        dataset, owner_id, fmt = resolved
+        if portfolio_export.count_rows(dataset, owner_id) > portfolio_export.get_config()['STREAM_MAX_ROWS']:
+            return self._queue(request, dataset, owner_id, fmt)
+
+        self._log(request, dataset, owner_id, fmt)
+        response = StreamingHttpResponse(
+            portfolio_export.iter_export(dataset, owner_id, fmt),
+            content_type=portfolio_export.FORMATS[fmt][1],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{portfolio_export.filename(dataset, fmt)}"'
+        response['Cache-Control'] = 'no-store'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def post(self, request):
+        resolved, error = self._resolve(request, request.data)
+        if error is not None:
+            return error
+        return self._queue(request, *resolved)
+
+
+class PortfolioExportStatusView(APIView):
+    """GET /api/v1/properties/portfolio/export/<export_id>/ - state of a queued export."""
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def get(self, request, export_id):
+        progress = cache.get(export_status_key(export_id))
+        if progress is None or progress['user_id'] != str(request.user.pk):
+            return _not_found("Unknown export")
+        data = {key: value for key, value in progress.items() if key not in ('path', 'user_id')}
+        if progress['status'] == 'DONE':
+            data['download_url'] = request.build_absolute_uri('download/')
+        return Response({'success': True, 'data': data}, status=status.HTTP_200_OK)
+
+
+class PortfolioExportDownloadView(APIView):
+    """GET /api/v1/properties/portfolio/export/<export_id>/download/ - the generated file."""
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def get(self, request, export_id):
+        progress = cache.get(export_status_key(export_id))
+        if progress is None or progress['user_id'] != str(request.user.pk) or progress['status'] != 'DONE':
+            return _not_found("Unknown export")
+        path = Path(progress['path'])
+        if not path.exists():
+            return _not_found("Export has expired")
+        return FileResponse(
+            path.open('rb'),
+            as_attachment=True,
+            filename=portfolio_export.filename(progress['dataset'], progress['format']),
+            content_type=portfolio_export.FORMATS[progress['format']][1],
+        )
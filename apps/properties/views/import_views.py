@@ -0,0 +1,87 @@
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.permissions import IsPropertyOwnerOrManager
+from apps.properties.services import property_access
+from apps.properties.tasks import import_inventory, import_status_key
+from apps.users.models import OwnerProfile
+
+ALLOWED_SUFFIXES = ('.csv', '.jsonl', '.ndjson')
+
+
+class InventoryImportView(APIView):
+    """
+    POST /api/v1/properties/import/ (multipart: file, optional owner for managers)
+    Streams the upload to MEDIA_ROOT/imports and queues a background import.
+    Managers may only import for an owner whose property they manage.
+    """
+    permission_classes = [IsPropertyOwnerOrManager]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        suffix = Path(upload.name).suffix.lower() if upload else ''
+        if upload is None or suffix not in ALLOWED_SUFFIXES:
+            return Response({
+                'success': False,
+                'error': {'code': 'VALIDATION_ERROR', 'message': "A .csv or .jsonl file is required"},
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.user.role == 'SUPERADMIN':
+            owner_id = OwnerProfile.objects.filter(user_id=request.user.pk).values_list('id', flat=True).first()
+        else:
+            owner_id = request.data.get('owner')
+            if owner_id is not None:
+                try:
+                    owner_id = uuid.UUID(owner_id)
+                except ValueError:
+                    return Response({
+                        'success': False,
+                        'error': {'code': 'VALIDATION_ERROR', 'message': "owner must be a valid id"},
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                if not property_access.can_manage_owner(request.user, owner_id):
+                    owner_id = None
+        if owner_id is None or not OwnerProfile.objects.filter(pk=owner_id).exists():
+            return Response({
+                'success': False,
+                'error': {'code': 'RESOURCE_NOT_FOUND', 'message': "Owner profile not found"},
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        import_id = str(uuid.uuid4())
+        directory = Path(settings.MEDIA_ROOT) / 'imports'
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{import_id}{suffix}"
+        with path.open('wb') as destination:
+            for chunk in upload.chunks():
+                destination.write(chunk)
+
+        user_id = str(request.user.pk)
+        cache.set(import_status_key(import_id), {'status': 'QUEUED', 'user_id': user_id}, 24 * 3600)
+        import_inventory.delay(import_id, str(path), str(owner_id), user_id=user_id)
+        return Response({
+            'success': True,
+            'message': "Import queued",
+            'data': {'import_id': import_id},
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class InventoryImportStatusView(APIView):
+    """GET /api/v1/properties/import/<import_id>/ - progress counters of an import queued by the requester."""
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def get(self, request, import_id):
+        progress = cache.get(import_status_key(import_id))
+        if progress is None or progress.get('user_id') != str(request.user.pk):
+            return Response({
+                'success': False,
+                'error': {'code': 'RESOURCE_NOT_FOUND', 'message': "Unknown import"},
+            }, status=status.HTTP_404_NOT_FOUND)
+        data = {key: value for key, value in progress.items() if key != 'user_id'}
+        return Response({'success': True, 'data': data}, status=status.HTTP_200_OK)
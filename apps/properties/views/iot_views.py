@@ -0,0 +1,74 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.permissions import HasIoTApiKey
+from apps.properties.services import meter_ingest
+
+MAX_READINGS = 50000
+
+
+def _parse_reading(item):
+    """{'meter_id', 'current_reading', 'timestamp'} -> (meter_id, kwh, epoch) or None."""
+    try:
+        meter_id = item['meter_id']
+        kwh = float(item['current_reading'])
+        timestamp = item['timestamp']
+    except (KeyError, TypeError, ValueError):
+        return None
+    if isinstance(timestamp, (int, float)):
+        epoch = float(timestamp)
+    else:
+        try:
+            parsed = parse_datetime(str(timestamp))
+        except ValueError:
+            return None
+        if parsed is None or parsed.tzinfo is None:
+            return None
+        epoch = parsed.timestamp()
+    if not meter_ingest.valid_reading(kwh, epoch):
+        return None
+    return meter_id, kwh, epoch
+
+
+class MeterReadingIngestView(APIView):
+    """
+    POST /api/v1/properties/iot/meter-reading/
+    One reading object, or {"readings": [...]} with up to MAX_READINGS of them.
+    Readings are validated, mapped to beds and written as time buckets in bulk.
+    """
+    authentication_classes = []
+    permission_classes = [HasIoTApiKey]
+
+    def post(self, request):
+        data = request.data
+        items = data.get('readings') if isinstance(data, dict) and 'readings' in data else [data]
+        if not isinstance(items, list) or len(items) > MAX_READINGS:
+            return Response({
+                'success': False,
+                'error': {'code': 'VALIDATION_ERROR', 'message': f"readings must be a list of at most {MAX_READINGS}"},
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        readings = []
+        malformed = 0
+        for item in items:
+            reading = _parse_reading(item)
+            if reading is None:
+                malformed += 1
+            else:
+                readings.append(reading)
+        if not readings:
+            return Response({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': "No valid reading: current_reading must be a finite, non-negative number and timestamp an aware datetime or epoch seconds",
+                },
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        ingestor = meter_ingest.get_ingestor()
+        result = ingestor.ingest(readings)
+        ingestor.flush()
+        result['malformed'] = malformed
+        return Response({'success': True, 'data': result}, status=status.HTTP_202_ACCEPTED)
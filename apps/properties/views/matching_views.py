@@ -0,0 +1,50 @@
+import uuid
+
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.services import property_access
+from apps.users.models import TenantProfile
+from apps.users.services import roommate_matching
+
+
+class RoommateMatchView(APIView):
+    """
+    GET /api/v1/properties/matching/?property=<id>&property=<id>&tenant=<id>&top_k=5
+    Rooms with vacancies ranked by compatibility with their current occupants (USP #6).
+    Tenants are matched as themselves; owners and managers may pass `tenant`
+    (one housed in a property they administer).
+    """
+
+    def _invalid(self, message):
+        return Response({
+            'success': False,
+            'error': {'code': 'VALIDATION_ERROR', 'message': message},
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    def get(self, request):
+        try:
+            property_ids = [str(uuid.UUID(value)) for value in request.query_params.getlist('property')]
+            tenant_id = request.query_params.get('tenant')
+            tenant_id = uuid.UUID(tenant_id) if tenant_id else None
+        except ValueError:
+            return self._invalid("property and tenant must be valid ids")
+        if not property_ids:
+            return self._invalid("At least one property is required")
+
+        if request.user.role in ('SUPERADMIN', 'MANAGER') and tenant_id is not None:
+            tenant = get_object_or_404(
+                TenantProfile, pk=tenant_id, property_id__in=property_access.managed_property_ids(request.user),
+            )
+        else:
+            tenant = get_object_or_404(TenantProfile, user_id=request.user.pk)
+
+        try:
+            top_k = min(int(request.query_params.get('top_k', 5)), 50)
+        except ValueError:
+            top_k = 5
+
+        matches = roommate_matching.match_rooms(tenant, property_ids, top_k=top_k)
+        return Response({'success': True, 'data': matches}, status=status.HTTP_200_OK)
@@ -0,0 +1,107 @@
+from django.db import transaction
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.models import MediaAsset, Room
+from apps.properties.services import media_pipeline, property_access
+from apps.properties.tasks import process_media_assets
+from apps.users.models import TenantProfile
+
+
+def _error(code, message, http_status):
+    return Response({'success': False, 'error': {'code': code, 'message': message}}, status=http_status)
+
+
+def _scoped_targets(user):
+    """
+    Subqueries of the record ids per target_type a user works with: a tenant's own
+    profile, room and property; everything under an owner's or manager's properties.
+    """
+    if user.role == 'TENANT':
+        own = TenantProfile.objects.filter(user_id=user.pk)
+        return {'TENANT': own.values('pk'), 'ROOM': own.values('room_id'), 'PROPERTY': own.values('property_id')}
+    properties = property_access.managed_property_ids(user)
+    return {
+        'TENANT': TenantProfile.objects.filter(property_id__in=properties).values('pk'),
+        'ROOM': Room.objects.filter(property_id__in=properties).values('pk'),
+        'PROPERTY': properties,
+    }
+
+
+class MediaUploadView(APIView):
+    """
+    POST /api/v1/properties/media/upload/ (multipart: target_type, target_id, field, files[])
+    target_type is TENANT, ROOM or PROPERTY. Tenants may only upload to their own profile;
+    owners and managers to tenants, rooms and properties of the properties they manage. Files are stored and hashed in the
+    request; thumbnails are rendered in Celery and the field is updated when they are ready.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        target_type = str(request.data.get('target_type', '')).upper()
+        target_id = request.data.get('target_id')
+        field = request.data.get('field')
+        uploads = request.FILES.getlist('files')
+        config = media_pipeline.get_config()
+
+        if target_type not in media_pipeline.TARGETS or not target_id or not field or not uploads:
+            return _error('VALIDATION_ERROR', "target_type, target_id, field and files are required", status.HTTP_400_BAD_REQUEST)
+        if len(uploads) > config['MAX_FILES_PER_REQUEST']:
+            return _error('VALIDATION_ERROR', f"At most {config['MAX_FILES_PER_REQUEST']} files per request", status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+        model, _ = media_pipeline.TARGETS[target_type]
+        if user.role == 'TENANT':
+            allowed = target_type == 'TENANT' and model.objects.filter(pk=target_id, user_id=user.pk).exists()
+        else:
+            allowed = (
+                user.role in ('SUPERADMIN', 'MANAGER')
+                and model.objects.filter(pk=target_id, pk__in=_scoped_targets(user)[target_type]).exists()
+            )
+        if not allowed:
+            return _error('PERMISSION_DENIED', "You cannot upload images for this record", status.HTTP_403_FORBIDDEN)
+
+        try:
+            stored, pending = media_pipeline.attach_uploads(uploads, target_type, target_id, field, user)
+        except media_pipeline.UploadRejected as exc:
+            return _error('VALIDATION_ERROR', str(exc), status.HTTP_400_BAD_REQUEST)
+
+        def schedule():
+            for chunk in media_pipeline.chunked(pending):
+                process_media_assets.delay(chunk)
+        transaction.on_commit(schedule)
+
+        return Response({
+            'success': True,
+            'message': "Upload accepted",
+            'data': [
+                {'asset_id': str(asset.pk), 'status': asset.status, 'duplicate': not created}
+                for asset, created in stored
+            ],
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class MediaAssetView(APIView):
+    """
+    GET /api/v1/properties/media/<asset_id>/ - processing status and derived URLs of an upload.
+    Visible to its uploader and to users who can see a record it is attached to.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, asset_id):
+        visible = Q(uploaded_by_id=request.user.pk)
+        for target_type, ids in _scoped_targets(request.user).items():
+            visible |= Q(attachments__target_type=target_type, attachments__target_id__in=ids)
+        asset = get_object_or_404(MediaAsset.objects.filter(visible).distinct(), pk=asset_id)
+        data = {'asset_id': str(asset.pk), 'status': asset.status}
+        if asset.status == 'READY':
+            data['image'] = media_pipeline.image_entry(asset)
+        elif asset.status == 'FAILED':
+            data['error'] = asset.error
+        return Response({'success': True, 'data': data}, status=status.HTTP_200_OK)
@@ -0,0 +1,32 @@
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from apps.properties.services import public_listing
+
+
+def _etag_matches(header, etag):
+    if not header or etag is None:
+        return False
+    return header.strip() == '*' or etag in [value.strip() for value in header.split(',')]
+
+
+@require_GET
+def public_bed_view(request, public_uid):
+    """
+    GET /api/v1/properties/public/bed/<public_uid>/
+    Anonymous share-link page. Plain Django view (no DRF auth/negotiation) served
+    from a prerendered snapshot; If-None-Match answers 304 from the cache alone.
+    """
+    status_code, etag, body = public_listing.get_listing(public_uid)
+    if status_code != 200:
+        response = HttpResponse(body, status=status_code, content_type='application/json')
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = public_listing.cache_control()
+    return response
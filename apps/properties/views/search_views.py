@@ -0,0 +1,57 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.services import geo_search
+from shared.mixins import ReplicaReadMixin
+
+MAX_RADIUS_KM = 50
+MAX_PAGE_SIZE = 100
+
+
+class NearbyPropertySearchView(ReplicaReadMixin, APIView):
+    """
+    GET /api/v1/properties/search/nearby/?lat=..&lng=..&radius_km=3&property_type=GIRLS&vacant=1&page=1
+    PGs within a radius of a point (e.g. a college), nearest first.
+    """
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            latitude = float(params['lat'])
+            longitude = float(params['lng'])
+            radius_km = min(float(params.get('radius_km', 3)), MAX_RADIUS_KM)
+            page = max(int(params.get('page', 1)), 1)
+            page_size = min(max(int(params.get('page_size', 20)), 1), MAX_PAGE_SIZE)
+        except (KeyError, ValueError):
+            return Response({
+                'success': False,
+                'error': {'code': 'VALIDATION_ERROR', 'message': "lat and lng are required numbers"},
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        result = geo_search.search_nearby(
+            latitude, longitude, radius_km,
+            property_type=params.get('property_type'),
+            vacant_only=params.get('vacant') in ('1', 'true', 'True'),
+            page=page,
+            page_size=page_size,
+        )
+        return Response({
+            'success': True,
+            'data': {
+                'count': result['count'],
+                'page': page,
+                'results': [
+                    {
+                        'id': str(prop.pk),
+                        'name': prop.name,
+                        'city': prop.city,
+                        'property_type': prop.property_type,
+                        'latitude': prop.latitude,
+                        'longitude': prop.longitude,
+                        'distance_km': round(distance, 3),
+                    }
+                    for prop, distance in result['results']
+                ],
+            },
+        }, status=status.HTTP_200_OK)
@@ -1,35 +1,59 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, TenantProfile, OwnerProfile, StaffProfile, ParentStudentMapping, ActivityLog
+from shared.admin import KeysetPaginatedAdmin, PerformantModelAdmin, RecentValuesListFilter
+from .models import CustomUser, TenantProfile, OwnerProfile, StaffProfile, ParentStudentMapping, ActivityLog, WalletTransaction
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'role', 'phone_number', 'is_active')
     list_filter = ('role', 'is_active', 'is_staff')
+    show_full_result_count = False
     fieldsets = UserAdmin.fieldsets + (
         ('Additional Info', {'fields': ('role', 'phone_number', 'profile_photo_url', 'date_of_birth', 'gender', 'language_code')}),
     )
 
 @admin.register(OwnerProfile)
-class OwnerProfileAdmin(admin.ModelAdmin):
+class OwnerProfileAdmin(PerformantModelAdmin):
     list_display = ('business_name', 'user', 'total_properties_count', 'created_at')
 
 @admin.register(TenantProfile)
-class TenantProfileAdmin(admin.ModelAdmin):
+class TenantProfileAdmin(PerformantModelAdmin):
     list_display = ('user', 'pg_credit_score', 'wallet_balance', 'created_at')
+    readonly_fields = ('wallet_balance',)  # moved only through the wallet ledger
     # Note: property/room/bed fields commented out in list_display until properties app exists
     # list_display += ('property', 'room')
 
 @admin.register(StaffProfile)
-class StaffProfileAdmin(admin.ModelAdmin):
+class StaffProfileAdmin(PerformantModelAdmin):
     list_display = ('user', 'role', 'employment_status', 'joined_at')
 
 @admin.register(ParentStudentMapping)
-class ParentStudentMappingAdmin(admin.ModelAdmin):
+class ParentStudentMappingAdmin(PerformantModelAdmin):
     list_display = ('parent_user', 'student_tenant', 'relationship')
+    list_select_related_extra = ('student_tenant__user',)  # TenantProfile.__str__ reads user.username
+
+class ActivityActionFilter(RecentValuesListFilter):
+    title = 'action'
+    parameter_name = 'action'
+    field_name = 'action'
+    ordering_field = '-timestamp'
 
 @admin.register(ActivityLog)
-class ActivityLogAdmin(admin.ModelAdmin):
+class ActivityLogAdmin(KeysetPaginatedAdmin):
     list_display = ('user', 'action', 'severity', 'timestamp', 'ip_address')
-    list_filter = ('severity', 'timestamp', 'action')
+    list_filter = ('severity', 'timestamp', ActivityActionFilter)
     readonly_fields = ('timestamp',)
+    keyset_field = 'timestamp'
+
+@admin.register(WalletTransaction)
+class WalletTransactionAdmin(KeysetPaginatedAdmin):
+    list_display = ('tenant', 'kind', 'amount', 'reference', 'created_at')
+    list_filter = ('kind', 'created_at')
+    list_select_related_extra = ('tenant__user',)
+    keyset_field = 'created_at'
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
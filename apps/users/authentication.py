@@ -0,0 +1,73 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.users.services import profile_cache, token_revocation
+
+
+def _user_id(validated_token):
+    try:
+        return validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken(_("Token contained no recognizable user identification"))
+
+
+def _check_revoked(validated_token):
+    if token_revocation.is_revoked(validated_token.payload, api_settings.USER_ID_CLAIM):
+        raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user through profile_cache instead of
+    loading CustomUser on every request, and attaches the resolved profile as
+    `request.profile`. Logged-out tokens are rejected through token_revocation.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is None:
+            return None
+        user, token = result
+        request._request.profile = getattr(user, '_cached_profile', None)
+        return user, token
+
+    def get_user(self, validated_token):
+        user_id = _user_id(validated_token)
+        _check_revoked(validated_token)
+
+        entry = profile_cache.resolve(user_id)
+        if entry is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not entry['user']['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        user = profile_cache.build_user(entry)
+        user._cached_profile = entry['profile']
+        return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that never loads the user: role and is_active come from the
+    token claims (see RoleTokenObtainPairSerializer) and are trusted until expiry.
+    Logout and deactivation are enforced through token_revocation. Every other
+    field of the user is deferred, so it loads on access and save() never
+    overwrites it.
+    """
+
+    def get_user(self, validated_token):
+        user_id = _user_id(validated_token)
+        if 'role' not in validated_token:
+            raise InvalidToken(_("Token has no role claim"))
+        if not validated_token.get('is_active', False):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        _check_revoked(validated_token)
+
+        return profile_cache.build_user({'user': {
+            'id': user_id,
+            'username': validated_token.get('username', ''),
+            'role': validated_token['role'],
+            'is_active': True,
+        }})
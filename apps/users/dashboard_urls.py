@@ -0,0 +1,9 @@
+from django.urls import path
+from apps.users.views import dashboard_views
+
+urlpatterns = [
+    path('tenant/', dashboard_views.TenantDashboardView.as_view(), name='tenant-dashboard'),
+    path('parent/', dashboard_views.ParentDashboardView.as_view(), name='parent-dashboard'),
+    path('async/tenant/', dashboard_views.tenant_dashboard_async, name='tenant-dashboard-async'),
+    path('async/parent/', dashboard_views.parent_dashboard_async, name='parent-dashboard-async'),
+]
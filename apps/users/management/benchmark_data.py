@@ -0,0 +1,37 @@
+"""
+Synthetic user-side rows for the benchmark commands.
+
+Rows go in with bulk_create, so no signals fire. Seeded user names start with
+`bench-`, like apps.properties.management.benchmark_data.
+"""
+
+import random
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.users.models import ActivityLog, CustomUser
+
+ACTIONS = ('LOGIN', 'PAYMENT_RECEIVED', 'TENANT_CHECK_IN', 'TENANT_CHECK_OUT', 'COMPLAINT_RAISED', 'ROOM_UPDATED')
+
+
+def seed_activity_logs(rows, months=24, batch_size=10000, seed=7):
+    """`rows` ActivityLog rows by 20 new users, timestamps spread over the last `months` months."""
+    tags = [uuid.uuid4().hex[:13] for _ in range(20)]
+    users = [CustomUser(username=f"bench-log-{tag}", phone_number=f"l{tag}"[:15]) for tag in tags]
+    CustomUser.objects.bulk_create(users)
+    rng = random.Random(seed)
+    now = timezone.now()
+    span = months * 30 * 86400
+    for start in range(0, rows, batch_size):
+        with transaction.atomic():
+            ActivityLog.objects.bulk_create([
+                ActivityLog(
+                    user=rng.choice(users), action=rng.choice(ACTIONS), details='benchmark row',
+                    ip_address='10.0.0.1', timestamp=now - timedelta(seconds=rng.randrange(span)),
+                    entity_type='PROPERTY', entity_id=uuid.UUID(int=rng.getrandbits(128)),
+                )
+                for _ in range(min(batch_size, rows - start))
+            ], batch_size=batch_size)
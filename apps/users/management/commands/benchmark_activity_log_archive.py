@@ -0,0 +1,120 @@
+import resource
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.users.management.benchmark_data import seed_activity_logs
+from apps.users.models import ActivityLog
+from apps.users.services import activity_log_archive, activity_logger
+
+
+class Command(BaseCommand):
+    help = (
+        "Retention at scale: seeds --rows (default 10M) ActivityLog rows over --months months in --steps "
+        "steps, timing live-style inserts at each table size, then times a recent-window query and the "
+        "insert rate before and after rotating everything past --retention-months, the rotation itself "
+        "(rows/s, peak RSS) and a rerun, which must write nothing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000000)
+        parser.add_argument('--months', type=int, default=24)
+        parser.add_argument('--retention-months', type=int, default=3)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--seed-batch', type=int, default=10000)
+        parser.add_argument('--steps', type=int, default=5, help="Insert-rate samples taken while seeding")
+        parser.add_argument('--sample-rows', type=int, default=20000, help="Rows inserted per insert-rate sample")
+        parser.add_argument('--no-seed', action='store_true', help="Use the rows already in the table")
+        parser.add_argument('--archive-dir', default=None, help="Defaults to a temporary directory")
+
+    def _recent_window(self):
+        end = timezone.now()
+        start = end - timedelta(days=7)
+        started = time.perf_counter()
+        count = sum(1 for _ in activity_log_archive.iter_window(start, end, directory=self.directory))
+        return count, (time.perf_counter() - started) * 1000
+
+    def _insert_rate(self, rows):
+        """
+        Rows/s for current-time entries written the way ActivityLogBuffer flushes them
+        (time-ordered ids, BATCH_SIZE per bulk_create). The rows are removed afterwards
+        so the table size is unchanged.
+        """
+        batch_size = activity_logger.get_config()['BATCH_SIZE']
+        user_id = ActivityLog.objects.values_list('user_id', flat=True).first()
+        ids = []
+        started = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            batch = [
+                ActivityLog(
+                    id=activity_logger.time_ordered_uuid(), user_id=user_id, action='BENCH_INSERT',
+                    details='benchmark row', ip_address='10.0.0.1', timestamp=timezone.now(),
+                    entity_type='PROPERTY', entity_id=uuid.uuid4(),
+                )
+                for _ in range(min(batch_size, rows - offset))
+            ]
+            with transaction.atomic():
+                ActivityLog.objects.bulk_create(batch)
+            ids.extend(entry.id for entry in batch)
+        elapsed = time.perf_counter() - started
+        for offset in range(0, len(ids), 5000):
+            ActivityLog.objects.filter(pk__in=ids[offset:offset + 5000]).delete()
+        return rows / max(elapsed, 1e-9)
+
+    def _report_insert_rate(self, sample_rows):
+        size = ActivityLog.objects.count()
+        self.stdout.write(f"  {size:>12,} rows live: inserts at {self._insert_rate(sample_rows):,.0f} rows/s")
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING(
+                "DEBUG is on: Django keeps the last 9000 queries in memory, which inflates peak RSS. Use DEBUG=False."
+            ))
+        sample_rows = options['sample_rows']
+        self.stdout.write("insert rate by table size:")
+        if not options['no_seed']:
+            self._report_insert_rate(sample_rows)
+            steps = max(options['steps'], 1)
+            started = time.perf_counter()
+            for step in range(steps):
+                rows = options['rows'] * (step + 1) // steps - options['rows'] * step // steps
+                seed_activity_logs(rows, options['months'], options['seed_batch'], seed=7 + step)
+                self._report_insert_rate(sample_rows)
+            self.stdout.write(f"seeded {options['rows']:,} rows in {time.perf_counter() - started:.0f}s")
+        else:
+            self._report_insert_rate(sample_rows)
+        self.directory = options['archive_dir'] or tempfile.mkdtemp(prefix='activity-log-bench-')
+        before = ActivityLog.objects.count()
+        count, window_ms = self._recent_window()
+        self.stdout.write(f"{before:,} rows live; last 7 days: {count:,} rows in {window_ms:.0f} ms")
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        results = activity_log_archive.rotate(
+            options['retention_months'], directory=self.directory, chunk_size=options['chunk_size'],
+        )
+        elapsed = time.perf_counter() - started
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        archived = sum(rows for _, rows in results)
+        self.stdout.write(
+            f"rotated {len(results)} month(s), {archived:,} rows in {elapsed:.1f}s "
+            f"({archived / max(elapsed, 1e-9):,.0f} rows/s), peak RSS {rss_before // 1024} -> {rss_after // 1024} MB"
+        )
+
+        after = ActivityLog.objects.count()
+        count, window_ms = self._recent_window()
+        self.stdout.write(f"{after:,} rows live; last 7 days: {count:,} rows in {window_ms:.0f} ms")
+        self.stdout.write("insert rate after rotation:")
+        self._report_insert_rate(sample_rows)
+
+        rerun = activity_log_archive.rotate(options['retention_months'], directory=self.directory, chunk_size=options['chunk_size'])
+        rewritten = sum(rows for _, rows in rerun)
+        style = self.style.SUCCESS if rewritten == 0 and before - after == archived else self.style.ERROR
+        self.stdout.write(style(f"rerun wrote {rewritten} rows; {before - after:,} deleted for {archived:,} archived"))
+        self.stdout.write(f"archives in {self.directory}")
@@ -0,0 +1,90 @@
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.users.authentication import CachedJWTAuthentication, StatelessJWTAuthentication
+from apps.users.models import CustomUser
+from apps.users.serializers.auth_serializers import RoleTokenObtainPairSerializer
+from apps.users.services import token_revocation
+
+BACKENDS = (
+    ('database', JWTAuthentication),
+    ('cached', CachedJWTAuthentication),
+    ('stateless', StatelessJWTAuthentication),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-request authentication cost of the three JWT paths (user loaded from the database, "
+        "profile_cache, token claims): RPS and p50/p99 over --requests authentications from --concurrency "
+        "threads, queries per request, and whether a logged-out token is rejected."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--concurrency', type=int, default=16)
+
+    def _request(self, token):
+        return Request(APIRequestFactory().get('/api/v1/auth/me/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+    def _timed(self, backend, token):
+        start = time.perf_counter()
+        backend.authenticate(self._request(token))
+        return time.perf_counter() - start
+
+    def _run(self, backend, token, requests, concurrency):
+        def worker(count):
+            try:
+                return [self._timed(backend, token) for _ in range(count)]
+            finally:
+                close_old_connections()
+
+        shares = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            start = time.perf_counter()
+            latencies = sorted(sample for samples in pool.map(worker, shares) for sample in samples)
+            elapsed = time.perf_counter() - start
+        return {
+            'rps': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        }
+
+    def _rejects(self, backend, token):
+        try:
+            backend.authenticate(self._request(token))
+        except AuthenticationFailed:
+            return True
+        return False
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:12]
+        user = CustomUser.objects.create_user(
+            username=f"bench-auth-{tag}", phone_number=f"a{tag}", email=f"bench-{tag}@example.com", role='TENANT',
+        )
+        token = str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+        logged_out = RoleTokenObtainPairSerializer.get_token(user).access_token
+        token_revocation.revoke_token(logged_out['jti'], logged_out['exp'])
+
+        for label, backend_class in BACKENDS:
+            backend = backend_class()
+            backend.authenticate(self._request(token))  # warm caches
+            with CaptureQueriesContext(connection) as queries:
+                backend.authenticate(self._request(token))
+            result = self._run(backend, token, options['requests'], options['concurrency'])
+            revoked = 'rejected' if self._rejects(backend, str(logged_out)) else 'accepted'
+            self.stdout.write(
+                f"{label:9} {result['rps']:9.0f} auth/s  p50 {result['p50_ms']:6.2f}ms  p99 {result['p99_ms']:6.2f}ms  "
+                f"{len(queries)} queries  logged-out token {revoked}"
+            )
+        user.delete()
@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.users.models import TenantProfile
+from apps.users.services import credit_score
+
+
+class Command(BaseCommand):
+    help = (
+        "Scoring throughput at --tenants (default 200k) synthetic tenants: the vectorized pass versus a "
+        "per-tenant Python loop with the same formula. --db also times a real full recompute and its query count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=200000)
+        parser.add_argument('--loop-sample', type=int, default=20000)
+        parser.add_argument('--db', action='store_true')
+
+    def _synthetic(self, size):
+        rng = np.random.default_rng(7)
+        months = rng.integers(0, 36, size).astype(np.float64)
+        rent = rng.choice([6000.0, 8000.0, 12000.0], size)
+        return {
+            'rent_months': months,
+            'rent_charged': months * rent,
+            'balance': np.where(rng.random(size) < 0.15, -rng.random(size) * 3 * rent, rng.random(size) * 2000),
+            'warnings_recent': rng.poisson(0.3, size).astype(np.float64),
+            'warnings_older': rng.poisson(0.5, size).astype(np.float64),
+            'critical_recent': rng.poisson(0.02, size).astype(np.float64),
+            'critical_older': rng.poisson(0.05, size).astype(np.float64),
+            'notice_short_days': np.where(rng.random(size) < 0.1, rng.integers(0, 30, size), 0).astype(np.float64),
+            'notice_period': np.full(size, 30.0),
+        }
+
+    def _loop(self, features, size, config):
+        scores = []
+        for i in range(size):
+            months = features['rent_months'][i]
+            tenure = config['TENURE_POINTS'] * min(months, config['TENURE_MONTHS']) / config['TENURE_MONTHS']
+            average = features['rent_charged'][i] / months if months else 0
+            dues_months = max(-features['balance'][i], 0) / average if average else 0
+            dues = config['DUES_POINTS_PER_MONTH'] * min(dues_months, config['DUES_CAP_MONTHS'])
+            conduct = (
+                config['WARNING_POINTS'] * (features['warnings_recent'][i] + config['OLDER_WEIGHT'] * features['warnings_older'][i])
+                + config['CRITICAL_POINTS'] * (features['critical_recent'][i] + config['OLDER_WEIGHT'] * features['critical_older'][i])
+            )
+            notice = config['NOTICE_POINTS'] * min(features['notice_short_days'][i] / max(features['notice_period'][i], 1), 1)
+            score = config['BASE'] + tenure - dues - conduct - notice
+            scores.append(int(min(max(np.rint(score), config['MIN']), config['MAX'])))
+        return scores
+
+    def handle(self, *args, **options):
+        config = credit_score.get_config()
+        size = options['tenants']
+        features = self._synthetic(size)
+
+        start = time.perf_counter()
+        scores = credit_score.compute_scores(features, config)
+        vectorized = time.perf_counter() - start
+
+        sample = min(options['loop_sample'], size)
+        start = time.perf_counter()
+        looped = self._loop(features, sample, config)
+        loop_time = (time.perf_counter() - start) * size / sample
+
+        mismatches = int(np.count_nonzero(scores[:sample] != np.array(looped)))
+        self.stdout.write(f"vectorized: {size:,} tenants in {vectorized * 1000:.1f} ms")
+        self.stdout.write(f"python loop: ~{loop_time * 1000:.0f} ms for {size:,} (extrapolated from {sample:,})")
+        self.stdout.write(f"score range {scores.min()}-{scores.max()}, mean {scores.mean():.0f}; mismatches vs loop: {mismatches}")
+
+        if options['db']:
+            from django.db import connection
+            from django.test.utils import CaptureQueriesContext
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                scored, changed = credit_score.recompute()
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"full recompute: {scored:,} tenants ({TenantProfile.objects.count():,} in table), {changed:,} changed, "
+                f"{len(queries)} queries, {elapsed:.2f}s"
+            )
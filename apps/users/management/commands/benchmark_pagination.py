@@ -0,0 +1,71 @@
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.users.management.benchmark_data import seed_activity_logs
+from apps.users.models import ActivityLog
+from shared.pagination import KeysetPagination
+
+
+class Command(BaseCommand):
+    help = (
+        "Page latency at deep offsets on the activity log (newest first): PageNumberPagination "
+        "(OFFSET plus COUNT(*) per page) versus KeysetPagination starting from the same row. "
+        "--seed N first inserts N log rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', default='1,10,100,1000,10000', help="Comma-separated page numbers")
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--iterations', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def _time(self, func, iterations):
+        samples, result = [], None
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = func()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples) * 1000, result
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            seed_activity_logs(options['seed'])
+        factory = APIRequestFactory()
+        view = SimpleNamespace(keyset_ordering='-timestamp')
+        size, iterations = options['page_size'], options['iterations']
+        ordered = ActivityLog.objects.order_by('-timestamp', '-pk')
+        total = ActivityLog.objects.count()
+        self.stdout.write(f"{total:,} activity log rows, {size} per page, median of {iterations} (ms)")
+
+        for page in (int(value) for value in options['pages'].split(',')):
+            offset = (page - 1) * size
+            if offset >= total:
+                self.stdout.write(f"page {page:>7}: beyond the last row")
+                continue
+
+            def offset_page():
+                paginator = PageNumberPagination()
+                paginator.page_size = size
+                return list(paginator.paginate_queryset(ordered, Request(factory.get('/', {'page': page}))))
+
+            params = {'page_size': size}
+            if offset:
+                # The cursor a client holds after walking to this page (the previous page's last row)
+                params['cursor'] = KeysetPagination().encode_cursor(list(ordered.values_list('timestamp', 'pk')[offset - 1]), False)
+
+            def keyset_page():
+                return KeysetPagination().paginate_queryset(ActivityLog.objects.all(), Request(factory.get('/', params)), view)
+
+            offset_ms, offset_rows = self._time(offset_page, iterations)
+            keyset_ms, keyset_rows = self._time(keyset_page, iterations)
+            same = [row.pk for row in offset_rows] == [row.pk for row in keyset_rows]
+            self.stdout.write(
+                f"page {page:>7} (offset {offset:>9,}): offset {offset_ms:9.2f}   keyset {keyset_ms:7.2f}   "
+                f"{offset_ms / keyset_ms:7.1f}x{'' if same else '  (pages differ)'}"
+            )
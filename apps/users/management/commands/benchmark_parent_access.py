@@ -0,0 +1,42 @@
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.models import ParentStudentMapping
+from apps.users.services import parent_access
+
+
+class Command(BaseCommand):
+    help = "Permission checks per second: precomputed parent access sets versus a join query per check."
+
+    def add_arguments(self, parser):
+        parser.add_argument('parent_id', help="CustomUser id of a PARENT")
+        parser.add_argument('--iterations', type=int, default=100000)
+        parser.add_argument('--db-iterations', type=int, default=500)
+
+    def handle(self, *args, **options):
+        parent_id = options['parent_id']
+        access = parent_access.get_access(parent_id)
+        allowed = list(access.property_ids)
+        if not allowed:
+            raise CommandError("This parent has no accessible properties")
+        # Half allowed, half random ids that must be denied
+        probes = [random.choice(allowed) if i % 2 else uuid.uuid4() for i in range(1024)]
+
+        start = time.perf_counter()
+        for i in range(options['iterations']):
+            parent_access.get_access(parent_id).allows('property', probes[i & 1023])
+        in_memory = options['iterations'] / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(options['db_iterations']):
+            ParentStudentMapping.objects.filter(
+                parent_user_id=parent_id, has_access=True, student_tenant__property_id=probes[i & 1023]
+            ).exists()
+        joined = options['db_iterations'] / (time.perf_counter() - start)
+
+        self.stdout.write(f"precomputed set: {in_memory:12.0f} checks/s")
+        self.stdout.write(f"join per check:  {joined:12.0f} checks/s")
+        self.stdout.write(self.style.SUCCESS(f"Speedup {in_memory / joined:.0f}x"))
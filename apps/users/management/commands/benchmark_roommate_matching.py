@@ -0,0 +1,101 @@
+import random
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from apps.users.services import roommate_matching
+from apps.users.services.roommate_matching import FIELD_NAMES, PREFERENCE_FIELDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Roommate matching at --tenants (default 100k) synthetic occupants: index build time and the latency "
+        "of ranking --rooms candidate rooms (NumPy scoring versus a per-occupant Python loop). --db also "
+        "rebuilds the real index and measures ranking latency while that rebuild runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=100000)
+        parser.add_argument('--beds-per-room', type=int, default=3)
+        parser.add_argument('--rooms', type=int, default=300, help="Candidate rooms per ranking (a city's vacancies)")
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--loop-sample', type=int, default=20)
+        parser.add_argument('--db', action='store_true')
+
+    def _profile(self, rng, tenant, room):
+        values = {field: rng.choice((None,) + choices) for field, choices, _, _ in PREFERENCE_FIELDS}
+        return SimpleNamespace(pk=f"t{tenant}", room_id=room, bed_id=f"b{tenant}", **values)
+
+    def _synthetic(self, rng, tenants, beds_per_room):
+        index = roommate_matching.MatchingIndex()
+        for tenant in range(tenants):
+            index.update_profile(self._profile(rng, tenant, f"r{tenant // beds_per_room}"))
+        return index
+
+    def _loop(self, candidate, profiles, room_ids):
+        # The same scoring rule, one occupant at a time over model-like objects
+        totals = {room_id: [0.0, 0] for room_id in room_ids}
+        for profile in profiles:
+            total = totals.get(profile.room_id)
+            if total is None:
+                continue
+            codes = roommate_matching.encode([getattr(profile, field) for field in FIELD_NAMES])
+            total[0] += float(roommate_matching.score_against(candidate, codes.reshape(1, -1))[0])
+            total[1] += 1
+        return {room_id: total / count if count else roommate_matching.EMPTY_ROOM_SCORE for room_id, (total, count) in totals.items()}
+
+    def _latencies(self, index, rng, room_pool, rooms, queries):
+        samples = []
+        for _ in range(queries):
+            room_ids = rng.sample(room_pool, min(rooms, len(room_pool)))
+            candidate = roommate_matching.encode([rng.choice(choices) for _, choices, _, _ in PREFERENCE_FIELDS])
+            start = time.perf_counter()
+            roommate_matching.score_rooms(candidate, room_ids, index=index)
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        return statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        tenants, rooms, queries = options['tenants'], options['rooms'], options['queries']
+
+        start = time.perf_counter()
+        index = self._synthetic(rng, tenants, options['beds_per_room'])
+        build = time.perf_counter() - start
+        room_pool = list(index._room_codes)
+        self.stdout.write(f"index of {index.size:,} tenants in {len(room_pool):,} rooms built in {build * 1000:.0f} ms")
+
+        p50, p99 = self._latencies(index, rng, room_pool, rooms, queries)
+        self.stdout.write(f"rank {rooms} rooms (NumPy)   p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+        profiles = [self._profile(rng, tenant, f"r{tenant // options['beds_per_room']}") for tenant in range(tenants)]
+        samples = []
+        for _ in range(options['loop_sample']):
+            room_ids = rng.sample(room_pool, min(rooms, len(room_pool)))
+            candidate = roommate_matching.encode([rng.choice(choices) for _, choices, _, _ in PREFERENCE_FIELDS])
+            start = time.perf_counter()
+            self._loop(candidate, profiles, room_ids)
+            samples.append(time.perf_counter() - start)
+        loop_ms = statistics.median(samples) * 1000
+        self.stdout.write(f"rank {rooms} rooms (loop)    p50 {loop_ms:7.2f} ms  ({loop_ms / p50:.0f}x slower)")
+
+        if options['db']:
+            live = roommate_matching.get_index()
+            start = time.perf_counter()
+            live.rebuild()
+            rebuild = time.perf_counter() - start
+            self.stdout.write(f"database rebuild: {live.size:,} housed tenants in {rebuild * 1000:.0f} ms")
+
+            # Ranking keeps answering from the current rows while another thread rebuilds
+            rebuilder = threading.Thread(target=live.rebuild)
+            rebuilder.start()
+            during = []
+            live_rooms = list(live._room_codes) or room_pool
+            while rebuilder.is_alive():
+                during.append(self._latencies(live, rng, live_rooms, rooms, 20)[1])
+            rebuilder.join()
+            if during:
+                self.stdout.write(f"rank {rooms} rooms during a rebuild: worst p99 {max(during):7.2f} ms over {len(during) * 20} rankings")
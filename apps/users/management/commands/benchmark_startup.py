@@ -0,0 +1,120 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from shared import api_docs
+
+# Runs in a fresh interpreter: boot the WSGI app, serve one request, report timings and memory.
+# "eager" reproduces the previous startup: admin autodiscover during boot and drf_yasg's
+# schema view built while the URLconf loads on the first request.
+PROBE = r"""
+import json, os, resource, sys, time
+from wsgiref.util import setup_testing_defaults
+
+mode, path = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+from pgmanagement.wsgi import application
+if mode == 'eager':
+    from django.contrib import admin
+    admin.autodiscover()
+booted = time.perf_counter()
+
+if mode == 'eager':
+    from shared import api_docs
+    from drf_yasg.views import get_schema_view
+    get_schema_view(api_docs.schema_info('v1'), public=True)
+environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'REMOTE_ADDR': '127.0.0.1'}
+setup_testing_defaults(environ)
+statuses = []
+b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+served = time.perf_counter()
+
+rss_kb = None
+try:
+    with open('/proc/self/status') as status_file:
+        for line in status_file:
+            if line.startswith('VmRSS:'):
+                rss_kb = int(line.split()[1])
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    'boot': booted - start,
+    'first_request': served - booted,
+    'rss_kb': rss_kb,
+    'modules': len(sys.modules),
+    'status': statuses[0] if statuses else None,
+    'drf_yasg': 'drf_yasg.generators' in sys.modules,
+    'admin': 'apps.users.admin' in sys.modules,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker boot time, time-to-first-request and resident memory in fresh interpreters, with the "
+        "previous eager startup (admin autodiscover, drf_yasg schema view) versus the lazy one. "
+        "--schema also compares regenerating the schema per request with serving the prebuilt file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--path', default='/metrics/', help="First request (defaults to a DB-free endpoint)")
+        parser.add_argument('--schema', action='store_true')
+
+    def _probe(self, mode, path):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE, mode, path],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'pgmanagement.settings')},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"{mode} probe failed:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def _report(self, mode, samples):
+        boot = statistics.median(sample['boot'] for sample in samples) * 1000
+        first = statistics.median(sample['first_request'] for sample in samples) * 1000
+        rss = statistics.median(sample['rss_kb'] for sample in samples) / 1024
+        last = samples[-1]
+        self.stdout.write(
+            f"{mode:6} boot {boot:8.1f} ms   first request {first:8.1f} ms   RSS {rss:7.1f} MiB   "
+            f"modules {last['modules']:5}   drf_yasg loaded={last['drf_yasg']} admin loaded={last['admin']}   "
+            f"({last['status']})"
+        )
+        return boot, first, rss
+
+    def _schema(self, iterations=200):
+        version = api_docs.get_config()['VERSIONS'][0]
+        start = time.perf_counter()
+        api_docs.generate(version)
+        regenerate = (time.perf_counter() - start) * 1000
+        if api_docs.get_schema(version, 'json') is None:
+            self.stdout.write("Prebuilt schema missing; run build_openapi_schema first")
+            return
+        start = time.perf_counter()
+        for _ in range(iterations):
+            api_docs.get_schema(version, 'json')
+        prebuilt = (time.perf_counter() - start) * 1000 / iterations
+        self.stdout.write(f"schema per request: regenerated {regenerate:8.1f} ms   prebuilt {prebuilt:8.3f} ms")
+
+    def handle(self, *args, **options):
+        results = {}
+        for mode in ('eager', 'lazy'):
+            samples = [self._probe(mode, options['path']) for _ in range(options['runs'])]
+            results[mode] = self._report(mode, samples)
+
+        (eager_boot, eager_first, eager_rss), (lazy_boot, lazy_first, lazy_rss) = results['eager'], results['lazy']
+        self.stdout.write(self.style.SUCCESS(
+            f"boot {eager_boot / lazy_boot:.2f}x faster, boot + first request "
+            f"{(eager_boot + eager_first) / (lazy_boot + lazy_first):.2f}x, RSS -{eager_rss - lazy_rss:.1f} MiB"
+        ))
+        if options['schema']:
+            self._schema()
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from shared import api_docs
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema once and write <version>.json/.yaml to API_DOCS['OUTPUT_DIR'] "
+        "(run at build/deploy time, before collectstatic)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help="Defaults to API_DOCS['OUTPUT_DIR']")
+        parser.add_argument('--version', dest='versions', action='append', help="Repeatable; defaults to API_DOCS['VERSIONS']")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = api_docs.build(options['output_dir'], options['versions'])
+        for path, size in written:
+            self.stdout.write(f"{path}  {size / 1024:.1f} KiB")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(written)} schema file(s) in {time.perf_counter() - start:.2f}s"))
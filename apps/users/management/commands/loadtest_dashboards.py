@@ -0,0 +1,63 @@
+import http.client
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+ENDPOINTS = {
+    'tenant': ('/api/v1/dashboard/tenant/', '/api/v1/dashboard/async/tenant/'),
+    'parent': ('/api/v1/dashboard/parent/', '/api/v1/dashboard/async/parent/'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the sync and async dashboard endpoints of a running server. Start the "
+        "project under gunicorn (pgmanagement.wsgi) and under uvicorn (pgmanagement.asgi:application) "
+        "and point --base-url at each to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--token', required=True, help="Access token of a tenant (or parent) user")
+        parser.add_argument('--dashboard', choices=ENDPOINTS, default='tenant')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=32)
+
+    def _hit(self, url, token):
+        request = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                json.loads(response.read())
+                ok = response.status == 200
+        except (OSError, http.client.HTTPException, ValueError):
+            # URLError, timeouts and dropped connections are all OSError: a failed request, not a crash
+            ok = False
+        return ok, time.perf_counter() - start
+
+    def _run(self, url, options):
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(lambda _: self._hit(url, options['token']), range(options['requests'])))
+            elapsed = time.perf_counter() - start
+        latencies = sorted(latency for _, latency in results)
+        failures = sum(1 for ok, _ in results if not ok)
+        return {
+            'rps': len(results) / elapsed,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            'failures': failures,
+        }
+
+    def handle(self, *args, **options):
+        base = options['base_url'].rstrip('/')
+        for label, path in zip(('sync', 'async'), ENDPOINTS[options['dashboard']]):
+            result = self._run(base + path, options)
+            self.stdout.write(
+                f"{label:5} {path:40} {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f}ms  "
+                f"p95 {result['p95_ms']:7.1f}ms  failures {result['failures']}"
+            )
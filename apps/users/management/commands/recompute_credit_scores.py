@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.users.services import credit_score
+
+
+class Command(BaseCommand):
+    help = "Recompute PG credit scores for every tenant, or with --incremental only those with new events."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        result = credit_score.run(incremental=options['incremental'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['mode']}: scored {result['scored']}, changed {result['changed']} in {time.perf_counter() - start:.2f}s"
+        ))
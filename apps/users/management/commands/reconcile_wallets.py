@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.services import wallet
+
+
+class Command(BaseCommand):
+    help = "Check wallet balances against the ledger; --open records pre-ledger balances, --fix resets drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--open', action='store_true', help="Post OPENING entries for balances not yet in the ledger")
+        parser.add_argument('--fix', action='store_true', help="Reset drifted balances to their ledger sum")
+
+    def handle(self, *args, **options):
+        if options['open']:
+            self.stdout.write(f"Opened {wallet.open_ledgers()} ledger(s)")
+        drifted = wallet.reconcile(fix=options['fix'])
+        for tenant_id, balance, total in drifted[:50]:
+            self.stdout.write(f"{tenant_id}: balance {balance}, ledger {total}")
+        if drifted:
+            action = "reset" if options['fix'] else "found"
+            self.stdout.write(self.style.WARNING(f"{len(drifted)} drifted wallet(s) {action}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All balances match the ledger"))
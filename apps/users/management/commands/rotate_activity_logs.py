@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.services import activity_log_archive
+
+
+class Command(BaseCommand):
+    help = "Archive ActivityLog months older than the retention window to compressed files and purge them."
+
+    def add_arguments(self, parser):
+        config = getattr(settings, 'ACTIVITY_LOG', {})
+        parser.add_argument('--retention-months', type=int, default=config.get('RETENTION_MONTHS', 12))
+        parser.add_argument('--archive-dir', default=None, help="Defaults to ACTIVITY_LOG['ARCHIVE_DIR']")
+        parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true', help="Only list the months that would be archived")
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            for start in activity_log_archive.expired_months(options['retention_months']):
+                self.stdout.write(f"Would archive {start:%Y-%m}")
+            return
+
+        results = activity_log_archive.rotate(
+            options['retention_months'],
+            directory=options['archive_dir'],
+            fmt=options['format'],
+            chunk_size=options['chunk_size'],
+        )
+        for path, rows in results:
+            if path is not None:
+                self.stdout.write(f"Archived {rows} rows to {path}")
+        self.stdout.write(self.style.SUCCESS(f"Rotated {len(results)} month(s)"))
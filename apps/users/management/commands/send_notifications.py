@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.services import notifications
+
+
+class Command(BaseCommand):
+    help = "Fan out one notification event, e.g. send_notifications rent_reminder --property <id> --set month='March 2026'."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event', choices=sorted(notifications.EVENTS))
+        parser.add_argument('--tenant', dest='tenant_ids', action='append', help="Repeatable")
+        parser.add_argument('--property', dest='property_ids', action='append', help="Repeatable")
+        parser.add_argument('--set', dest='context', action='append', default=[], help="Template context as key=value")
+
+    def handle(self, *args, **options):
+        context = {}
+        for item in options['context']:
+            key, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f"--set expects key=value, got {item!r}")
+            context[key] = value
+        summary = notifications.notify(
+            options['event'], tenant_ids=options['tenant_ids'], property_ids=options['property_ids'], context=context,
+        )
+        for group, count in summary['groups'].items():
+            self.stdout.write(f"{group:24} {count}")
+        self.stdout.write(self.style.SUCCESS(f"{summary['recipients']} recipient(s) in {summary['batches']} batch(es)"))
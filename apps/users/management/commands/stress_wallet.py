@@ -0,0 +1,155 @@
+import random
+import secrets
+import threading
+import time
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models
+
+from apps.users.models import CustomUser, TenantProfile, WalletTransaction
+from apps.users.services import wallet
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrency stress test and benchmark for the wallet ledger: N parallel writers hammer a few hot "
+        "wallets with top-ups, guarded debits and idempotent replays while a rent batch runs, then every "
+        "balance is checked against both the expected total and the ledger. Creates throwaway tenants."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=64)
+        parser.add_argument('--ops', type=int, default=200, help="Postings per writer")
+        parser.add_argument('--hot', type=int, default=10, help="Wallets the writers contend on")
+        parser.add_argument('--tenants', type=int, default=5000, help="Wallets in the rent batch")
+        parser.add_argument('--keep', action='store_true', help="Keep the generated tenants and ledger rows")
+        parser.add_argument('--allow-production', action='store_true')
+
+    def _create_tenants(self, count, run):
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f"wallet-stress-{run}-{i}", phone_number=f"S{run}{i:06d}", role='TENANT', password='!')
+            for i in range(count)
+        ], batch_size=1000)
+        users = CustomUser.objects.filter(username__startswith=f"wallet-stress-{run}-")
+        TenantProfile.objects.bulk_create([TenantProfile(user=user) for user in users], batch_size=1000)
+        return list(TenantProfile.objects.filter(user__username__startswith=f"wallet-stress-{run}-").values_list('pk', flat=True))
+
+    def _writer(self, index, hot, ops, barrier, expected, stats, lock):
+        rng = random.Random(index)
+        local = defaultdict(Decimal)
+        counts = Counter()
+        keys = []
+        barrier.wait()
+        try:
+            for n in range(ops):
+                tenant_id = rng.choice(hot)
+                if keys and rng.random() < 0.1:
+                    # Retry of an earlier request: must not move money again
+                    key, tenant_id, amount, kind = rng.choice(keys)
+                    _, created = wallet.post(tenant_id, amount, kind, key)
+                    counts['replayed' if not created else 'double_applied'] += 1
+                    continue
+                key = f"stress:{index}:{n}:{secrets.token_hex(4)}"
+                if rng.random() < 0.6:
+                    amount, kind = Decimal(rng.randint(1, 500)), 'TOP_UP'
+                else:
+                    amount, kind = -Decimal(rng.randint(1, 500)), 'CHARGE'
+                try:
+                    wallet.post(tenant_id, amount, kind, key, allow_overdraft=False)
+                except wallet.InsufficientFunds:
+                    counts['insufficient'] += 1
+                    continue
+                local[tenant_id] += amount
+                keys.append((key, tenant_id, amount, kind))
+                counts['posted'] += 1
+        except Exception as exc:
+            counts['errors'] += 1
+            stats['last_error'] = repr(exc)
+        finally:
+            connections.close_all()
+        with lock:
+            for tenant_id, delta in local.items():
+                expected[tenant_id] += delta
+            stats['counts'].update(counts)
+
+    def _rent_run(self, tenant_ids, month, result):
+        try:
+            start = time.perf_counter()
+            result.update(wallet.post_batch(
+                ((tenant_id, Decimal('-100.00'), f"rent:{month}:{tenant_id}") for tenant_id in tenant_ids),
+                'RENT', reference=f"rent:{month}",
+            ))
+            result['elapsed'] = time.perf_counter() - start
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['allow_production']:
+            raise CommandError("Writes throwaway tenants; pass --allow-production outside DEBUG")
+        run = f"{random.randint(0, 99999):05d}"
+        tenant_ids = self._create_tenants(max(options['tenants'], options['hot']), run)
+        hot = tenant_ids[:options['hot']]
+        month = f"stress-{run}"
+        try:
+            expected = defaultdict(Decimal)
+            stats = {'counts': Counter()}
+            lock = threading.Lock()
+            barrier = threading.Barrier(options['writers'] + 1)
+            threads = [
+                threading.Thread(target=self._writer, args=(i, hot, options['ops'], barrier, expected, stats, lock))
+                for i in range(options['writers'])
+            ]
+            rent = {}
+            rent_thread = threading.Thread(target=self._rent_run, args=(tenant_ids, f"{month}-a", rent))
+            for thread in threads:
+                thread.start()
+            start = time.perf_counter()
+            barrier.wait()
+            rent_thread.start()
+            for thread in threads + [rent_thread]:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            for tenant_id in WalletTransaction.objects.filter(reference=f"rent:{month}-a").values_list('tenant_id', flat=True):
+                expected[tenant_id] -= Decimal('100.00')
+
+            counts = stats['counts']
+            attempts = sum(counts[name] for name in ('posted', 'insufficient', 'replayed', 'double_applied'))
+            self.stdout.write(
+                f"{options['writers']} writers x {options['ops']} ops on {len(hot)} hot wallets: "
+                f"{attempts / elapsed:.0f} postings/s ({counts['posted']} posted, {counts['insufficient']} refused "
+                f"for funds, {counts['replayed']} replays, {counts['errors']} errors) in {elapsed:.2f}s"
+            )
+            if stats.get('last_error'):
+                self.stdout.write(self.style.WARNING(f"last error: {stats['last_error']}"))
+            self.stdout.write(f"concurrent rent batch: {rent.get('posted', 0)} debits in {rent.get('elapsed', 0):.2f}s")
+
+            balances = dict(TenantProfile.objects.filter(pk__in=tenant_ids).values_list('pk', 'wallet_balance'))
+            ledger = {
+                row['tenant_id']: row['balance']
+                for row in WalletTransaction.objects.filter(tenant_id__in=tenant_ids).balances()
+            }
+            lost = [pk for pk in tenant_ids if balances[pk] != expected[pk]]
+            drift = [pk for pk in tenant_ids if balances[pk] != ledger.get(pk, 0)]
+
+            # Rent run on its own: thousands of wallets in a handful of statements per chunk
+            rent = {}
+            self._rent_run(tenant_ids, f"{month}-b", rent)
+            self.stdout.write(f"rent batch alone: {rent['posted']} wallets in {rent['elapsed']:.2f}s ({rent['posted'] / rent['elapsed']:.0f}/s)")
+            replay = {}
+            self._rent_run(tenant_ids, f"{month}-b", replay)
+            self.stdout.write(f"rent batch re-run: {replay['posted']} posted, {replay['skipped']} skipped as already posted")
+
+            if lost or drift or counts['double_applied'] or counts['errors'] or replay['posted']:
+                raise CommandError(
+                    f"lost updates on {len(lost)} wallet(s), ledger drift on {len(drift)}, "
+                    f"{counts['double_applied'] + replay['posted']} replays applied twice, {counts['errors']} writer errors"
+                )
+            self.stdout.write(self.style.SUCCESS("Zero lost updates; every balance equals its ledger sum"))
+        finally:
+            if not options['keep']:
+                # Ledger rows PROTECT their tenant and refuse queryset deletes; these are throwaway
+                models.QuerySet.delete(WalletTransaction.objects.filter(tenant__user__username__startswith=f"wallet-stress-{run}-"))
+                CustomUser.objects.filter(username__startswith=f"wallet-stress-{run}-").delete()
@@ -0,0 +1,30 @@
+from django.db import NotSupportedError, models
+from django.db.models import Sum
+
+
+class ActivityLogQuerySet(models.QuerySet):
+    """Window-bounded lookups that stay on the (user, timestamp) / timestamp indexes."""
+
+    def in_window(self, start, end):
+        """Entries with start <= timestamp < end."""
+        return self.filter(timestamp__gte=start, timestamp__lt=end)
+
+    def for_user(self, user, start, end):
+        return self.in_window(start, end).filter(user=user).order_by('-timestamp')
+
+    def for_entity(self, entity_type, entity_id, start, end):
+        return self.in_window(start, end).filter(entity_type=entity_type, entity_id=entity_id).order_by('-timestamp')
+
+
+class WalletTransactionQuerySet(models.QuerySet):
+    """The wallet ledger is append-only: corrections are posted as new, compensating entries."""
+
+    def update(self, **kwargs):
+        raise NotSupportedError("Wallet transactions are append-only")
+
+    def delete(self):
+        raise NotSupportedError("Wallet transactions are append-only")
+
+    def balances(self):
+        """{tenant_id: sum(amount)} rows for the filtered entries."""
+        return self.order_by().values('tenant_id').annotate(balance=Sum('amount'))
@@ -4,3 +4,4 @@ from .tenant_profile import TenantProfile
 from .staff_profile import StaffProfile
 from .parent_student_mapping import ParentStudentMapping
 from .activity_log import ActivityLog
+from .wallet_transaction import WalletTransaction
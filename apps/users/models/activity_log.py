@@ -1,6 +1,8 @@
 from django.db import models
+from django.utils import timezone
 import uuid
 from .custom_user import CustomUser
+from ..managers import ActivityLogQuerySet
 
 class ActivityLog(models.Model):
     """
@@ -12,15 +14,18 @@ class ActivityLog(models.Model):
     action = models.CharField(max_length=255)
     details = models.TextField(null=True, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    timestamp = models.DateTimeField(default=timezone.now, editable=False, db_index=True)  # Set at event time so buffered writes keep it
     severity = models.CharField(max_length=20, choices=[('INFO', 'Info'), ('WARNING', 'Warning'), ('CRITICAL', 'Critical')], default='INFO')
     entity_type = models.CharField(max_length=50, null=True, blank=True, help_text="PAYMENT | TENANT | PROPERTY | ROOM")
     entity_id = models.UUIDField(null=True, blank=True)
 
+    objects = ActivityLogQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=['user', 'timestamp']),
-            models.Index(fields=['entity_type', 'entity_id'])
+            models.Index(fields=['entity_type', 'entity_id']),
+            models.Index(fields=['action', 'timestamp']),
         ]
 
     def __str__(self):
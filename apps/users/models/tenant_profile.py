@@ -39,6 +39,7 @@ class TenantProfile(models.Model):
     check_in_date = models.DateField(null=True, blank=True)
     exit_date = models.DateField(null=True, blank=True)
     notice_period_days = models.IntegerField(default=30)
+    notice_given_on = models.DateField(null=True, blank=True, help_text="Stamped when exit_date is first set; feeds the credit score")
     
     # Photos (JSON Arrays)
     check_in_photos = models.JSONField(default=list, blank=True)
@@ -0,0 +1,51 @@
+from django.db import NotSupportedError, models
+import uuid
+from .custom_user import CustomUser
+from .tenant_profile import TenantProfile
+from ..managers import WalletTransactionQuerySet
+
+
+class WalletTransaction(models.Model):
+    """
+    Append-only wallet ledger. `amount` is signed (credits positive, debits negative);
+    TenantProfile.wallet_balance is the running sum, maintained with F() increments in
+    the same transaction (see services.wallet). `idempotency_key` makes every posting
+    safe to retry: a replay returns the original entry instead of moving money twice.
+    Entries are PROTECTed: a tenant with ledger history cannot be deleted.
+    """
+    KIND_CHOICES = [
+        ('OPENING', 'Opening Balance'),
+        ('TOP_UP', 'Top Up'),
+        ('RENT', 'Rent'),
+        ('REFUND', 'Refund'),
+        ('CHARGE', 'Charge'),
+        ('ADJUSTMENT', 'Adjustment'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant = models.ForeignKey(TenantProfile, on_delete=models.PROTECT, related_name='wallet_transactions')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    reference = models.CharField(max_length=100, null=True, blank=True, help_text="e.g. rent:2026-10, gateway payment id")
+    created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = WalletTransactionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['tenant', 'created_at']),
+            models.Index(fields=['kind', 'reference']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise NotSupportedError("Wallet transactions are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise NotSupportedError("Wallet transactions are append-only")
+
+    def __str__(self):
+        return f"{self.kind} {self.amount} -> {self.tenant_id}"
@@ -0,0 +1,54 @@
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import BasePermission
+
+from apps.users.models import CustomUser
+from apps.users.services import parent_access
+
+
+def _object_kind(obj):
+    """('tenant' | 'property' | 'room' | 'bed', id) for an object a parent might read."""
+    model = obj._meta.model_name
+    if model == 'tenantprofile':
+        return 'tenant', obj.pk
+    if model in ('property', 'room', 'bed'):
+        return model, obj.pk
+    for kind in ('tenant', 'student_tenant', 'bed', 'room', 'property'):
+        value = getattr(obj, f'{kind}_id', None)
+        if value is not None:
+            return kind.replace('student_', ''), value
+    return None, None
+
+
+class IsParentWithAccess(BasePermission):
+    """
+    Parents may only read tenants they are mapped to (with has_access) and the
+    property/room/bed those tenants currently live in. Other roles pass through
+    to the view's remaining permission classes.
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated)
+
+    def has_object_permission(self, request, view, obj):
+        if request.user.role != CustomUser.Roles.PARENT:
+            return True
+        kind, object_id = _object_kind(obj)
+        if kind is None:
+            return False
+        return parent_access.get_access(request.user.pk).allows(kind, object_id)
+
+
+class ParentAccessFilterBackend(BaseFilterBackend):
+    """
+    Restricts a parent's list querysets to what they can see. The view names the
+    lookup and the set it is checked against, e.g.
+    `parent_access_lookup = ('property_id', 'property')`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if request.user.role != CustomUser.Roles.PARENT:
+            return queryset
+        lookup, kind = getattr(view, 'parent_access_lookup', ('pk', 'tenant'))
+        ids = parent_access.get_access(request.user.pk).ids(kind)
+        return queryset.filter(**{f'{lookup}__in': ids}) if ids else queryset.none()
@@ -0,0 +1,3 @@
+from .auth_serializers import RoleTokenObtainPairSerializer, RevocationAwareTokenRefreshSerializer
+from .activity_log_serializers import ActivityLogSerializer
+from .wallet_serializers import WalletTransactionSerializer, WalletPostingSerializer, RentRunSerializer
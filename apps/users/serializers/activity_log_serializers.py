@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+from apps.users.models import ActivityLog
+
+
+class ActivityLogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ActivityLog
+        fields = ['id', 'user', 'action', 'details', 'ip_address', 'timestamp', 'severity', 'entity_type', 'entity_id']
+        read_only_fields = fields
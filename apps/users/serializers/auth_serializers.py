@@ -0,0 +1,46 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.models import CustomUser
+from apps.users.services import token_revocation
+
+
+def add_user_claims(token, username, role, is_active):
+    """Claims the stateless authentication path trusts for the token's lifetime."""
+    token['username'] = username
+    token['role'] = role
+    token['is_active'] = is_active
+    return token
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login: issues tokens carrying username, role and is_active."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        return add_user_claims(token, user.username, user.role, user.is_active)
+
+
+class RevocationAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh: rejects revoked refresh tokens and re-reads role/is_active from the
+    database, so claim changes take effect at the next refresh at the latest.
+    """
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        if token_revocation.is_revoked(refresh.payload, api_settings.USER_ID_CLAIM):
+            raise InvalidToken(_("Token has been revoked"))
+
+        user = CustomUser.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).values(
+            'username', 'role', 'is_active'
+        ).first()
+        if user is None or not user['is_active']:
+            raise InvalidToken(_("User is inactive or no longer exists"))
+
+        access = add_user_claims(refresh.access_token, user['username'], user['role'], user['is_active'])
+        return {'access': str(access)}
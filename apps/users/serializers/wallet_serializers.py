@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+from apps.users.models import WalletTransaction
+
+
+class WalletTransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WalletTransaction
+        fields = ['id', 'tenant', 'kind', 'amount', 'reference', 'idempotency_key', 'created_by', 'created_at']
+        read_only_fields = fields
+
+
+class WalletPostingSerializer(serializers.Serializer):
+    """A manager-recorded posting; the Idempotency-Key header is required alongside it."""
+    tenant = serializers.UUIDField()
+    kind = serializers.ChoiceField(choices=['TOP_UP', 'REFUND', 'CHARGE', 'ADJUSTMENT'])
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    reference = serializers.CharField(max_length=100, required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        amount = attrs['amount']
+        if amount == 0:
+            raise serializers.ValidationError({'amount': "Must be non-zero"})
+        if attrs['kind'] in ('TOP_UP', 'REFUND') and amount < 0:
+            raise serializers.ValidationError({'amount': "Top-ups and refunds are credits"})
+        if attrs['kind'] == 'CHARGE' and amount > 0:
+            attrs['amount'] = -amount
+        return attrs
+
+
+class RentRunSerializer(serializers.Serializer):
+    month = serializers.RegexField(r'^\d{4}-(0[1-9]|1[0-2])$')
+    owner = serializers.UUIDField(required=False)
+    properties = serializers.ListField(child=serializers.UUIDField(), required=False)
@@ -0,0 +1,240 @@
+"""
+Retention for ActivityLog.
+
+The live table holds the recent months; anything older is streamed to one gzip
+file per calendar month (activity_log_YYYY_MM[.N].jsonl.gz / .csv.gz) and deleted.
+Rows are read in (timestamp, id) keyset batches rather than with .iterator(),
+which mysqlclient buffers in full. A month is purged only up to the last key
+written to its archive, so a rerun after a crash between the rename and the
+purge finishes the purge instead of archiving the same rows again.
+Native MySQL RANGE partitioning is not usable here because the partition column
+has to be part of every unique key and the primary key is a bare UUID. A rolling
+shadow table would have to swap the model's db_table under running workers;
+instead the live table itself is kept to the retention window, which bounds the
+size of its (user, timestamp) and (entity_type, entity_id) indexes the same way.
+"""
+
+import csv
+import gzip
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.users.models import ActivityLog
+
+FIELDS = ('id', 'user_id', 'action', 'details', 'ip_address', 'timestamp', 'severity', 'entity_type', 'entity_id')
+
+
+def get_archive_dir():
+    config = getattr(settings, 'ACTIVITY_LOG', {})
+    return Path(config.get('ARCHIVE_DIR', settings.BASE_DIR / 'archives' / 'activity_logs'))
+
+
+def month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(value):
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def shift_months(value, months):
+    index = value.year * 12 + (value.month - 1) - months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _month_parts(directory, start):
+    return sorted(directory.glob(f"activity_log_{start:%Y_%m}.*gz"))
+
+
+def _archive_path(directory, start, fmt):
+    base = f"activity_log_{start:%Y_%m}"
+    path = directory / f"{base}.{fmt}.gz"
+    part = 1
+    # Rows logged into the month after it was archived go to a further part
+    while path.exists():
+        path = directory / f"{base}.{part}.{fmt}.gz"
+        part += 1
+    return path
+
+
+def _serialize(row):
+    data = dict(zip(FIELDS, row))
+    data['id'] = str(data['id'])
+    data['user_id'] = str(data['user_id'])
+    data['timestamp'] = data['timestamp'].isoformat()
+    if data['entity_id'] is not None:
+        data['entity_id'] = str(data['entity_id'])
+    return data
+
+
+def _after(key):
+    # The redundant bare range keeps the timestamp index usable for the OR
+    timestamp, pk = key
+    return Q(timestamp__gte=timestamp) & (Q(timestamp__gt=timestamp) | Q(pk__gt=pk))
+
+
+def _through(key):
+    timestamp, pk = key
+    return Q(timestamp__lte=timestamp) & (Q(timestamp__lt=timestamp) | Q(pk__lte=pk))
+
+
+def _walk(queryset, batch_size):
+    """Yield batches of FIELDS rows in (timestamp, id) order, one LIMIT query per batch."""
+    queryset = queryset.order_by('timestamp', 'id').values_list(*FIELDS)
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(_after(last))
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = (batch[-1][5], batch[-1][0])
+
+
+def _archived_through(paths):
+    """Highest (timestamp, id) key written to the given archive files, or None."""
+    last = None
+    for path in paths:
+        for entry in _read_archive(path):
+            key = (parse_datetime(entry['timestamp']), entry['id'])
+            if last is None or key > last:
+                last = key
+    if last is not None:
+        last = (last[0], ActivityLog._meta.pk.to_python(last[1]))
+    return last
+
+
+def archive_month(start, directory=None, fmt='jsonl', chunk_size=5000, delete=True):
+    """
+    Stream one month of logs to a compressed file, then delete it from the table.
+    Memory stays bounded by one keyset batch however large the month. If the
+    month already has archive files, rows up to their last key are taken as
+    archived (purged, not written again). Returns (path, rows_written).
+    """
+    start = month_start(start)
+    end = next_month(start)
+    directory = Path(directory or get_archive_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+
+    pending = ActivityLog.objects.in_window(start, end)
+    archived = _archived_through(_month_parts(directory, start))
+    if archived is not None:
+        if delete:
+            purge_window(start, end, batch_size=chunk_size, through=archived)
+        pending = pending.filter(_after(archived))
+
+    path = _archive_path(directory, start, fmt)
+    tmp_path = path.with_name(path.name + '.part')
+    written = 0
+    last = None
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', newline='') as handle:
+        writer = None
+        if fmt == 'csv':
+            writer = csv.DictWriter(handle, fieldnames=FIELDS)
+            writer.writeheader()
+        for batch in _walk(pending, chunk_size):
+            for row in batch:
+                if writer is not None:
+                    writer.writerow(_serialize(row))
+                else:
+                    handle.write(json.dumps(_serialize(row)) + '\n')
+            written += len(batch)
+            last = (batch[-1][5], batch[-1][0])
+
+    if not written:
+        tmp_path.unlink()
+        return None, 0
+    os.replace(tmp_path, path)
+
+    if delete:
+        # Only what was written: rows logged into the month meanwhile stay for the next run
+        purge_window(start, end, batch_size=chunk_size, through=last)
+    return path, written
+
+
+def purge_window(start, end, batch_size=5000, through=None):
+    """
+    Delete a window in short transactions so the table is never locked for long.
+    With `through` (a (timestamp, id) key) only rows up to that key are deleted.
+    """
+    rows = ActivityLog.objects.in_window(start, end)
+    if through is not None:
+        rows = rows.filter(_through(through))
+    deleted = 0
+    while True:
+        ids = list(rows.order_by('timestamp', 'id').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += ActivityLog.objects.filter(pk__in=ids).delete()[0]
+
+
+def expired_months(retention_months, now=None):
+    """Month starts older than the retention window that still have rows in the table."""
+    cutoff = shift_months(month_start(now or timezone.now()), retention_months)
+    oldest = ActivityLog.objects.filter(timestamp__lt=cutoff).order_by('timestamp').values_list('timestamp', flat=True).first()
+    if oldest is None:
+        return []
+    months = []
+    current = month_start(oldest)
+    while current < cutoff:
+        months.append(current)
+        current = next_month(current)
+    return months
+
+
+def rotate(retention_months, directory=None, fmt='jsonl', chunk_size=5000):
+    """Archive and purge every month older than `retention_months`. Returns [(path, rows), ...]."""
+    return [
+        archive_month(start, directory=directory, fmt=fmt, chunk_size=chunk_size)
+        for start in expired_months(retention_months)
+    ]
+
+
+def _month_files(directory, start, end):
+    current = month_start(start)
+    while current < end:
+        yield from _month_parts(directory, current)
+        current = next_month(current)
+
+
+def _read_archive(path):
+    with gzip.open(path, 'rt', encoding='utf-8', newline='') as handle:
+        if path.name.endswith('.csv.gz'):
+            for row in csv.DictReader(handle):
+                yield {key: (value or None) for key, value in row.items()}
+        else:
+            for line in handle:
+                yield json.loads(line)
+
+
+def iter_window(start, end, directory=None, user_id=None, entity_type=None, entity_id=None):
+    """
+    Yield log entries (as dicts) with start <= timestamp < end, oldest first.
+    Only the archive files for months overlapping the window are opened, and the
+    live-table query is bounded on the indexed timestamp column.
+    """
+    directory = Path(directory or get_archive_dir())
+    filters = {'user_id': user_id, 'entity_type': entity_type, 'entity_id': entity_id}
+    filters = {key: str(value) for key, value in filters.items() if value is not None}
+
+    for path in _month_files(directory, start, end):
+        for entry in _read_archive(path):
+            timestamp = parse_datetime(entry['timestamp'])
+            if not start <= timestamp < end:
+                continue
+            if all(entry.get(key) == value for key, value in filters.items()):
+                yield entry
+
+    for batch in _walk(ActivityLog.objects.in_window(start, end).filter(**filters), 2000):
+        for row in batch:
+            yield _serialize(row)
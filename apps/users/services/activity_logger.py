@@ -0,0 +1,198 @@
+import atexit
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.users.models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 200,        # flush as soon as this many entries are pending
+    'FLUSH_INTERVAL': 2.0,    # ... or after this many seconds
+    'MAX_PENDING': 10000,     # buffer capacity before the overflow policy kicks in
+    'BLOCK_TIMEOUT': 0.5,     # how long a WARNING entry may wait for room in a full buffer
+    'USE_CELERY': False,      # hand batches to apps.users.tasks.write_activity_logs
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'ACTIVITY_LOG', {})}
+
+
+def time_ordered_uuid():
+    """
+    UUID whose first 48 bits are the epoch milliseconds (UUIDv7 layout).
+    Consecutive log rows land next to each other in the primary key index
+    instead of splitting random pages.
+    """
+    value = (int(time.time() * 1000) & ((1 << 48) - 1)) << 80
+    value |= secrets.randbits(80)
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76          # version 7
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62          # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+class ActivityLogBuffer:
+    """
+    In-process buffer that batches ActivityLog inserts.
+
+    Entries are flushed with bulk_create when BATCH_SIZE is reached or FLUSH_INTERVAL
+    elapses. When the buffer is full: INFO entries are dropped, WARNING entries wait up
+    to BLOCK_TIMEOUT for a flush and then force one inline. CRITICAL entries never wait
+    in the buffer; they are written synchronously before log() returns.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.dropped = 0
+        self.written = 0
+
+    def log(self, **fields):
+        """Queue one entry. Returns False if it was dropped by the overflow policy."""
+        fields.setdefault('id', time_ordered_uuid())
+        severity = fields.get('severity', 'INFO')
+
+        if severity == 'CRITICAL':
+            self._write([fields])
+            return True
+
+        self._ensure_worker()
+        with self._lock:
+            if len(self._pending) >= self.config['MAX_PENDING']:
+                if severity == 'INFO':
+                    self.dropped += 1
+                    return False
+                self._wakeup.set()
+                self._space.wait(self.config['BLOCK_TIMEOUT'])
+            overflow = len(self._pending) >= self.config['MAX_PENDING']
+            if not overflow:
+                self._pending.append(fields)
+                if len(self._pending) >= self.config['BATCH_SIZE']:
+                    self._wakeup.set()
+                return True
+
+        # WARNING with the buffer still full: flush inline so it is not lost
+        self.flush()
+        self._write([fields])
+        return True
+
+    def flush(self):
+        """Write everything currently pending. Safe to call from any thread."""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._space.notify_all()
+        if batch:
+            self._write(batch)
+        return len(batch)
+
+    def _write(self, batch):
+        if self.config['USE_CELERY'] and len(batch) > 1:
+            from apps.users.tasks import write_activity_logs
+            try:
+                write_activity_logs.delay([serialize_entry(entry) for entry in batch])
+                return
+            except Exception:
+                logger.exception("Could not hand %d activity logs to Celery, writing inline", len(batch))
+        try:
+            ActivityLog.objects.bulk_create(
+                [ActivityLog(**entry) for entry in batch], batch_size=self.config['BATCH_SIZE']
+            )
+            self.written += len(batch)
+        except Exception:
+            logger.exception("Failed to write %d activity logs", len(batch))
+            if any(entry.get('severity') == 'CRITICAL' for entry in batch):
+                raise
+
+    def _ensure_worker(self):
+        # Started lazily and per process so forked gunicorn workers get their own thread
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='activity-log-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.config['FLUSH_INTERVAL'])
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+def serialize_entry(entry):
+    """JSON-safe copy of a buffered entry for the Celery task."""
+    data = dict(entry)
+    data['id'] = str(data['id'])
+    data['user_id'] = str(data['user_id'])
+    data['timestamp'] = data['timestamp'].isoformat()
+    if data.get('entity_id') is not None:
+        data['entity_id'] = str(data['entity_id'])
+    return data
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Process-wide buffer, created on first use and flushed at interpreter exit."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = ActivityLogBuffer()
+                atexit.register(_buffer.flush)
+    return _buffer
+
+
+def log_activity(user, action, details=None, severity='INFO', ip_address=None, entity_type=None, entity_id=None):
+    """
+    Record an audit entry without a synchronous INSERT (except CRITICAL entries).
+    `user` may be a CustomUser or its primary key.
+    """
+    return get_buffer().log(
+        user_id=getattr(user, 'pk', user),
+        action=action,
+        details=details,
+        severity=severity,
+        ip_address=ip_address,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        timestamp=timezone.now(),
+    )
+
+
+def log_request(request, action, details=None, severity='INFO', entity_type=None, entity_id=None):
+    """log_activity() for the authenticated user of `request`, with the client address."""
+    return log_activity(
+        request.user,
+        action,
+        details=details,
+        severity=severity,
+        ip_address=request.META.get('REMOTE_ADDR') or None,
+        entity_type=entity_type,
+        entity_id=entity_id,
+    )
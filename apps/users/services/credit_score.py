@@ -0,0 +1,218 @@
+"""
+PG credit score (USP #10), recomputed in batch.
+
+Signals come from a handful of grouped aggregates rather than per-tenant queries:
+- rent history from the wallet ledger: RENT postings and the total charged
+- outstanding dues: a negative wallet_balance, measured in months of rent
+- conduct: WARNING/CRITICAL ActivityLog entries of the tenant's user. Entries in
+  the last RECENT_DAYS count fully; older ones inside WINDOW_DAYS count OLDER_WEIGHT.
+- notice compliance: days of notice short of notice_period_days, from
+  notice_given_on to exit_date
+
+The features are loaded into NumPy arrays and scored in one vectorized pass.
+Only rows whose score changed are written back with bulk_update.
+
+Incremental runs rescore only tenants with ledger, conduct or notice events
+since the previous run's watermark. A nightly full run also picks up scores that
+move because events aged across a window boundary.
+"""
+
+import logging
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.users.models import ActivityLog, TenantProfile, WalletTransaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BASE': 700,
+    'MIN': 300,
+    'MAX': 900,
+    'TENURE_POINTS': 100,           # earned linearly over TENURE_MONTHS of rent
+    'TENURE_MONTHS': 24,
+    'DUES_POINTS_PER_MONTH': 75,    # per month of rent outstanding ...
+    'DUES_CAP_MONTHS': 3,           # ... up to this many months
+    'WARNING_POINTS': 15,
+    'CRITICAL_POINTS': 60,
+    'RECENT_DAYS': 90,
+    'WINDOW_DAYS': 365,
+    'OLDER_WEIGHT': 0.5,
+    'NOTICE_POINTS': 100,           # exiting with no notice at all; proportional when partly short
+    'LOOKUP_CHUNK': 5000,           # ids per IN (...) in incremental runs
+    'SCAN_BATCH': 20000,            # tenant rows per keyset page in full runs
+    'BATCH_SIZE': 1000,
+}
+
+WATERMARK_KEY = 'credit-score:watermark'
+
+FEATURES = (
+    'rent_months', 'rent_charged', 'balance', 'warnings_recent', 'warnings_older',
+    'critical_recent', 'critical_older', 'notice_short_days', 'notice_period',
+)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'CREDIT_SCORE', {})}
+
+
+def compute_scores(features, config=None):
+    """Vectorized scoring: dict of equal-length arrays (see FEATURES) -> int32 scores."""
+    config = config or get_config()
+    rent_months = features['rent_months']
+    tenure = config['TENURE_POINTS'] * np.minimum(rent_months, config['TENURE_MONTHS']) / config['TENURE_MONTHS']
+
+    average_rent = np.divide(features['rent_charged'], rent_months, out=np.zeros(len(rent_months)), where=rent_months > 0)
+    dues_months = np.divide(
+        np.maximum(-features['balance'], 0), average_rent, out=np.zeros(len(rent_months)), where=average_rent > 0,
+    )
+    dues = config['DUES_POINTS_PER_MONTH'] * np.minimum(dues_months, config['DUES_CAP_MONTHS'])
+
+    older = config['OLDER_WEIGHT']
+    conduct = (
+        config['WARNING_POINTS'] * (features['warnings_recent'] + older * features['warnings_older'])
+        + config['CRITICAL_POINTS'] * (features['critical_recent'] + older * features['critical_older'])
+    )
+
+    notice = config['NOTICE_POINTS'] * np.minimum(
+        features['notice_short_days'] / np.maximum(features['notice_period'], 1), 1,
+    )
+
+    score = config['BASE'] + tenure - dues - conduct - notice
+    return np.clip(np.rint(score), config['MIN'], config['MAX']).astype(np.int32)
+
+
+def _chunks(ids, size):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _grouped(queryset, lookup, ids, chunk):
+    """Run a grouped aggregate over everything (ids=None) or IN-chunks of `ids`."""
+    if ids is None:
+        yield from queryset
+        return
+    for part in _chunks(ids, chunk):
+        yield from queryset.filter(**{f'{lookup}__in': part})
+
+
+def _tenant_batches(tenant_ids, config):
+    fields = ('pk', 'user_id', 'wallet_balance', 'exit_date', 'notice_given_on', 'notice_period_days', 'pg_credit_score')
+    if tenant_ids is not None:
+        for part in _chunks(tenant_ids, config['LOOKUP_CHUNK']):
+            yield TenantProfile.objects.filter(pk__in=part).values_list(*fields)
+        return
+    last = None
+    while True:
+        page = TenantProfile.objects.order_by('pk')
+        if last is not None:
+            page = page.filter(pk__gt=last)
+        batch = list(page.values_list(*fields)[:config['SCAN_BATCH']])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1][0]
+
+
+def load_features(tenant_ids=None, now=None, config=None):
+    """(pks, current scores, feature arrays) for `tenant_ids`, or every tenant when None."""
+    config = config or get_config()
+    now = now or timezone.now()
+    # Columns only (no Decimal/date objects kept around): flat memory per tenant
+    pks, user_ids, balances, periods, short_days, current = [], [], [], [], [], []
+    for batch in _tenant_batches(tenant_ids, config):
+        for pk, user_id, balance, exit_date, given_on, period, score in batch:
+            pks.append(pk)
+            user_ids.append(user_id)
+            balances.append(float(balance))
+            periods.append(period)
+            short_days.append(max(0, period - (exit_date - given_on).days) if exit_date and given_on else 0)
+            current.append(score)
+
+    size = len(pks)
+    features = {name: np.zeros(size) for name in FEATURES}
+    if not size:
+        return [], np.zeros(0, dtype=np.int32), features
+    features['balance'] = np.array(balances, dtype=np.float64)
+    features['notice_period'] = np.array(periods, dtype=np.float64)
+    features['notice_short_days'] = np.array(short_days, dtype=np.float64)
+    current = np.array(current, dtype=np.int32)
+    index = {pk: i for i, pk in enumerate(pks)}
+    user_index = {user_id: i for i, user_id in enumerate(user_ids)}
+
+    rent = WalletTransaction.objects.filter(kind='RENT').values('tenant_id').annotate(months=Count('id'), charged=Sum('amount'))
+    for row in _grouped(rent.order_by(), 'tenant_id', tenant_ids, config['LOOKUP_CHUNK']):
+        i = index.get(row['tenant_id'])
+        if i is not None:
+            features['rent_months'][i] = row['months']
+            features['rent_charged'][i] = -float(row['charged'])
+
+    recent = now - timedelta(days=config['RECENT_DAYS'])
+    conduct = (
+        ActivityLog.objects.filter(timestamp__gte=now - timedelta(days=config['WINDOW_DAYS']), severity__in=('WARNING', 'CRITICAL'))
+        .values('user_id')
+        .annotate(
+            warnings_recent=Count('id', filter=Q(severity='WARNING', timestamp__gte=recent)),
+            warnings_older=Count('id', filter=Q(severity='WARNING', timestamp__lt=recent)),
+            critical_recent=Count('id', filter=Q(severity='CRITICAL', timestamp__gte=recent)),
+            critical_older=Count('id', filter=Q(severity='CRITICAL', timestamp__lt=recent)),
+        )
+        .order_by()
+    )
+    user_ids = None if tenant_ids is None else list(user_index)
+    for row in _grouped(conduct, 'user_id', user_ids, config['LOOKUP_CHUNK']):
+        i = user_index.get(row['user_id'])
+        if i is not None:
+            for name in ('warnings_recent', 'warnings_older', 'critical_recent', 'critical_older'):
+                features[name][i] = row[name]
+
+    return pks, current, features
+
+
+def recompute(tenant_ids=None, now=None):
+    """Score `tenant_ids` (every tenant when None). Returns (scored, changed)."""
+    config = get_config()
+    pks, current, features = load_features(tenant_ids, now, config)
+    if not pks:
+        return 0, 0
+    scores = compute_scores(features, config)
+    changed = np.flatnonzero(scores != current)
+    TenantProfile.objects.bulk_update(
+        [TenantProfile(pk=pks[i], pg_credit_score=int(scores[i])) for i in changed],
+        ['pg_credit_score'],
+        batch_size=config['BATCH_SIZE'],
+    )
+    return len(pks), len(changed)
+
+
+def tenants_with_events_since(since):
+    """Tenants with ledger postings, WARNING/CRITICAL activity or a new notice since `since`."""
+    ids = set(WalletTransaction.objects.filter(created_at__gte=since).values_list('tenant_id', flat=True).distinct())
+    flagged_users = (
+        ActivityLog.objects.filter(timestamp__gte=since, severity__in=('WARNING', 'CRITICAL'))
+        .values_list('user_id', flat=True).distinct()
+    )
+    ids.update(TenantProfile.objects.filter(user_id__in=flagged_users).values_list('pk', flat=True))
+    ids.update(TenantProfile.objects.filter(notice_given_on__gte=since.date()).values_list('pk', flat=True))
+    return ids
+
+
+def run(incremental=False):
+    """Full or incremental pass; the watermark is taken before reading so nothing slips between runs."""
+    started = timezone.now()
+    watermark = cache.get(WATERMARK_KEY) if incremental else None
+    if incremental and watermark is None:
+        logger.info("No credit score watermark; running a full recompute")
+    if watermark is not None:
+        tenant_ids = tenants_with_events_since(watermark)
+        scored, changed = recompute(tenant_ids, now=started) if tenant_ids else (0, 0)
+    else:
+        scored, changed = recompute(now=started)
+    cache.set(WATERMARK_KEY, started, None)
+    return {'mode': 'incremental' if watermark is not None else 'full', 'scored': scored, 'changed': changed}
@@ -0,0 +1,181 @@
+"""
+Tenant and parent dashboards.
+
+A dashboard is a handful of independent reads (profile, bed, room, property,
+roommates, recent activity). The sync builders run them one after another; the
+async ones run them concurrently on a dedicated thread pool, at most
+PER_REQUEST_CONCURRENCY at a time per request and MAX_DB_THREADS across the
+process. Each pool thread holds its own (persistent) DB connection.
+
+Django's async ORM methods (aget, afirst, ...) still funnel every query through
+the single thread-sensitive executor, so they would not overlap; the reads here
+are therefore sync_to_async(thread_sensitive=False) on our own executor.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.properties.models import Bed, Property, Room
+from apps.users.models import ActivityLog, ParentStudentMapping, TenantProfile
+
+DEFAULTS = {
+    'MAX_DB_THREADS': 16,
+    'PER_REQUEST_CONCURRENCY': 4,
+    'ACTIVITY_DAYS': 30,
+    'ACTIVITY_LIMIT': 10,
+}
+
+PROFILE_FIELDS = (
+    'id', 'user_id', 'property_id', 'room_id', 'bed_id', 'wallet_balance', 'pg_credit_score',
+    'police_verification_status', 'check_in_date', 'exit_date', 'notice_period_days',
+)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'ASYNC_DASHBOARD', {})}
+
+
+_executor = ThreadPoolExecutor(max_workers=get_config()['MAX_DB_THREADS'], thread_name_prefix='dashboard-db')
+
+
+# Individual reads; each is one query returning plain dicts
+
+def read_profile(tenant_id):
+    return TenantProfile.objects.filter(pk=tenant_id).values(*PROFILE_FIELDS).first()
+
+
+def read_bed(bed_id):
+    if bed_id is None:
+        return None
+    return Bed.objects.filter(pk=bed_id).values('id', 'label', 'is_occupied', 'public_uid', 'last_occupied_date').first()
+
+
+def read_room(room_id):
+    if room_id is None:
+        return None
+    return Room.objects.filter(pk=room_id).values(
+        'id', 'room_number', 'floor', 'type', 'base_rent', 'current_rent', 'electricity_reading',
+        'has_ac', 'has_wifi', 'has_attached_bathroom', 'status',
+    ).first()
+
+
+def read_property(property_id):
+    if property_id is None:
+        return None
+    return Property.objects.filter(pk=property_id).values(
+        'id', 'name', 'address', 'city', 'state', 'property_type', 'hygiene_score',
+    ).first()
+
+
+def read_roommates(room_id, tenant_id):
+    if room_id is None:
+        return []
+    return list(
+        TenantProfile.objects.filter(room_id=room_id).exclude(pk=tenant_id)
+        .values('id', 'user__first_name', 'user__last_name', 'college_name')
+    )
+
+
+def read_activity(user_id):
+    config = get_config()
+    end = timezone.now()
+    start = end - timedelta(days=config['ACTIVITY_DAYS'])
+    return list(
+        ActivityLog.objects.for_user(user_id, start, end)
+        .values('id', 'action', 'severity', 'timestamp', 'entity_type', 'entity_id')[:config['ACTIVITY_LIMIT']]
+    )
+
+
+def read_children(parent_user_id):
+    return list(
+        ParentStudentMapping.objects.filter(parent_user_id=parent_user_id, has_access=True)
+        .values('student_tenant_id', 'relationship')
+    )
+
+
+def _assemble(profile, bed, room, prop, roommates, activity):
+    return {
+        'profile': profile,
+        'bed': bed,
+        'room': room,
+        'property': prop,
+        'roommates': roommates,
+        'recent_activity': activity,
+    }
+
+
+# Sync (sequential)
+
+def tenant_dashboard(tenant_id):
+    profile = read_profile(tenant_id)
+    if profile is None:
+        return None
+    return _assemble(
+        profile,
+        read_bed(profile['bed_id']),
+        read_room(profile['room_id']),
+        read_property(profile['property_id']),
+        read_roommates(profile['room_id'], tenant_id),
+        read_activity(profile['user_id']),
+    )
+
+
+def parent_dashboard(parent_user_id):
+    return [
+        {'relationship': child['relationship'], **(tenant_dashboard(child['student_tenant_id']) or {})}
+        for child in read_children(parent_user_id)
+    ]
+
+
+# Async (concurrent, bounded)
+
+def _in_pool(func):
+    def run(*args):
+        try:
+            return func(*args)
+        finally:
+            # Pool threads never see request_finished; drop connections past CONN_MAX_AGE here
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False, executor=_executor)
+
+
+async def _gather(semaphore, *calls):
+    async def bounded(func, *args):
+        async with semaphore:
+            return await _in_pool(func)(*args)
+    return await asyncio.gather(*(bounded(func, *args) for func, *args in calls))
+
+
+async def atenant_dashboard(tenant_id, semaphore=None):
+    semaphore = semaphore or asyncio.Semaphore(get_config()['PER_REQUEST_CONCURRENCY'])
+    async with semaphore:
+        profile = await _in_pool(read_profile)(tenant_id)
+    if profile is None:
+        return None
+    parts = await _gather(
+        semaphore,
+        (read_bed, profile['bed_id']),
+        (read_room, profile['room_id']),
+        (read_property, profile['property_id']),
+        (read_roommates, profile['room_id'], tenant_id),
+        (read_activity, profile['user_id']),
+    )
+    return _assemble(profile, *parts)
+
+
+async def aparent_dashboard(parent_user_id):
+    semaphore = asyncio.Semaphore(get_config()['PER_REQUEST_CONCURRENCY'])
+    async with semaphore:
+        children = await _in_pool(read_children)(parent_user_id)
+    # All children share the request's semaphore, so the total stays bounded
+    dashboards = await asyncio.gather(*(atenant_dashboard(child['student_tenant_id'], semaphore) for child in children))
+    return [
+        {'relationship': child['relationship'], **(dashboard or {})}
+        for child, dashboard in zip(children, dashboards)
+    ]
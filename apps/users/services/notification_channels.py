@@ -0,0 +1,88 @@
+"""
+Delivery backends for apps.users.services.notifications, configured per channel in
+NOTIFICATIONS['CHANNELS'] (like EMAIL_BACKEND). A backend gets a whole batch of
+(address, subject, body) messages. It returns the messages that were not
+delivered as (index, permanent, reason) tuples, index being the message's
+position in the batch. Transient rejections are retried by the task; permanent
+ones (unknown mailbox, invalid number...) are logged and dropped. Raising
+ChannelError means the whole batch failed and is retried as a whole.
+"""
+
+import smtplib
+import sys
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+
+class ChannelError(Exception):
+    """Transient failure of a whole batch (provider down, connection refused...)."""
+
+
+class BaseChannel:
+    def __init__(self, **options):
+        self.options = options
+
+    def send_batch(self, messages):
+        raise NotImplementedError
+
+
+class EmailChannel(BaseChannel):
+    """
+    Django's email framework: EMAIL_BACKEND (the console backend in DEBUG), one
+    connection per batch and one send per message, so a refused recipient does not
+    stop the rest. A recipient refused with a 5xx reply is permanent, a 4xx reply
+    is transient. If the connection drops mid-batch, every message not yet sent is
+    returned as transient; nothing sent is retried.
+    """
+
+    def send_batch(self, messages):
+        from_email = self.options.get('FROM_EMAIL') or settings.DEFAULT_FROM_EMAIL
+        connection = get_connection(self.options.get('EMAIL_BACKEND'))
+        try:
+            connection.open()
+        except (smtplib.SMTPException, OSError) as exc:
+            raise ChannelError(str(exc)) from exc
+        rejected = []
+        try:
+            for index, (address, subject, body) in enumerate(messages):
+                try:
+                    connection.send_messages([EmailMessage(subject, body, from_email, [address])])
+                except smtplib.SMTPRecipientsRefused as exc:
+                    code, reason = next(iter(exc.recipients.values()), (0, b''))
+                    if isinstance(reason, bytes):
+                        reason = reason.decode(errors='replace')
+                    rejected.append((index, code >= 500, f"{code} {reason}".strip()))
+                except (smtplib.SMTPException, OSError) as exc:
+                    return rejected + [(rest, False, str(exc)) for rest in range(index, len(messages))]
+        finally:
+            try:
+                connection.close()
+            except (smtplib.SMTPException, OSError):
+                pass
+        return rejected
+
+
+class ConsoleSMSChannel(BaseChannel):
+    """Local stand-in for an SMS provider: writes each message to stdout, like the console email backend."""
+
+    _lock = threading.Lock()
+
+    def send_batch(self, messages):
+        stream = self.options.get('STREAM') or sys.stdout
+        with self._lock:
+            for address, _, body in messages:
+                stream.write(f"SMS to {address}: {body}\n")
+            stream.flush()
+        return []
+
+
+class MemoryChannel(BaseChannel):
+    """Keeps messages in MemoryChannel.outbox (development and benchmarks)."""
+
+    outbox = []
+
+    def send_batch(self, messages):
+        self.outbox.extend(messages)
+        return []
@@ -0,0 +1,278 @@
+"""
+Notification fan-out: one event (rent reminder, late check-in...) to tenants,
+their parents and guardians, per channel and in each recipient's language.
+
+- Recipients come from one query per SCAN_BATCH rows. Tenants are LEFT JOINed
+  to their accessible parent mappings and paged with a (tenant, mapping) keyset.
+  guardian_phone is only used for tenants without an accessible parent mapping.
+- Recipients are grouped by (channel, language, audience). Each group's template
+  is rendered once per event with the event context, through a cached-loader
+  Engine, so every template is compiled once per process. Missing languages fall
+  back to English.
+- Per-recipient fields ($name, $tenant_name) are substituted with string.Template
+  at delivery, so no template engine work is done per recipient.
+- Groups are cut into BATCH_SIZE batches and handed to the channel's backend
+  (notification_channels) through the send_notification_batch task. The task
+  is rate limited and retries transiently rejected recipients with backoff;
+  permanent rejections are logged once and dropped.
+
+Templates live in templates/notifications/<event>/<channel>.<language>.txt. The
+first line of an email template is the subject.
+"""
+
+import logging
+import string
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import F, FilteredRelation, Q
+from django.template import Context, Engine, TemplateDoesNotExist
+from django.utils.module_loading import import_string
+
+from apps.users.models import TenantProfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'USE_CELERY': True,
+    'RATE_LIMIT': '20/s',          # batches per second per worker
+    'MAX_RETRIES': 5,
+    'RETRY_BACKOFF': 30,           # seconds, doubled on every retry
+    'SCAN_BATCH': 5000,
+    'CHANNELS': {
+        'email': {'BACKEND': 'apps.users.services.notification_channels.EmailChannel', 'BATCH_SIZE': 100},
+        'sms': {'BACKEND': 'apps.users.services.notification_channels.ConsoleSMSChannel', 'BATCH_SIZE': 500},
+    },
+}
+
+# event -> who hears about it and over which channels. Templates see `audience`
+# as 'tenant' or 'guardian' (parent accounts and guardian phones get the same wording).
+EVENTS = {
+    'rent_reminder': {'audience': ('tenant', 'parent', 'guardian'), 'channels': ('email', 'sms')},
+    'late_check_in': {'audience': ('parent', 'guardian'), 'channels': ('sms', 'email')},
+}
+
+LANGUAGES = ('en', 'hi', 'ta', 'te', 'kn', 'bn')
+DEFAULT_LANGUAGE = 'en'
+
+_engine = Engine(
+    dirs=[Path(__file__).resolve().parent.parent / 'templates' / 'notifications'],
+    loaders=[('django.template.loaders.cached.Loader', ['django.template.loaders.filesystem.Loader'])],
+    autoescape=False,
+)
+# (event, channel, language) -> compiled Template, after the language fallback
+_templates = {}
+# channel -> backend instance
+_channels = {}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'NOTIFICATIONS', {})}
+
+
+def get_template(event, channel, language):
+    key = (event, channel, language)
+    template = _templates.get(key)
+    if template is None:
+        names = [f'{event}/{channel}.{language}.txt']
+        if language != DEFAULT_LANGUAGE:
+            names.append(f'{event}/{channel}.{DEFAULT_LANGUAGE}.txt')
+        template = _templates[key] = _engine.select_template(names)
+    return template
+
+
+def render(event, channel, language, audience, context=None):
+    """(subject, body) for one group; both may still contain $name / $tenant_name."""
+    text = get_template(event, channel, language).render(Context({**(context or {}), 'audience': audience})).strip()
+    if channel == 'email':
+        subject, _, body = text.partition('\n')
+        return subject.strip(), body.strip()
+    return '', text
+
+
+def personalize(subject, body, recipients):
+    """[(address, subject, body)] for [(address, name, tenant_name)]."""
+    subject, body = string.Template(subject), string.Template(body)
+    messages = []
+    for address, name, tenant_name in recipients:
+        fields = {'name': name, 'tenant_name': tenant_name}
+        messages.append((address, subject.safe_substitute(fields), body.safe_substitute(fields)))
+    return messages
+
+
+def get_channel(channel):
+    backend = _channels.get(channel)
+    if backend is None:
+        options = dict(get_config()['CHANNELS'][channel])
+        backend = _channels[channel] = import_string(options.pop('BACKEND'))(**options)
+    return backend
+
+
+def deliver(channel, subject, body, recipients):
+    """
+    Send one batch. Returns (transient, permanent): the recipients to retry, and
+    [(recipient, reason)] for those the backend rejected for good. Rejections are
+    matched by position, so a parent listed once per tenant is only retried for
+    the messages that actually failed.
+    """
+    transient, permanent = [], []
+    for index, is_permanent, reason in get_channel(channel).send_batch(personalize(subject, body, recipients)):
+        recipient = tuple(recipients[index])
+        if is_permanent:
+            permanent.append((recipient, reason))
+        else:
+            transient.append(recipient)
+    return transient, permanent
+
+
+def log_rejected(channel, permanent):
+    for (address, _, tenant_name), reason in permanent:
+        logger.warning("%s notification to %s (tenant %s) rejected: %s", channel, address, tenant_name, reason)
+
+
+def _language(code):
+    return code if code in LANGUAGES else DEFAULT_LANGUAGE
+
+
+def _display_name(first_name, username):
+    return first_name or username
+
+
+def _user_recipients(channels, language, audience, email, phone, name, tenant_name):
+    for channel in channels:
+        address = email if channel == 'email' else phone if channel == 'sms' else None
+        if address:
+            yield channel, _language(language), audience, address, name, tenant_name
+
+
+RECIPIENT_FIELDS = (
+    'pk', 'user__first_name', 'user__username', 'user__email', 'user__phone_number', 'user__language_code',
+    'guardian_name', 'guardian_phone',
+    'mapping_id', 'parent__parent_user__first_name', 'parent__parent_user__username', 'parent__parent_user__email',
+    'parent__parent_user__phone_number', 'parent__parent_user__language_code', 'parent__parent_user__is_active',
+)
+
+
+def _recipient_rows(tenant_ids, property_ids, batch_size):
+    """Tenant x accessible-parent rows (LEFT JOIN), paged on (tenant pk, mapping pk)."""
+    tenants = TenantProfile.objects.filter(user__is_active=True)
+    if tenant_ids is not None:
+        tenants = tenants.filter(pk__in=list(tenant_ids))
+    if property_ids is not None:
+        tenants = tenants.filter(property_id__in=list(property_ids))
+    rows = tenants.annotate(
+        parent=FilteredRelation('parent_mappings', condition=Q(parent_mappings__has_access=True)),
+        mapping_id=F('parent__id'),
+    ).order_by('pk', 'mapping_id').values_list(*RECIPIENT_FIELDS)
+
+    last = None
+    while True:
+        page = rows
+        if last is not None:
+            tenant_pk, mapping_pk = last
+            if mapping_pk is None:
+                # A tenant without accessible parents has exactly one (NULL) row
+                page = page.filter(pk__gt=tenant_pk)
+            else:
+                # The redundant pk >= bound keeps the scan an index range
+                page = page.filter(Q(pk__gte=tenant_pk), Q(pk__gt=tenant_pk) | Q(mapping_id__gt=mapping_pk))
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield from batch
+        last = (batch[-1][0], batch[-1][8])
+
+
+def resolve_recipients(event, tenant_ids=None, property_ids=None):
+    """
+    Yield (channel, language, audience, address, name, tenant_name) for an event
+    over the given tenants / properties (every active tenant when both are None).
+    """
+    spec = EVENTS[event]
+    audience, channels = spec['audience'], spec['channels']
+    previous = None
+    for (
+        tenant_pk, first_name, username, email, phone, language, guardian_name, guardian_phone,
+        mapping_pk, parent_first_name, parent_username, parent_email, parent_phone, parent_language, parent_active,
+    ) in _recipient_rows(tenant_ids, property_ids, get_config()['SCAN_BATCH']):
+        tenant_name = _display_name(first_name, username)
+        if tenant_pk != previous:
+            previous = tenant_pk
+            if 'tenant' in audience:
+                yield from _user_recipients(channels, language, 'tenant', email, phone, tenant_name, tenant_name)
+            if mapping_pk is None and guardian_phone and 'guardian' in audience and 'sms' in channels:
+                # No parent account to reach: fall back to the guardian's phone, in the tenant's language
+                yield 'sms', _language(language), 'guardian', guardian_phone, guardian_name or '', tenant_name
+        if mapping_pk is not None and parent_active and 'parent' in audience:
+            yield from _user_recipients(
+                channels, parent_language, 'guardian', parent_email, parent_phone,
+                _display_name(parent_first_name, parent_username), tenant_name,
+            )
+
+
+def _enqueue(channel, subject, body, batch):
+    from apps.users.tasks import send_notification_batch
+    send_notification_batch.delay(channel, subject, body, batch)
+
+
+def _deliver_inline(channel, subject, body, batch):
+    transient, permanent = deliver(channel, subject, body, batch)
+    log_rejected(channel, permanent)
+    if transient:
+        logger.warning("%d %s notification(s) not delivered", len(transient), channel)
+
+
+def fan_out(event, recipients, context=None, send=None):
+    """
+    Group `recipients` (see resolve_recipients), render each group once and pass
+    every batch to send(channel, subject, body, [(address, name, tenant_name)]).
+    By default the batches go to Celery, or are delivered inline when USE_CELERY is off.
+    """
+    config = get_config()
+    if send is None:
+        send = _enqueue if config['USE_CELERY'] else _deliver_inline
+    batch_sizes = {channel: options['BATCH_SIZE'] for channel, options in config['CHANNELS'].items()}
+    groups = defaultdict(list)
+    rendered = {}
+    counts = Counter()
+    batches = 0
+
+    def flush(key, batch):
+        nonlocal batches
+        channel, language, audience = key
+        if key not in rendered:
+            try:
+                rendered[key] = render(event, channel, language, audience, context)
+            except TemplateDoesNotExist:
+                logger.error("No %s template for %s", channel, event)
+                rendered[key] = None
+        message = rendered[key]
+        if message is not None:
+            send(channel, message[0], message[1], batch)
+            batches += 1
+
+    for channel, language, audience, address, name, tenant_name in recipients:
+        key = (channel, language, audience)
+        batch = groups[key]
+        batch.append((address, name, tenant_name))
+        counts[key] += 1
+        if len(batch) >= batch_sizes[channel]:
+            flush(key, batch)
+            groups[key] = []
+    for key, batch in groups.items():
+        if batch:
+            flush(key, batch)
+
+    return {
+        'recipients': sum(counts.values()),
+        'batches': batches,
+        'groups': {':'.join(key): count for key, count in sorted(counts.items())},
+    }
+
+
+def notify(event, tenant_ids=None, property_ids=None, context=None, send=None):
+    """Resolve the event's recipients and fan it out. Returns fan_out()'s summary."""
+    if event not in EVENTS:
+        raise ValueError(f"Unknown notification event: {event}")
+    return fan_out(event, resolve_recipients(event, tenant_ids, property_ids), context, send)
@@ -0,0 +1,133 @@
+"""
+Precomputed "what can this parent see" sets.
+
+For each parent the tenants they have access to (ParentStudentMapping with
+has_access=True) and those tenants' current property/room/bed are resolved with
+one join and kept as sorted, packed 16-byte UUID arrays in the shared cache. A
+per-process TTLCache holds the decoded frozensets, so permission checks and
+queryset filters are in-memory set lookups.
+
+Keys are versioned per parent like profile_cache: mapping changes and tenant
+residence changes bump the version of the affected parents only, so other
+processes stop using stale shared entries at once and stale local ones within
+LOCAL_TTL seconds.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.users.models import ParentStudentMapping
+from shared.utils import metrics
+from shared.utils.lru_cache import TTLCache
+
+DEFAULTS = {
+    'LOCAL_MAX_ENTRIES': 20000,
+    'LOCAL_TTL': 10,
+    'SHARED_TTL': 3600,
+}
+
+KINDS = ('tenant', 'property', 'room', 'bed')
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'PARENT_ACCESS', {})}
+
+
+_config = get_config()
+local_cache = TTLCache(max_entries=_config['LOCAL_MAX_ENTRIES'], ttl=_config['LOCAL_TTL'])
+metrics.register_cache_stats('parent_access_local', local_cache.stats)
+
+
+def _as_uuid(value):
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def pack(ids):
+    """Sorted, de-duplicated UUIDs as one bytes string (16 bytes each)."""
+    return b''.join(sorted({_as_uuid(value).bytes for value in ids if value is not None}))
+
+
+def unpack(data):
+    return frozenset(uuid.UUID(bytes=data[offset:offset + 16]) for offset in range(0, len(data), 16))
+
+
+class AccessSet:
+    """Immutable ID sets a parent may read."""
+    __slots__ = ('tenant_ids', 'property_ids', 'room_ids', 'bed_ids')
+
+    def __init__(self, tenant_ids=frozenset(), property_ids=frozenset(), room_ids=frozenset(), bed_ids=frozenset()):
+        self.tenant_ids = tenant_ids
+        self.property_ids = property_ids
+        self.room_ids = room_ids
+        self.bed_ids = bed_ids
+
+    def ids(self, kind):
+        return getattr(self, f'{kind}_ids')
+
+    def allows(self, kind, object_id):
+        if object_id is None:
+            return False
+        return _as_uuid(object_id) in self.ids(kind)
+
+    @classmethod
+    def from_packed(cls, packed):
+        return cls(*(unpack(packed[kind]) for kind in KINDS))
+
+
+def _version_key(parent_id):
+    return f"parent-access:ver:{parent_id}"
+
+
+def _entry_key(parent_id, version):
+    return f"parent-access:{parent_id}:v{version}"
+
+
+def _load(parent_id):
+    rows = ParentStudentMapping.objects.filter(parent_user_id=parent_id, has_access=True).values_list(
+        'student_tenant_id', 'student_tenant__property_id', 'student_tenant__room_id', 'student_tenant__bed_id'
+    )
+    columns = list(zip(*rows)) or [(), (), (), ()]
+    return {kind: pack(column) for kind, column in zip(KINDS, columns)}
+
+
+def get_access(parent_id):
+    """AccessSet for a parent user id; a warm local cache answers without any round trip."""
+    parent_id = str(parent_id)
+    access = local_cache.get(parent_id)
+    if access is not None:
+        return access
+
+    version = cache.get(_version_key(parent_id), 0)
+    key = _entry_key(parent_id, version)
+    packed = cache.get(key)
+    if packed is None:
+        packed = _load(parent_id)
+        cache.set(key, packed, get_config()['SHARED_TTL'])
+    access = AccessSet.from_packed(packed)
+    local_cache.set(parent_id, access)
+    return access
+
+
+def invalidate(parent_id):
+    parent_id = str(parent_id)
+    local_cache.delete(parent_id)
+    key = _version_key(parent_id)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def tenants_changed(tenant_ids):
+    """Residence or mapping of these tenants changed: refresh only their parents."""
+    tenant_ids = list(tenant_ids)
+    if not tenant_ids:
+        return
+    parent_ids = ParentStudentMapping.objects.filter(student_tenant_id__in=tenant_ids).values_list(
+        'parent_user_id', flat=True
+    ).distinct()
+    for parent_id in parent_ids:
+        invalidate(parent_id)
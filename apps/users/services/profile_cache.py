@@ -0,0 +1,123 @@
+"""
+Two-level cache for "who is this user and which profile do they have".
+
+L1 is a per-process TTLCache, L2 is the shared Django cache (Redis). Keys carry a
+per-user version number stored in L2; signals bump the version on any change to
+the user or one of their profiles, so other processes stop seeing stale L2 data
+immediately and stale L1 data within LOCAL_TTL seconds.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.users.models import CustomUser, OwnerProfile, StaffProfile, TenantProfile
+from shared.utils import metrics
+from shared.utils.lru_cache import TTLCache
+
+DEFAULTS = {
+    'LOCAL_MAX_ENTRIES': 10000,
+    'LOCAL_TTL': 30,
+    'SHARED_TTL': 3600,
+}
+
+USER_FIELDS = (
+    'id', 'username', 'email', 'phone_number', 'role', 'is_active', 'is_staff',
+    'is_superuser', 'language_code', 'first_name', 'last_name',
+)
+
+# Which profile each role resolves to, and the columns cached for it
+PROFILE_SOURCES = {
+    CustomUser.Roles.TENANT: ('tenant', TenantProfile, ('id', 'property_id', 'room_id', 'bed_id', 'police_verification_status')),
+    CustomUser.Roles.SUPERADMIN: ('owner', OwnerProfile, ('id', 'business_name')),
+    CustomUser.Roles.MANAGER: ('staff', StaffProfile, ('id', 'property_id', 'role', 'employment_status')),
+    CustomUser.Roles.STAFF: ('staff', StaffProfile, ('id', 'property_id', 'role', 'employment_status')),
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'PROFILE_CACHE', {})}
+
+
+_config = get_config()
+local_cache = TTLCache(max_entries=_config['LOCAL_MAX_ENTRIES'], ttl=_config['LOCAL_TTL'])
+counters = {'shared_hits': 0, 'shared_misses': 0, 'invalidations': 0}
+
+metrics.register_cache_stats('profile_local', local_cache.stats)
+metrics.register_cache_stats('profile_shared', lambda: {'hits': counters['shared_hits'], 'misses': counters['shared_misses']})
+
+
+def _version_key(user_id):
+    return f"profile:ver:{user_id}"
+
+
+def _entry_key(user_id, version):
+    return f"profile:{user_id}:v{version}"
+
+
+def _load(user_id):
+    """Resolve the user and their profile from the database (two queries at most)."""
+    user = CustomUser.objects.filter(pk=user_id).values(*USER_FIELDS).first()
+    if user is None:
+        return None
+    profile = None
+    source = PROFILE_SOURCES.get(user['role'])
+    if source is not None:
+        kind, model, fields = source
+        data = model.objects.filter(user_id=user_id).values(*fields).first()
+        if data is not None:
+            profile = {'kind': kind, **data}
+    return {'user': user, 'profile': profile}
+
+
+def resolve(user_id):
+    """
+    Cached {'user': {...}, 'profile': {...} | None} for a user id, or None if the user does not exist.
+    A warm L1 answers without any network or DB round trip.
+    """
+    user_id = str(user_id)
+    entry = local_cache.get(user_id)
+    if entry is not None:
+        return entry
+
+    version = cache.get(_version_key(user_id), 0)
+    key = _entry_key(user_id, version)
+    entry = cache.get(key)
+    if entry is None:
+        counters['shared_misses'] += 1
+        entry = _load(user_id)
+        if entry is None:
+            return None
+        cache.set(key, entry, get_config()['SHARED_TTL'])
+    else:
+        counters['shared_hits'] += 1
+    local_cache.set(user_id, entry)
+    return entry
+
+
+def invalidate(user_id):
+    """Drop the cached entry for a user in this process and bump its shared version."""
+    user_id = str(user_id)
+    local_cache.delete(user_id)
+    key = _version_key(user_id)
+    # add() is a no-op if the key exists; incr() is atomic in Redis
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+    counters['invalidations'] += 1
+
+
+def build_user(entry):
+    """
+    CustomUser instance rebuilt from a cache entry without touching the DB. Fields
+    that are not cached (password, last_login...) are deferred, so save() writes
+    back only the cached columns and load-on-access still works.
+    """
+    data = entry['user']
+    field_names = [field.attname for field in CustomUser._meta.concrete_fields if field.attname in data]
+    return CustomUser.from_db('default', field_names, [data[name] for name in field_names])
+
+
+def stats():
+    return {**local_cache.stats(), **counters}
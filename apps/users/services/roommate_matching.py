@@ -0,0 +1,347 @@
+"""
+Roommate compatibility matching (USP #6).
+
+Every housed tenant's matching preferences are encoded as one row of small
+integer codes (0 = not answered) in a per-process index. Scoring a newcomer
+against all occupants is a handful of NumPy lookups over that matrix, and rooms
+are ranked by the mean score of their current occupants.
+
+Each process keeps its own index, so changes are broadcast through the shared
+cache: a write bumps a version number and stores the changed tenant ids under
+that version. Before scoring, a process whose index is behind re-reads those
+tenants, or rebuilds when it is too far behind or the change records are gone.
+"""
+
+import threading
+import time
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from apps.users.models import TenantProfile
+
+# (field, choices in order, weight, ordinal) - ordinal fields give partial credit to neighbours
+PREFERENCE_FIELDS = (
+    ('sleep_schedule', ('EARLY_BIRD', 'NIGHT_OWL'), 2.0, False),
+    ('dietary_preference', ('VEG', 'NON_VEG', 'VEGAN'), 1.5, False),
+    ('cleanliness_level', ('HIGH', 'MEDIUM', 'LOW'), 2.0, True),
+    ('smoking_habit', ('SMOKER', 'NON_SMOKER'), 3.0, False),
+    ('study_hours', ('DAY', 'NIGHT'), 1.0, False),
+    ('noise_tolerance', ('HIGH', 'LOW'), 1.0, False),
+    ('personality_type', ('INTROVERT', 'EXTROVERT'), 0.5, False),
+)
+FIELD_NAMES = tuple(field for field, _, _, _ in PREFERENCE_FIELDS)
+UNKNOWN_SIMILARITY = 0.5
+EMPTY_ROOM_SCORE = 0.5
+
+
+def _similarity_table(choices, ordinal):
+    size = len(choices) + 1
+    table = np.full((size, size), UNKNOWN_SIMILARITY, dtype=np.float32)
+    for a in range(1, size):
+        for b in range(1, size):
+            if ordinal:
+                table[a, b] = 1.0 - abs(a - b) / max(1, len(choices) - 1)
+            else:
+                table[a, b] = 1.0 if a == b else 0.0
+    return table
+
+
+_CODES = [{choice: code for code, choice in enumerate(choices, start=1)} for _, choices, _, _ in PREFERENCE_FIELDS]
+_TABLES = [_similarity_table(choices, ordinal) for _, choices, _, ordinal in PREFERENCE_FIELDS]
+_WEIGHTS = np.array([weight for _, _, weight, _ in PREFERENCE_FIELDS], dtype=np.float32)
+_WEIGHTS /= _WEIGHTS.sum()
+
+
+def encode(values):
+    """Preference values (in FIELD_NAMES order) -> uint8 code vector."""
+    return np.array([codes.get(value, 0) for codes, value in zip(_CODES, values)], dtype=np.uint8)
+
+
+def score_against(candidate, occupants):
+    """Compatibility in [0, 1] of one encoded tenant against an (n, fields) occupant matrix."""
+    scores = np.zeros(len(occupants), dtype=np.float32)
+    for column, (table, weight) in enumerate(zip(_TABLES, _WEIGHTS)):
+        scores += weight * table[candidate[column], occupants[:, column]]
+    return scores
+
+
+class MatchingIndex:
+    """
+    Encoded preferences of every tenant who currently holds a bed.
+    Rows are stored densely (removal swaps the last row into the hole) and rooms
+    are kept as small integer codes so room filtering stays inside NumPy.
+    """
+
+    def __init__(self, capacity=1024):
+        self._lock = threading.Lock()
+        self._changed = None    # tenant ids touched while a rebuild is loading
+        self.version = 0        # shared change version the rows reflect
+        self._reset(capacity)
+
+    def _reset(self, capacity):
+        self.codes = np.zeros((capacity, len(PREFERENCE_FIELDS)), dtype=np.uint8)
+        self.rooms = np.zeros(capacity, dtype=np.int32)
+        self.tenant_ids = [None] * capacity
+        self.size = 0
+        self._positions = {}
+        self._room_codes = {}
+        self.built_at = 0.0
+
+    def _grow(self):
+        capacity = len(self.codes) * 2
+        codes = np.zeros((capacity, self.codes.shape[1]), dtype=np.uint8)
+        codes[:self.size] = self.codes[:self.size]
+        rooms = np.zeros(capacity, dtype=np.int32)
+        rooms[:self.size] = self.rooms[:self.size]
+        self.codes, self.rooms = codes, rooms
+        self.tenant_ids.extend([None] * (capacity - len(self.tenant_ids)))
+
+    def room_code(self, room_id):
+        return self._room_codes.setdefault(room_id, len(self._room_codes))
+
+    def _upsert(self, tenant_id, room_id, values):
+        if self._changed is not None:
+            self._changed.add(tenant_id)
+        position = self._positions.get(tenant_id)
+        if position is None:
+            if self.size == len(self.codes):
+                self._grow()
+            position = self.size
+            self.size += 1
+            self._positions[tenant_id] = position
+            self.tenant_ids[position] = tenant_id
+        self.codes[position] = encode(values)
+        self.rooms[position] = self.room_code(room_id)
+
+    def _remove(self, tenant_id):
+        if self._changed is not None:
+            self._changed.add(tenant_id)
+        position = self._positions.pop(tenant_id, None)
+        if position is None:
+            return
+        last = self.size - 1
+        if position != last:
+            moved = self.tenant_ids[last]
+            self.codes[position] = self.codes[last]
+            self.rooms[position] = self.rooms[last]
+            self.tenant_ids[position] = moved
+            self._positions[moved] = position
+        self.tenant_ids[last] = None
+        self.size = last
+
+    def rebuild(self):
+        """
+        Reload every housed tenant (a count, then one select) into fresh arrays
+        without holding the lock, so scoring continues against the current rows.
+        The new rows are swapped in at the end; tenants changed meanwhile are re-read.
+        """
+        with self._lock:
+            self._changed = set()
+        version = shared_version()
+        rows = TenantProfile.objects.filter(bed__isnull=False).values_list('id', 'room_id', *FIELD_NAMES)
+        fresh = MatchingIndex(max(1024, rows.count()))
+        for tenant_id, room_id, *values in rows.iterator(chunk_size=5000):
+            fresh._upsert(str(tenant_id), str(room_id), values)
+        with self._lock:
+            self.codes, self.rooms, self.tenant_ids = fresh.codes, fresh.rooms, fresh.tenant_ids
+            self.size, self._positions, self._room_codes = fresh.size, fresh._positions, fresh._room_codes
+            self.built_at = time.monotonic()
+            self.version = version
+            changed, self._changed = self._changed, None
+        if changed:
+            self.sync_tenants(changed)
+
+    def sync_tenants(self, tenant_ids):
+        """Re-read the given tenants (after a save or bulk update) and update their rows."""
+        tenant_ids = {str(tenant_id) for tenant_id in tenant_ids}
+        rows = TenantProfile.objects.filter(pk__in=tenant_ids).values_list('id', 'bed_id', 'room_id', *FIELD_NAMES)
+        with self._lock:
+            seen = set()
+            for tenant_id, bed_id, room_id, *values in rows:
+                tenant_id = str(tenant_id)
+                seen.add(tenant_id)
+                if bed_id is None or room_id is None:
+                    self._remove(tenant_id)
+                else:
+                    self._upsert(tenant_id, str(room_id), values)
+            for tenant_id in tenant_ids - seen:
+                self._remove(tenant_id)
+
+    def catch_up(self):
+        """
+        Apply the changes other processes broadcast since `version`: re-read the
+        tenants they touched, or rebuild if the records are missing or too many.
+        """
+        current = shared_version()
+        if current == self.version:
+            return
+        if not self.version < current <= self.version + CHANGE_LOG_SIZE:
+            self.rebuild()
+            return
+        keys = [_changes_key(version) for version in range(self.version + 1, current + 1)]
+        records = cache.get_many(keys)
+        if len(records) < len(keys):
+            self.rebuild()
+            return
+        self.sync_tenants(set().union(*records.values()))
+        self.version = current
+
+    def update_profile(self, profile):
+        """Apply a saved TenantProfile instance without re-reading it."""
+        with self._lock:
+            if profile.bed_id is None or profile.room_id is None:
+                self._remove(str(profile.pk))
+            else:
+                self._upsert(str(profile.pk), str(profile.room_id), [getattr(profile, field) for field in FIELD_NAMES])
+
+    def remove(self, tenant_id):
+        with self._lock:
+            self._remove(str(tenant_id))
+
+    def snapshot(self, room_ids, exclude_tenant=None):
+        """
+        (codes, room_positions) for the occupants of `room_ids`, where room_positions
+        indexes into `room_ids`.
+        """
+        with self._lock:
+            lookup = np.full(len(self._room_codes) + 1, -1, dtype=np.int64)
+            for position, room_id in enumerate(room_ids):
+                code = self._room_codes.get(room_id)
+                if code is not None:
+                    lookup[code] = position
+            positions = lookup[self.rooms[:self.size]]
+            mask = positions >= 0
+            excluded = self._positions.get(exclude_tenant)
+            if excluded is not None:
+                mask[excluded] = False
+            return self.codes[:self.size][mask].copy(), positions[mask]
+
+
+_index = None
+_build_lock = threading.Lock()  # one builder per process
+REBUILD_INTERVAL = 15 * 60
+CHANGE_LOG_SIZE = 500  # a process further behind than this rebuilds instead of replaying
+VERSION_KEY = 'roommate-matching:version'
+
+
+def _changes_key(version):
+    return f"roommate-matching:changes:v{version}"
+
+
+def shared_version():
+    return cache.get(VERSION_KEY, 0)
+
+
+def _broadcast(tenant_ids):
+    # add() is a no-op if the key exists; incr() is atomic in Redis
+    if cache.add(VERSION_KEY, 1, None):
+        version = 1
+    else:
+        try:
+            version = cache.incr(VERSION_KEY)
+        except ValueError:
+            version = 1
+            cache.set(VERSION_KEY, version, None)
+    cache.set(_changes_key(version), {str(tenant_id) for tenant_id in tenant_ids}, REBUILD_INTERVAL)
+
+
+def publish(tenant_ids):
+    """Tell every process the given tenants changed, once the current transaction commits."""
+    tenant_ids = list(tenant_ids)
+    transaction.on_commit(lambda: _broadcast(tenant_ids))
+
+
+def get_index():
+    global _index
+    index = _index
+    if index is None:
+        with _build_lock:
+            if _index is None:
+                index = MatchingIndex()
+                index.rebuild()
+                _index = index
+        return _index
+    if _build_lock.acquire(blocking=False):
+        # Other callers keep scoring against the current rows until the swap
+        try:
+            if time.monotonic() - index.built_at > REBUILD_INTERVAL:
+                index.rebuild()
+            else:
+                index.catch_up()
+        finally:
+            _build_lock.release()
+    return index
+
+
+def profile_changed(profile):
+    """Signal hook: applied here at once, in other processes before their next score."""
+    if _index is not None:
+        _index.update_profile(profile)
+    publish([profile.pk])
+
+
+def profile_deleted(tenant_id):
+    if _index is not None:
+        _index.remove(tenant_id)
+    publish([tenant_id])
+
+
+def tenants_changed(tenant_ids):
+    """Hook for bulk writes that bypass model signals."""
+    tenant_ids = list(tenant_ids)
+    if _index is not None:
+        _index.sync_tenants(tenant_ids)
+    publish(tenant_ids)
+
+
+def score_rooms(candidate, room_ids, exclude_tenant=None, index=None):
+    """
+    (mean score of each room's occupants against the encoded `candidate`, occupant
+    counts), aligned with `room_ids`. Rooms without occupants score EMPTY_ROOM_SCORE.
+    """
+    codes, occupant_rooms = (index or get_index()).snapshot(room_ids, exclude_tenant=exclude_tenant)
+    scores = score_against(candidate, codes)
+    totals = np.bincount(occupant_rooms, weights=scores, minlength=len(room_ids))
+    counts = np.bincount(occupant_rooms, minlength=len(room_ids))
+    return np.where(counts > 0, totals / np.maximum(counts, 1), EMPTY_ROOM_SCORE), counts
+
+
+def match_rooms(tenant, property_ids, top_k=5):
+    """
+    Rank rooms with at least one vacant bed in the given properties by how well
+    `tenant` fits their current occupants. Returns up to `top_k` dicts with
+    room_id, property_id, score, occupants and vacant_beds.
+    """
+    from apps.properties.models import Bed
+
+    vacancies = (
+        Bed.objects.filter(room__property_id__in=property_ids)
+        .values('room_id', 'room__property_id')
+        .annotate(vacant=Count('id', filter=Q(is_occupied=False)))
+        .filter(vacant__gt=0)
+        .order_by()
+    )
+    rooms = {str(row['room_id']): row for row in vacancies}
+    if not rooms:
+        return []
+
+    room_order = list(rooms)
+    candidate = encode([getattr(tenant, field) for field in FIELD_NAMES])
+    room_scores, counts = score_rooms(candidate, room_order, exclude_tenant=str(tenant.pk))
+
+    top_k = max(1, min(top_k, len(room_order)))
+    best = np.argpartition(-room_scores, top_k - 1)[:top_k]
+    best = best[np.argsort(-room_scores[best])]
+    return [
+        {
+            'room_id': room_order[i],
+            'property_id': str(rooms[room_order[i]]['room__property_id']),
+            'score': round(float(room_scores[i]), 4),
+            'occupants': int(counts[i]),
+            'vacant_beds': rooms[room_order[i]]['vacant'],
+        }
+        for i in best
+    ]
@@ -0,0 +1,138 @@
+"""
+Revocation list for stateless access tokens.
+
+Revoked token ids (logout) live in a Redis sorted set scored by token expiry, so
+entries drop out once the token could not be used anyway. Revoked users
+(deactivation) live in a Redis hash of user_id -> revoked_after timestamp; any
+token issued before that is rejected.
+
+Each process keeps a bloom filter of revoked jtis plus the exact user map, and
+re-syncs from Redis every SYNC_INTERVAL seconds. The common case (token not
+revoked) is answered from memory; a bloom positive is confirmed against Redis.
+Without REDIS_URL everything stays in-process, which is enough for development.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+
+from shared.utils.bloom_filter import BloomFilter
+
+JTI_KEY = 'auth:revoked:jti'
+USER_KEY = 'auth:revoked:user'
+
+DEFAULTS = {
+    'REDIS_URL': None,
+    'SYNC_INTERVAL': 5,
+    'BLOOM_CAPACITY': 100000,
+    'BLOOM_ERROR_RATE': 0.001,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'TOKEN_REVOCATION', {})}
+
+
+class RevocationList:
+
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self._lock = threading.Lock()
+        self._client = None
+        self._bloom = self._new_bloom()
+        self._local_jtis = {}       # jti -> exp; the exact set when Redis is not configured
+        self._users = {}            # user_id -> revoked_after (epoch seconds)
+        self._synced_at = 0.0
+
+    def _new_bloom(self):
+        return BloomFilter(self.config['BLOOM_CAPACITY'], self.config['BLOOM_ERROR_RATE'])
+
+    @property
+    def client(self):
+        if self._client is None and self.config['REDIS_URL']:
+            import redis
+            self._client = redis.Redis.from_url(self.config['REDIS_URL'], decode_responses=True)
+        return self._client
+
+    def revoke_token(self, jti, exp):
+        """Reject the token with this jti until it expires (logout)."""
+        with self._lock:
+            self._bloom.add(jti)
+            self._local_jtis[jti] = exp
+        if self.client is not None:
+            self.client.zadd(JTI_KEY, {jti: exp})
+
+    def revoke_user(self, user_id, revoked_after=None):
+        """Reject every token for this user issued before `revoked_after` (deactivation)."""
+        revoked_after = int(revoked_after or time.time())
+        user_id = str(user_id)
+        with self._lock:
+            self._users[user_id] = revoked_after
+        if self.client is not None:
+            self.client.hset(USER_KEY, user_id, revoked_after)
+
+    def is_revoked(self, payload, user_id_claim='user_id'):
+        self._maybe_sync()
+        revoked_after = self._users.get(str(payload.get(user_id_claim)))
+        if revoked_after is not None and payload.get('iat', 0) <= revoked_after:
+            return True
+        jti = payload.get('jti')
+        if jti is None or not self._bloom.might_contain(jti):
+            return False
+        if jti in self._local_jtis:
+            return True
+        # Bloom positive from another process (or a false positive): confirm exactly
+        return self.client is not None and self.client.zscore(JTI_KEY, jti) is not None
+
+    def _maybe_sync(self):
+        if self.client is None or time.monotonic() - self._synced_at < self.config['SYNC_INTERVAL']:
+            return
+        with self._lock:
+            if time.monotonic() - self._synced_at < self.config['SYNC_INTERVAL']:
+                return
+            self._synced_at = time.monotonic()
+        self.sync()
+
+    def sync(self):
+        """Rebuild the in-memory view from Redis, trimming expired tokens."""
+        now = int(time.time())
+        pipe = self.client.pipeline()
+        pipe.zremrangebyscore(JTI_KEY, '-inf', now)
+        pipe.zrange(JTI_KEY, 0, -1)
+        pipe.hgetall(USER_KEY)
+        _, jtis, users = pipe.execute()
+
+        bloom = self._new_bloom()
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            self._bloom = bloom
+            self._local_jtis = {jti: exp for jti, exp in self._local_jtis.items() if exp > now}
+            self._users = {user_id: int(value) for user_id, value in users.items()}
+            self._synced_at = time.monotonic()
+
+
+_revocations = None
+_revocations_lock = threading.Lock()
+
+
+def get_revocation_list():
+    global _revocations
+    if _revocations is None:
+        with _revocations_lock:
+            if _revocations is None:
+                _revocations = RevocationList()
+    return _revocations
+
+
+def revoke_token(jti, exp):
+    get_revocation_list().revoke_token(jti, exp)
+
+
+def revoke_user(user_id, revoked_after=None):
+    get_revocation_list().revoke_user(user_id, revoked_after)
+
+
+def is_revoked(payload, user_id_claim='user_id'):
+    return get_revocation_list().is_revoked(payload, user_id_claim)
@@ -0,0 +1,260 @@
+"""
+Tenant wallets on an append-only ledger (WalletTransaction).
+
+A posting is one short transaction: INSERT the ledger row, whose unique
+idempotency key turns a retry into a no-op, then
+UPDATE wallet_balance = wallet_balance + amount. Nothing is read and written
+back, so concurrent top-ups, debits and refunds never lose an update, and the
+balance row is locked only from that last statement to the commit. Debits that
+must not overdraw put the check in the same UPDATE (AND wallet_balance >= x).
+
+Rent runs go through post_batch: per chunk, one bulk INSERT IGNORE, one SELECT
+to see which keys were new and one CASE UPDATE for the balances. The ledger
+stays the source of truth; reconcile() compares or resets balances against it.
+"""
+
+import logging
+import random
+import time
+from collections import defaultdict
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.db.models.functions import Coalesce
+
+from apps.users.models import TenantProfile, WalletTransaction
+from apps.users.services.activity_logger import time_ordered_uuid
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 1000,
+    'DEADLOCK_RETRIES': 3,
+}
+
+CENT = Decimal('0.01')
+
+# Kinds that may take a balance below zero (dues); other debits need the funds
+OVERDRAFT_KINDS = ('OPENING', 'RENT', 'CHARGE', 'ADJUSTMENT')
+
+# MySQL deadlock / lock wait timeout, PostgreSQL deadlock / serialization failure
+_RETRYABLE = (1213, 1205, '40P01', '40001')
+
+
+class WalletError(Exception):
+    code = 'WALLET_ERROR'
+
+
+class InsufficientFunds(WalletError):
+    code = 'INSUFFICIENT_FUNDS'
+
+
+class IdempotencyConflict(WalletError):
+    code = 'IDEMPOTENCY_CONFLICT'
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'WALLET', {})}
+
+
+def _retryable(exc):
+    cause = exc.__cause__
+    return (exc.args and exc.args[0] in _RETRYABLE) or getattr(cause, 'pgcode', None) in _RETRYABLE
+
+
+def _with_retries(func):
+    """Run `func` (which opens its own transaction), retrying on deadlocks with jittered backoff."""
+    attempts = get_config()['DEADLOCK_RETRIES'] + 1
+    for attempt in range(attempts):
+        try:
+            return func()
+        except OperationalError as exc:
+            if attempt + 1 == attempts or not _retryable(exc):
+                raise
+            time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+
+def _quantize(amount):
+    return Decimal(str(amount)).quantize(CENT)
+
+
+def post(tenant_id, amount, kind, idempotency_key, reference=None, created_by=None, allow_overdraft=None):
+    """
+    Post one signed amount to a tenant's wallet. Returns (entry, created); a replayed
+    key returns the original entry with created=False. `entry.balance_after` is set
+    on new entries.
+    """
+    amount = _quantize(amount)
+    if amount == 0:
+        raise WalletError("Amount must be non-zero")
+    if allow_overdraft is None:
+        allow_overdraft = kind in OVERDRAFT_KINDS
+
+    def attempt():
+        with transaction.atomic():
+            entry = WalletTransaction.objects.create(
+                id=time_ordered_uuid(),
+                tenant_id=tenant_id,
+                kind=kind,
+                amount=amount,
+                idempotency_key=idempotency_key,
+                reference=reference,
+                created_by=created_by,
+            )
+            wallet = TenantProfile.objects.filter(pk=tenant_id)
+            if amount < 0 and not allow_overdraft:
+                wallet = wallet.filter(wallet_balance__gte=-amount)
+            if wallet.update(wallet_balance=F('wallet_balance') + amount) != 1:
+                raise InsufficientFunds("Insufficient wallet balance")
+            # Our own locked row: this is exactly the balance this entry produced
+            entry.balance_after = TenantProfile.objects.filter(pk=tenant_id).values_list('wallet_balance', flat=True).get()
+            return entry
+
+    try:
+        return _with_retries(attempt), True
+    except IntegrityError:
+        existing = WalletTransaction.objects.filter(idempotency_key=idempotency_key).first()
+        if existing is None:
+            raise
+        if (str(existing.tenant_id), existing.amount, existing.kind) != (str(tenant_id), amount, kind):
+            raise IdempotencyConflict("Idempotency key was already used for a different posting")
+        return existing, False
+
+
+def _post_chunk(rows):
+    with transaction.atomic():
+        WalletTransaction.objects.bulk_create(rows, ignore_conflicts=True)
+        # INSERT IGNORE does not report which rows went in; our client-side ids tell
+        inserted = set(WalletTransaction.objects.filter(pk__in=[row.pk for row in rows]).values_list('pk', flat=True))
+        deltas = defaultdict(Decimal)
+        for row in rows:
+            if row.pk in inserted:
+                deltas[row.tenant_id] += row.amount
+        if deltas:
+            TenantProfile.objects.filter(pk__in=deltas.keys()).update(
+                wallet_balance=F('wallet_balance') + Case(
+                    *[When(pk=tenant_id, then=Value(delta)) for tenant_id, delta in deltas.items()],
+                    output_field=DecimalField(max_digits=10, decimal_places=2),
+                )
+            )
+    return len(inserted)
+
+
+def post_batch(entries, kind, reference=None, created_by=None):
+    """
+    Post many (tenant_id, amount, idempotency_key) entries, BATCH_SIZE per transaction.
+    Balances may go negative (dues). Keys already posted, and unknown tenants, are
+    skipped, so a failed or repeated run can simply be re-run.
+    """
+    batch_size = get_config()['BATCH_SIZE']
+    entries = iter(entries)
+    posted = skipped = 0
+    while True:
+        rows = [
+            WalletTransaction(
+                id=time_ordered_uuid(),
+                tenant_id=tenant_id,
+                kind=kind,
+                amount=_quantize(amount),
+                idempotency_key=key,
+                reference=reference,
+                created_by=created_by,
+            )
+            for tenant_id, amount, key in islice(entries, batch_size)
+        ]
+        if not rows:
+            return {'posted': posted, 'skipped': skipped}
+        count = _with_retries(lambda: _post_chunk(rows))
+        posted += count
+        skipped += len(rows) - count
+
+
+def post_rent(month, property_ids=None, created_by=None):
+    """Debit the month's rent (room current_rent, else base_rent) from every housed tenant."""
+    tenants = TenantProfile.objects.filter(bed__isnull=False, room__isnull=False)
+    if property_ids is not None:
+        tenants = tenants.filter(property_id__in=property_ids)
+    rents = list(
+        tenants.annotate(rent=Coalesce('room__current_rent', 'room__base_rent'))
+        .filter(rent__gt=0)
+        .order_by('pk')
+        .values_list('pk', 'rent')
+    )
+    return post_batch(
+        ((tenant_id, -rent, f"rent:{month}:{tenant_id}") for tenant_id, rent in rents),
+        'RENT',
+        reference=f"rent:{month}",
+        created_by=created_by,
+    )
+
+
+def _scan(batch_size):
+    """Tenant pk batches in keyset order."""
+    last = None
+    while True:
+        tenants = TenantProfile.objects.order_by('pk')
+        if last is not None:
+            tenants = tenants.filter(pk__gt=last)
+        ids = list(tenants.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+def _ledger_sums(tenant_ids):
+    return {row['tenant_id']: row['balance'] for row in WalletTransaction.objects.filter(tenant_id__in=tenant_ids).balances()}
+
+
+def open_ledgers():
+    """
+    One-off: record balances that predate the ledger as OPENING entries
+    (balance minus whatever was already posted), so reconcile() starts clean.
+    """
+    opened = 0
+    for ids in _scan(get_config()['BATCH_SIZE']):
+        with transaction.atomic():
+            balances = dict(TenantProfile.objects.select_for_update().filter(pk__in=ids).values_list('pk', 'wallet_balance'))
+            sums = _ledger_sums(ids)
+            rows = [
+                WalletTransaction(
+                    id=time_ordered_uuid(), tenant_id=pk, kind='OPENING',
+                    amount=balance - sums.get(pk, 0), idempotency_key=f"opening:{pk}",
+                )
+                for pk, balance in balances.items()
+                if balance != sums.get(pk, 0)
+            ]
+            WalletTransaction.objects.bulk_create(rows, ignore_conflicts=True)
+            opened += len(rows)
+    return opened
+
+
+def reconcile(fix=False):
+    """
+    Compare every wallet_balance with its ledger sum; with fix=True the drifted
+    balances are reset to the ledger (rows are locked while they are checked).
+    Returns [(tenant_id, balance, ledger_sum)] of the drifted wallets.
+    """
+    drifted = []
+    for ids in _scan(get_config()['BATCH_SIZE']):
+        with transaction.atomic():
+            tenants = TenantProfile.objects.filter(pk__in=ids)
+            if fix:
+                tenants = tenants.select_for_update()
+            balances = dict(tenants.values_list('pk', 'wallet_balance'))
+            sums = _ledger_sums(ids)
+            wrong = [(pk, balance, sums.get(pk, Decimal('0.00'))) for pk, balance in balances.items() if balance != sums.get(pk, 0)]
+            if fix and wrong:
+                TenantProfile.objects.filter(pk__in=[pk for pk, _, _ in wrong]).update(
+                    wallet_balance=Case(
+                        *[When(pk=pk, then=Value(total)) for pk, _, total in wrong],
+                        output_field=DecimalField(max_digits=10, decimal_places=2),
+                    )
+                )
+        drifted.extend(wrong)
+    if drifted:
+        logger.warning("Wallet drift on %d tenant(s)%s", len(drifted), ", reset to ledger" if fix else "")
+    return drifted
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.users.models import CustomUser, OwnerProfile, ParentStudentMapping, StaffProfile, TenantProfile
+from apps.users.services import activity_logger, parent_access, profile_cache, roommate_matching, token_revocation
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_user_cache(sender, instance, **kwargs):
+    # After commit: invalidating earlier lets a concurrent request re-cache the old row
+    transaction.on_commit(lambda user_id=instance.pk: profile_cache.invalidate(user_id))
+
+
+@receiver([post_save, post_delete], sender=TenantProfile)
+@receiver([post_save, post_delete], sender=OwnerProfile)
+@receiver([post_save, post_delete], sender=StaffProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    transaction.on_commit(lambda user_id=instance.user_id: profile_cache.invalidate(user_id))
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_tokens_on_deactivation(sender, instance, created, **kwargs):
+    if not created and not instance.is_active:
+        user_id = instance.pk
+
+        def revoke():
+            token_revocation.revoke_user(user_id)
+            activity_logger.log_activity(user_id, 'ACCOUNT_DEACTIVATED')
+        # After commit, like the cache invalidations: a rolled-back deactivation must not log the user out
+        transaction.on_commit(revoke)
+
+
+@receiver(post_save, sender=TenantProfile)
+def update_matching_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        roommate_matching.profile_changed(instance)
+
+
+@receiver(post_delete, sender=TenantProfile)
+def remove_from_matching_index(sender, instance, **kwargs):
+    roommate_matching.profile_deleted(instance.pk)
+
+
+@receiver(pre_save, sender=ParentStudentMapping)
+def remember_mapping_parent(sender, instance, **kwargs):
+    instance._prev_parent_user_id = None
+    if not instance._state.adding:
+        instance._prev_parent_user_id = ParentStudentMapping.objects.filter(pk=instance.pk).values_list(
+            'parent_user_id', flat=True
+        ).first()
+
+
+@receiver([post_save, post_delete], sender=ParentStudentMapping)
+def invalidate_parent_access_on_mapping_change(sender, instance, **kwargs):
+    # A mapping moved to another parent changes both parents' access sets
+    parent_ids = {instance.parent_user_id, getattr(instance, '_prev_parent_user_id', None)} - {None}
+
+    def invalidate():
+        for parent_id in parent_ids:
+            parent_access.invalidate(parent_id)
+    transaction.on_commit(invalidate)
+
+
+@receiver(pre_save, sender=TenantProfile)
+def remember_tenant_residence(sender, instance, **kwargs):
+    instance._prev_residence = None
+    if not instance._state.adding:
+        instance._prev_residence = TenantProfile.objects.filter(pk=instance.pk).values_list(
+            'property_id', 'room_id', 'bed_id'
+        ).first()
+
+
+@receiver(post_save, sender=TenantProfile)
+def invalidate_parent_access_on_residence_change(sender, instance, created, raw=False, **kwargs):
+    prev = getattr(instance, '_prev_residence', None)
+    if raw or created or prev is None:
+        return
+    if prev != (instance.property_id, instance.room_id, instance.bed_id):
+        transaction.on_commit(lambda tenant_id=instance.pk: parent_access.tenants_changed([tenant_id]))
+
+
+@receiver(pre_save, sender=TenantProfile)
+def stamp_notice_date(sender, instance, **kwargs):
+    # Notice is "given" when an exit date first appears; withdrawing it clears the stamp
+    if instance.exit_date is None:
+        instance.notice_given_on = None
+    elif instance.notice_given_on is None and not instance._state.adding:
+        instance.notice_given_on = timezone.localdate()
@@ -0,0 +1,63 @@
+from celery import shared_task
+from django.utils.dateparse import parse_datetime
+
+from apps.users.models import ActivityLog
+from apps.users.services import credit_score, notifications, wallet
+from apps.users.services.notification_channels import ChannelError
+
+
+@shared_task(ignore_result=True)
+def write_activity_logs(entries):
+    """Bulk insert a batch of buffered activity log entries (see services.activity_logger)."""
+    logs = []
+    for entry in entries:
+        entry = dict(entry)
+        entry['timestamp'] = parse_datetime(entry['timestamp'])
+        logs.append(ActivityLog(**entry))
+    ActivityLog.objects.bulk_create(logs, batch_size=500, ignore_conflicts=True)
+    return len(logs)
+
+
+@shared_task(ignore_result=True)
+def reconcile_wallets():
+    """Periodic ledger check (see CELERY_BEAT_SCHEDULE); drift is logged, not corrected."""
+    return len(wallet.reconcile(fix=False))
+
+
+@shared_task(ignore_result=True)
+def recompute_credit_scores(incremental=True):
+    """Hourly incremental / nightly full PG credit score run (see CELERY_BEAT_SCHEDULE)."""
+    return credit_score.run(incremental=incremental)
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def send_notifications(event, tenant_ids=None, property_ids=None, context=None):
+    """Resolve and fan out one notification event off the request path (see services.notifications)."""
+    return notifications.notify(event, tenant_ids=tenant_ids, property_ids=property_ids, context=context)
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    ignore_result=True,
+    rate_limit=notifications.get_config()['RATE_LIMIT'],
+    max_retries=notifications.get_config()['MAX_RETRIES'],
+)
+def send_notification_batch(self, channel, subject, body, recipients):
+    """
+    Deliver one rendered batch. A failed batch, or just its transiently rejected
+    recipients, is retried with backoff; permanent rejections are logged once and dropped.
+    """
+    countdown = notifications.get_config()['RETRY_BACKOFF'] * 2 ** self.request.retries
+    try:
+        transient, permanent = notifications.deliver(channel, subject, body, recipients)
+    except ChannelError as exc:
+        raise self.retry(exc=exc, countdown=countdown)
+    notifications.log_rejected(channel, permanent)
+    if transient:
+        raise self.retry(
+            args=(channel, subject, body, transient),
+            exc=ChannelError(f"{len(transient)} of {len(recipients)} {channel} recipient(s) not delivered"),
+            countdown=countdown,
+        )
+    return len(recipients) - len(permanent)
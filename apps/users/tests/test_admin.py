@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.users.admin import ActivityLogAdmin, WalletTransactionAdmin
+from apps.users.models import (
+    ActivityLog, CustomUser, OwnerProfile, ParentStudentMapping, StaffProfile, TenantProfile, WalletTransaction,
+)
+
+
+def make_user(tag, role='TENANT'):
+    return CustomUser.objects.create(
+        username=f"user-{tag}", phone_number=f"9{tag:0>9}", email=f"user-{tag}@example.com", role=role,
+    )
+
+
+class ChangelistQueryCountTests(TestCase):
+    """
+    Every changelist runs a fixed number of queries however many rows it shows:
+    session, user, at most one COUNT(*) (none on keyset-paginated admins) and one
+    select with the related columns joined. Each test checks the count at ROWS rows.
+    """
+    ROWS = 15
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser(
+            username='admin', phone_number='9000000000', email='admin@example.com', password='admin-pass',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def assertChangelistQueries(self, path, expected):
+        # Warm the lazy admin mount and the filter-choice cache, so only the page itself is counted
+        self.client.get(path)
+        with self.assertNumQueries(expected):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def _tenants(self):
+        return [TenantProfile.objects.create(user=make_user(f"t{i}")) for i in range(self.ROWS)]
+
+    def test_custom_user_changelist(self):
+        for i in range(self.ROWS):
+            make_user(f"u{i}")
+        self.assertChangelistQueries('/admin/users/customuser/', 4)
+
+    def test_owner_profile_changelist(self):
+        for i in range(self.ROWS):
+            OwnerProfile.objects.create(user=make_user(f"o{i}", 'SUPERADMIN'), business_name=f"Owner {i}")
+        self.assertChangelistQueries('/admin/users/ownerprofile/', 4)
+
+    def test_tenant_profile_changelist(self):
+        self._tenants()
+        self.assertChangelistQueries('/admin/users/tenantprofile/', 4)
+
+    def test_staff_profile_changelist(self):
+        for i in range(self.ROWS):
+            StaffProfile.objects.create(user=make_user(f"s{i}", 'STAFF'), role='COOK')
+        self.assertChangelistQueries('/admin/users/staffprofile/', 4)
+
+    def test_parent_student_mapping_changelist(self):
+        for i, tenant in enumerate(self._tenants()):
+            ParentStudentMapping.objects.create(
+                parent_user=make_user(f"p{i}", 'PARENT'), student_tenant=tenant, relationship='MOTHER',
+            )
+        self.assertChangelistQueries('/admin/users/parentstudentmapping/', 4)
+
+    def test_activity_log_changelist(self):
+        user = make_user('log')
+        ActivityLog.objects.bulk_create([ActivityLog(user=user, action=f"ACTION_{i % 3}") for i in range(self.ROWS)])
+        self.assertChangelistQueries('/admin/users/activitylog/', 3)
+
+    def test_wallet_transaction_changelist(self):
+        for i, tenant in enumerate(self._tenants()):
+            WalletTransaction.objects.create(tenant=tenant, kind='TOP_UP', amount=Decimal('100.00'), idempotency_key=f"k{i}")
+        self.assertChangelistQueries('/admin/users/wallettransaction/', 3)
+
+
+class KeysetPaginationTests(TestCase):
+    """Changelists of KeysetPaginatedAdmin, paged by the `before` cursor."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser(
+            username='admin', phone_number='9000000000', email='admin@example.com', password='admin-pass',
+        )
+        user = make_user('log')
+        ActivityLog.objects.bulk_create([ActivityLog(user=user, action=f"ACTION_{i}") for i in range(5)])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def assertPagesThrough(self, path, rows, per_page):
+        response = self.client.get(path)
+        cl = response.context['cl']
+        self.assertEqual(len(cl.result_list), per_page)
+        self.assertContains(response, 'before=')
+        self.assertContains(response, 'Older')
+
+        response = self.client.get(path + cl.keyset_next)
+        cl = response.context['cl']
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(cl.result_list), rows - per_page)
+        self.assertIsNone(cl.keyset_next)
+        self.assertNotContains(response, 'Older')
+        self.assertContains(response, 'Newest')
+
+    def test_activity_log_pages(self):
+        per_page = ActivityLogAdmin.list_per_page
+        user = make_user('pages')
+        ActivityLog.objects.bulk_create([ActivityLog(user=user, action='PAGED') for _ in range(per_page)])
+        self.assertPagesThrough('/admin/users/activitylog/', per_page + 5, per_page)
+
+    def test_wallet_transaction_pages(self):
+        per_page = WalletTransactionAdmin.list_per_page
+        tenant = TenantProfile.objects.create(user=make_user('wallet'))
+        WalletTransaction.objects.bulk_create([
+            WalletTransaction(tenant=tenant, kind='TOP_UP', amount=Decimal('1.00'), idempotency_key=f"page-{i}")
+            for i in range(per_page + 1)
+        ])
+        self.assertPagesThrough('/admin/users/wallettransaction/', per_page + 1, per_page)
+
+    def test_malformed_cursor_shows_first_page(self):
+        for cursor in ('garbage', 'not-a-date|not-a-uuid', '2026-01-01T00:00:00+00:00|not-a-uuid', '|'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/admin/users/activitylog/', {'before': cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.context['cl'].result_list), 5)
+                self.assertTrue(response.context['cl'].keyset_is_first_page)
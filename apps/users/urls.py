@@ -1,8 +1,10 @@
 from django.urls import path
-from apps.users.views import auth_views
+from apps.users.views import activity_log_views, auth_views
 
-# Placeholder URL patterns - Views need to be implemented first
 urlpatterns = [
-    # path('login/', auth_views.LoginView.as_view(), name='login'),
+    path('login/', auth_views.LoginView.as_view(), name='login'),
+    path('token/refresh/', auth_views.TokenRefreshWithRevocationView.as_view(), name='token-refresh'),
+    path('logout/', auth_views.LogoutView.as_view(), name='logout'),
+    path('activity-logs/', activity_log_views.ActivityLogListView.as_view(), name='activity-log-list'),
     # path('register/', auth_views.RegisterView.as_view(), name='register'),
 ]
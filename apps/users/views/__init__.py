@@ -1,3 +1,6 @@
 # Init file for views
-# from .auth_views import LoginView
+from .auth_views import LoginView, LogoutView, TokenRefreshWithRevocationView
+from .activity_log_views import ActivityLogListView
+from .dashboard_views import ParentDashboardView, TenantDashboardView
+from .wallet_views import WalletView, WalletTransactionListView, RentRunView
 # from .user_views import UserViewSet
@@ -0,0 +1,35 @@
+from django.db.models import Q
+from rest_framework import generics
+
+from apps.properties.services import property_access
+from apps.users.models import ActivityLog, StaffProfile, TenantProfile
+from apps.users.serializers import ActivityLogSerializer
+from shared.mixins import ReplicaReadMixin, SparseFieldsetMixin
+
+
+class ActivityLogListView(ReplicaReadMixin, SparseFieldsetMixin, generics.ListAPIView):
+    """
+    GET /api/v1/auth/activity-logs/
+    Newest first, keyset paginated (?cursor=, ?page_size=), sparse via ?fields=.
+    Superusers see every entry; PG owners (SUPERADMIN) their own and those of the
+    tenants and staff of their properties; everyone else only their own.
+    """
+    queryset = ActivityLog.objects.all()
+    serializer_class = ActivityLogSerializer
+    keyset_ordering = '-timestamp'
+    deferred_fields = ('details',)
+    filterset_fields = ['action', 'severity', 'entity_type', 'entity_id', 'user']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_superuser:
+            return queryset
+        if user.role == 'SUPERADMIN':
+            property_ids = property_access.managed_property_ids(user)
+            return queryset.filter(
+                Q(user_id=user.pk)
+                | Q(user_id__in=TenantProfile.objects.filter(property_id__in=property_ids).values('user_id'))
+                | Q(user_id__in=StaffProfile.objects.filter(property_id__in=property_ids).values('user_id'))
+            )
+        return queryset.filter(user_id=user.pk)
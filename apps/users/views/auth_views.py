@@ -1,7 +1,47 @@
-from rest_framework.views import APIView
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from apps.users.serializers import RevocationAwareTokenRefreshSerializer, RoleTokenObtainPairSerializer
+from apps.users.services import activity_logger, token_revocation
+
+
+class LoginView(TokenObtainPairView):
+    """POST /api/v1/auth/login/ - returns access/refresh tokens with role claims."""
+    permission_classes = [AllowAny]
+    serializer_class = RoleTokenObtainPairSerializer
+
+
+class TokenRefreshWithRevocationView(TokenRefreshView):
+    """POST /api/v1/auth/token/refresh/"""
+    permission_classes = [AllowAny]
+    serializer_class = RevocationAwareTokenRefreshSerializer
+
+
+class LogoutView(APIView):
+    """POST /api/v1/auth/logout/ - revokes the current access token and the given refresh token."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        access = request.auth
+        if access is not None:
+            token_revocation.revoke_token(access['jti'], access['exp'])
+
+        refresh = request.data.get('refresh')
+        if refresh:
+            try:
+                token = RefreshToken(refresh)
+            except TokenError:
+                return Response({
+                    'success': False,
+                    'error': {'code': 'VALIDATION_ERROR', 'message': str(_("Invalid refresh token"))},
+                }, status=status.HTTP_400_BAD_REQUEST)
+            token_revocation.revoke_token(token['jti'], token['exp'])
 
-# Placeholder views
-# class LoginView(APIView):
-#     def post(self, request):
-#         return Response({"message": "Login successful"})
+        activity_logger.log_request(request, 'LOGOUT')
+        return Response({'success': True, 'message': "Logged out"}, status=status.HTTP_200_OK)
@@ -0,0 +1,87 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from apps.users.models import CustomUser, TenantProfile
+from apps.users.services import dashboards
+from shared.db_router import replica_reads
+from shared.mixins import ReplicaReadMixin
+
+
+def _error(code, message):
+    return {'success': False, 'error': {'code': code, 'message': message}}
+
+
+def _tenant_id(user_id):
+    return TenantProfile.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+
+
+class TenantDashboardView(ReplicaReadMixin, APIView):
+    """GET /api/v1/dashboard/tenant/ - bed, room, property, roommates and recent activity (sequential reads)."""
+
+    def get(self, request):
+        if request.user.role != CustomUser.Roles.TENANT:
+            return Response(_error('PERMISSION_DENIED', "Tenants only"), status=status.HTTP_403_FORBIDDEN)
+        data = dashboards.tenant_dashboard(_tenant_id(request.user.pk))
+        if data is None:
+            return Response(_error('RESOURCE_NOT_FOUND', "Tenant profile not found"), status=status.HTTP_404_NOT_FOUND)
+        return Response({'success': True, 'data': data}, status=status.HTTP_200_OK)
+
+
+class ParentDashboardView(ReplicaReadMixin, APIView):
+    """GET /api/v1/dashboard/parent/ - the tenant dashboard of every child the parent has access to."""
+
+    def get(self, request):
+        if request.user.role != CustomUser.Roles.PARENT:
+            return Response(_error('PERMISSION_DENIED', "Parents only"), status=status.HTTP_403_FORBIDDEN)
+        return Response({'success': True, 'data': dashboards.parent_dashboard(request.user.pk)}, status=status.HTTP_200_OK)
+
+
+# Async variants: same payloads, independent reads run concurrently (serve under ASGI)
+
+def _authenticate(request):
+    """Run the configured DRF authenticators; returns (user, None) or (None, JsonResponse)."""
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = drf_request.user
+    except APIException as exc:
+        return None, JsonResponse(_error('AUTHENTICATION_FAILED', str(exc.detail)), status=exc.status_code)
+    if not user or not user.is_authenticated:
+        return None, JsonResponse(_error('NOT_AUTHENTICATED', "Authentication credentials were not provided."), status=401)
+    return user, None
+
+
+async def tenant_dashboard_async(request):
+    """GET /api/v1/dashboard/async/tenant/"""
+    if request.method != 'GET':
+        return JsonResponse(_error('METHOD_NOT_ALLOWED', "GET only"), status=405)
+    user, error = await sync_to_async(_authenticate)(request)
+    if error is not None:
+        return error
+    if user.role != CustomUser.Roles.TENANT:
+        return JsonResponse(_error('PERMISSION_DENIED', "Tenants only"), status=403)
+    with replica_reads():
+        tenant_id = await sync_to_async(_tenant_id)(user.pk)
+        data = await dashboards.atenant_dashboard(tenant_id) if tenant_id else None
+    if data is None:
+        return JsonResponse(_error('RESOURCE_NOT_FOUND', "Tenant profile not found"), status=404)
+    return JsonResponse({'success': True, 'data': data})
+
+
+async def parent_dashboard_async(request):
+    """GET /api/v1/dashboard/async/parent/"""
+    if request.method != 'GET':
+        return JsonResponse(_error('METHOD_NOT_ALLOWED', "GET only"), status=405)
+    user, error = await sync_to_async(_authenticate)(request)
+    if error is not None:
+        return error
+    if user.role != CustomUser.Roles.PARENT:
+        return JsonResponse(_error('PERMISSION_DENIED', "Parents only"), status=403)
+    with replica_reads():
+        data = await dashboards.aparent_dashboard(user.pk)
+    return JsonResponse({'success': True, 'data': data})
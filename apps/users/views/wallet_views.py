@@ -0,0 +1,160 @@
+import hashlib
+import uuid
+
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.properties.permissions import IsPropertyOwnerOrManager
+from apps.properties.services import property_access
+from apps.users.models import OwnerProfile, TenantProfile, WalletTransaction
+from apps.users.permissions import IsParentWithAccess, ParentAccessFilterBackend
+from apps.users.serializers import RentRunSerializer, WalletPostingSerializer, WalletTransactionSerializer
+from apps.users.services import activity_logger, wallet
+
+STAFF_ROLES = ('SUPERADMIN', 'MANAGER')
+READER_ROLES = STAFF_ROLES + ('PARENT',)
+
+
+def _error(code, message):
+    return {'success': False, 'error': {'code': code, 'message': message}}
+
+
+def _managed_tenants(user):
+    """Tenants housed in a property the owner/manager administers."""
+    return TenantProfile.objects.filter(property_id__in=property_access.managed_property_ids(user))
+
+
+def _idempotency_key(user, key):
+    """The client's key namespaced per requester; hashed when the result would not fit the column."""
+    scoped = f"api:{user.pk}:{key}"
+    if len(scoped) <= WalletTransaction._meta.get_field('idempotency_key').max_length:
+        return scoped
+    return f"api:{user.pk}:sha256:{hashlib.sha256(key.encode()).hexdigest()[:50]}"
+
+
+def _tenant_scope(request):
+    """
+    Tenant id the request may read: a tenant's own; ?tenant= for owners/managers
+    (tenants of their properties) and parents (checked against their access set).
+    """
+    user = request.user
+    if user.role == 'TENANT':
+        return TenantProfile.objects.filter(user_id=user.pk).values_list('pk', flat=True).first()
+    if user.role not in READER_ROLES:
+        return None
+    try:
+        tenant_id = uuid.UUID(request.query_params.get('tenant', ''))
+    except ValueError:
+        return None
+    if user.role in STAFF_ROLES and not _managed_tenants(user).filter(pk=tenant_id).exists():
+        return None
+    return tenant_id
+
+
+class WalletView(APIView):
+    """GET /api/v1/wallet/ - current balance (tenants: their own; owners/managers/parents: ?tenant=)."""
+    permission_classes = [IsAuthenticated, IsParentWithAccess]
+
+    def get(self, request):
+        tenant_id = _tenant_scope(request)
+        tenant = TenantProfile.objects.filter(pk=tenant_id).only('id', 'wallet_balance').first() if tenant_id else None
+        if tenant is None:
+            return Response(_error('RESOURCE_NOT_FOUND', "Wallet not found"), status=status.HTTP_404_NOT_FOUND)
+        self.check_object_permissions(request, tenant)
+        return Response({'success': True, 'data': {'tenant_id': str(tenant.pk), 'balance': tenant.wallet_balance}}, status=status.HTTP_200_OK)
+
+
+class WalletTransactionListView(generics.ListAPIView):
+    """
+    GET  /api/v1/wallet/transactions/ - ledger entries, newest first, keyset paginated
+         (tenants: their own; owners/managers/parents: ?tenant=).
+    POST /api/v1/wallet/transactions/ (owners/managers, for tenants of their properties;
+         Idempotency-Key header required)
+         {tenant, kind: TOP_UP|REFUND|CHARGE|ADJUSTMENT, amount, reference}
+         201 for a new entry, 200 with the original entry when the key is replayed.
+    """
+    serializer_class = WalletTransactionSerializer
+    permission_classes = [IsAuthenticated, IsParentWithAccess]
+    filter_backends = [*generics.ListAPIView.filter_backends, ParentAccessFilterBackend]
+    parent_access_lookup = ('tenant_id', 'tenant')
+    keyset_ordering = '-created_at'
+    filterset_fields = ['kind', 'reference']
+
+    def get_queryset(self):
+        tenant_id = _tenant_scope(self.request)
+        if tenant_id is None:
+            return WalletTransaction.objects.none()
+        return WalletTransaction.objects.filter(tenant_id=tenant_id)
+
+    def post(self, request):
+        if request.user.role not in STAFF_ROLES:
+            return Response(_error('PERMISSION_DENIED', "Owners and managers only"), status=status.HTTP_403_FORBIDDEN)
+        key = request.headers.get('Idempotency-Key', '').strip()
+        if not key or len(key) > 100:
+            return Response(_error('VALIDATION_ERROR', "An Idempotency-Key header (max 100 chars) is required"), status=status.HTTP_400_BAD_REQUEST)
+        serializer = WalletPostingSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(_error('VALIDATION_ERROR', serializer.errors), status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        tenant_user_id = _managed_tenants(request.user).filter(pk=data['tenant']).values_list('user_id', flat=True).first()
+        if tenant_user_id is None:
+            return Response(_error('RESOURCE_NOT_FOUND', "Tenant not found"), status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            entry, created = wallet.post(
+                data['tenant'], data['amount'], data['kind'], _idempotency_key(request.user, key),
+                reference=data.get('reference') or None, created_by=request.user,
+            )
+        except wallet.IdempotencyConflict as exc:
+            return Response(_error(exc.code, str(exc)), status=status.HTTP_409_CONFLICT)
+        except wallet.WalletError as exc:
+            return Response(_error(exc.code, str(exc)), status=status.HTTP_400_BAD_REQUEST)
+
+        payload = WalletTransactionSerializer(entry).data
+        if created:
+            payload['balance_after'] = entry.balance_after
+            activity_logger.log_request(
+                request, f"WALLET_{entry.kind}", details=f"{entry.amount} for tenant {data['tenant']}",
+                entity_type='PAYMENT', entity_id=entry.pk,
+            )
+            if entry.kind == 'CHARGE':
+                # Fines and damages count against the tenant's conduct score
+                activity_logger.log_activity(
+                    tenant_user_id, 'WALLET_CHARGE', details=entry.reference,
+                    severity='WARNING', entity_type='PAYMENT', entity_id=entry.pk,
+                )
+        return Response({'success': True, 'data': payload}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class RentRunView(APIView):
+    """
+    POST /api/v1/wallet/rent-run/ {month: "YYYY-MM", properties?: [...], owner?: (managers)}
+    Debits the month's rent from every housed tenant of the owner's properties
+    (for managers: the ones they manage).
+    Safe to repeat: each tenant-month is posted once.
+    """
+    permission_classes = [IsPropertyOwnerOrManager]
+
+    def post(self, request):
+        serializer = RentRunSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(_error('VALIDATION_ERROR', serializer.errors), status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        if request.user.role == 'SUPERADMIN':
+            owner_id = OwnerProfile.objects.filter(user_id=request.user.pk).values_list('id', flat=True).first()
+        else:
+            owner_id = data.get('owner')
+        if owner_id is None or not OwnerProfile.objects.filter(pk=owner_id).exists():
+            return Response(_error('RESOURCE_NOT_FOUND', "Owner profile not found"), status=status.HTTP_404_NOT_FOUND)
+
+        properties = property_access.managed_properties(request.user).filter(owner_id=owner_id)
+        if data.get('properties'):
+            properties = properties.filter(pk__in=data['properties'])
+        result = wallet.post_rent(data['month'], property_ids=list(properties.values_list('pk', flat=True)), created_by=request.user)
+        activity_logger.log_request(
+            request, 'RENT_RUN', details=f"{data['month']} owner {owner_id}: {result['posted']} posted, {result['skipped']} skipped",
+        )
+        return Response({'success': True, 'data': {'month': data['month'], **result}}, status=status.HTTP_200_OK)
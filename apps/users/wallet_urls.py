@@ -0,0 +1,8 @@
+from django.urls import path
+from apps.users.views import wallet_views
+
+urlpatterns = [
+    path('', wallet_views.WalletView.as_view(), name='wallet'),
+    path('transactions/', wallet_views.WalletTransactionListView.as_view(), name='wallet-transactions'),
+    path('rent-run/', wallet_views.RentRunView.as_view(), name='wallet-rent-run'),
+]
@@ -0,0 +1,15 @@
+"""
+Admin URLs, mounted lazily from pgmanagement.urls.
+
+INSTALLED_APPS uses SimpleAdminConfig, so the admin.py modules are imported
+(autodiscover) here, on the first /admin/ request, rather than in every worker at boot.
+"""
+
+from django.contrib import admin
+from django.urls import path
+
+admin.autodiscover()
+
+urlpatterns = [
+    path('', admin.site.urls),
+]
@@ -0,0 +1,13 @@
+"""
+Celery application for pgmanagement.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pgmanagement.settings')
+
+app = Celery('pgmanagement')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
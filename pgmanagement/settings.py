@@ -2,6 +2,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+from celery.schedules import crontab
+
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -22,8 +24,14 @@ ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
 
 # Application definition
 
+# Admin and API docs load lazily: SimpleAdminConfig skips autodiscover at boot
+# (pgmanagement/admin_urls.py runs it on the first /admin/ request) and drf_yasg
+# is only installed for its UI assets when the docs are enabled
+ADMIN_ENABLED = os.environ.get('ADMIN_ENABLED', 'True') == 'True'
+API_DOCS_ENABLED = os.environ.get('API_DOCS_ENABLED', 'True') == 'True'
+
 DJANGO_APPS = [
-    'django.contrib.admin',
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -35,8 +43,9 @@ THIRD_PARTY_APPS = [
     'rest_framework',
     'corsheaders',
     'django_filters',
-    'drf_yasg',
 ]
+if API_DOCS_ENABLED:
+    THIRD_PARTY_APPS.append('drf_yasg')
 
 # Local Apps (Modular Monolith)
 LOCAL_APPS = [
@@ -60,7 +69,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # Custom middleware will correspond to shared/middleware files
-    # 'shared.middleware.logging_middleware.RequestLoggingMiddleware',
+    'shared.middleware.logging_middleware.RequestLoggingMiddleware',
 ]
 
 ROOT_URLCONF = 'pgmanagement.urls'
@@ -90,17 +99,37 @@ WSGI_APPLICATION = 'pgmanagement.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Persistent connections: each worker thread keeps its connection for
+# DB_CONN_MAX_AGE seconds (then recycles it, keep it below MySQL's wait_timeout)
+# and pings it before reuse after an error.
+DB_CONNECTION = {
+    'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 300)),
+    'CONN_HEALTH_CHECKS': True,
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': os.environ.get('DB_ENGINE', 'django.db.backends.mysql'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST'),
         'PORT': os.environ.get('DB_PORT'),
+        **DB_CONNECTION,
     }
 }
 
+# Read replicas (comma separated hosts), used by shared.db_router for read-only views
+for index, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'REPLICA_OF': 'default',
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['shared.db_router.PrimaryReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -154,9 +183,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.CustomUser'
 
 # DRF Configuration
+# AUTH_MODE=stateless trusts role/is_active token claims instead of resolving the user per request
+AUTH_MODE = os.environ.get('AUTH_MODE', 'cached')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.StatelessJWTAuthentication' if AUTH_MODE == 'stateless'
+        else 'apps.users.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
@@ -165,10 +198,31 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'shared.pagination.KeysetPagination',
     'PAGE_SIZE': 10,
 }
 
+# Cap for ?page_size= on list endpoints
+API_PAGINATION = {
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 10)),
+    'MAX_PAGE_SIZE': int(os.environ.get('API_MAX_PAGE_SIZE', 100)),
+}
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.auth_serializers.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.auth_serializers.RevocationAwareTokenRefreshSerializer',
+}
+
+# Revoked tokens/users for the stateless auth path (apps.users.services.token_revocation)
+TOKEN_REVOCATION = {
+    'REDIS_URL': os.environ.get('REDIS_URL'),
+    'SYNC_INTERVAL': 5,
+    'BLOOM_CAPACITY': 100000,
+    'BLOOM_ERROR_RATE': 0.001,
+}
+
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True  # Setup specific rules in production
 
@@ -177,6 +231,173 @@ CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
+CELERY_BEAT_SCHEDULE = {
+    'bill-electricity-monthly': {
+        'task': 'apps.properties.tasks.bill_previous_month_electricity',
+        'schedule': crontab(day_of_month='1', hour='2', minute='0'),
+    },
+    'reconcile-portfolio-rollups': {
+        'task': 'apps.properties.tasks.reconcile_portfolio_rollups',
+        'schedule': 6 * 60 * 60,
+    },
+    'credit-scores-incremental': {
+        'task': 'apps.users.tasks.recompute_credit_scores',
+        'schedule': crontab(minute='15'),
+        'kwargs': {'incremental': True},
+    },
+    'credit-scores-full': {
+        'task': 'apps.users.tasks.recompute_credit_scores',
+        'schedule': crontab(hour='4', minute='0'),
+        'kwargs': {'incremental': False},
+    },
+    'reconcile-wallets': {
+        'task': 'apps.users.tasks.reconcile_wallets',
+        'schedule': crontab(hour='3', minute='30'),
+    },
+}
+
+# Caching (Redis when REDIS_URL is set, per-process memory otherwise)
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'shared.cache_backends.InstrumentedRedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'shared.cache_backends.InstrumentedLocMemCache',
+        }
+    }
+
+# Request instrumentation (shared.middleware.logging_middleware), scraped at /metrics/
+PERFORMANCE_MONITORING = {
+    'SAMPLE_RATE': float(os.environ.get('PERF_SAMPLE_RATE', 1.0 if DEBUG else 0.05)),
+    'PROFILE_SAMPLE_RATE': float(os.environ.get('PERF_PROFILE_SAMPLE_RATE', 0.0)),
+    'SLOW_REQUEST_MS': int(os.environ.get('PERF_SLOW_REQUEST_MS', 500)),
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'PROFILE_DIR': BASE_DIR / 'profiles',
+    'METRICS_ALLOWED_IPS': os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(','),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'pgmanagement.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Async tenant/parent dashboards (apps.users.services.dashboards)
+ASYNC_DASHBOARD = {
+    'MAX_DB_THREADS': int(os.environ.get('DASHBOARD_DB_THREADS', 16)),
+    'PER_REQUEST_CONCURRENCY': 4,
+    'ACTIVITY_DAYS': 30,
+    'ACTIVITY_LIMIT': 10,
+}
+
+# Role/profile resolution cache (apps.users.services.profile_cache)
+PROFILE_CACHE = {
+    'LOCAL_MAX_ENTRIES': 10000,
+    'LOCAL_TTL': 30,
+    'SHARED_TTL': 3600,
+}
+
+# Smart-meter ingestion (apps.properties.services.meter_ingest)
+IOT_INGEST = {
+    'BUCKET_SECONDS': 3600,
+    'FLUSH_INTERVAL': 2.0,
+    'ROOM_DEBOUNCE': 300,
+    'API_KEYS': [key for key in os.environ.get('IOT_API_KEYS', '').split(',') if key],
+}
+
+# Monthly per-bed electricity bills (apps.properties.services.electricity_billing)
+ELECTRICITY_BILLING = {
+    'RATE_PER_UNIT': os.environ.get('ELECTRICITY_RATE_PER_UNIT', '8.00'),
+}
+
+# Public bed share links (apps.properties.services.public_listing)
+PUBLIC_LISTING = {
+    'LOCAL_TTL': 5,
+    'SHARED_TTL': 3600,
+    'MAX_AGE': 60,
+    'S_MAXAGE': 300,
+}
+
+# Owner portfolio CSV/XLSX exports (apps.properties.services.portfolio_export)
+PORTFOLIO_EXPORT = {
+    'CHUNK_SIZE': 2000,
+    'STREAM_MAX_ROWS': int(os.environ.get('PORTFOLIO_EXPORT_STREAM_MAX_ROWS', 200000)),
+    'RETENTION_HOURS': 24,
+}
+
+# Uploaded photos: thumbnails, responsive sizes, dedupe (apps.properties.services.media_pipeline)
+MEDIA_PIPELINE = {
+    'WIDTHS': (320, 640, 1280, 1920),
+    'THUMBNAIL_SIZE': 200,
+    'MAX_UPLOAD_BYTES': 15 * 1024 * 1024,
+    'CHUNK_SIZE': 8,
+    'WORKERS': int(os.environ['MEDIA_PIPELINE_WORKERS']) if os.environ.get('MEDIA_PIPELINE_WORKERS') else None,
+}
+
+# Tenant wallet ledger (apps.users.services.wallet)
+WALLET = {
+    'BATCH_SIZE': 1000,
+    'DEADLOCK_RETRIES': 3,
+}
+
+# PG credit score weights (apps.users.services.credit_score)
+CREDIT_SCORE = {
+    'BASE': 700,
+    'WARNING_POINTS': 15,
+    'CRITICAL_POINTS': 60,
+    'DUES_POINTS_PER_MONTH': 75,
+}
+
+# Notification fan-out (apps.users.services.notifications); the email channel
+# goes through EMAIL_BACKEND, so DEBUG prints to the console
+NOTIFICATIONS = {
+    'USE_CELERY': os.environ.get('NOTIFICATIONS_USE_CELERY', str(not DEBUG)) == 'True',
+    'RATE_LIMIT': os.environ.get('NOTIFICATIONS_RATE_LIMIT', '20/s'),
+    'MAX_RETRIES': 5,
+    'RETRY_BACKOFF': 30,
+    'CHANNELS': {
+        'email': {'BACKEND': 'apps.users.services.notification_channels.EmailChannel', 'BATCH_SIZE': 100},
+        'sms': {'BACKEND': 'apps.users.services.notification_channels.ConsoleSMSChannel', 'BATCH_SIZE': 500},
+    },
+}
+
+# Prebuilt OpenAPI schema and lazily mounted admin/docs (shared.api_docs)
+API_DOCS = {
+    'ENABLED': API_DOCS_ENABLED,
+    'ADMIN_ENABLED': ADMIN_ENABLED,
+    'VERSIONS': ('v1',),
+    'OUTPUT_DIR': BASE_DIR / 'static' / 'openapi',
+    'GENERATE_ON_MISS': DEBUG,
+    'MAX_AGE': 300,
+}
+
+# Parent -> tenant/property access sets (apps.users.services.parent_access)
+PARENT_ACCESS = {
+    'LOCAL_MAX_ENTRIES': 20000,
+    'LOCAL_TTL': 10,
+    'SHARED_TTL': 3600,
+}
+
+# Audit Logging (apps.users.services.activity_logger)
+ACTIVITY_LOG = {
+    'BATCH_SIZE': int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', 200)),
+    'FLUSH_INTERVAL': float(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL', 2.0)),
+    'MAX_PENDING': 10000,
+    'BLOCK_TIMEOUT': 0.5,
+    'USE_CELERY': os.environ.get('ACTIVITY_LOG_USE_CELERY', 'False') == 'True',
+    'RETENTION_MONTHS': int(os.environ.get('ACTIVITY_LOG_RETENTION_MONTHS', 12)),
+    'ARCHIVE_DIR': BASE_DIR / 'archives' / 'activity_logs',
+}
 
 # Email Backend
 if DEBUG:
@@ -1,39 +1,43 @@
-from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Smart PG Management API",
-      default_version='v1',
-      description="API documentation for PG Management System",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="contact@pgmanagement.local"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
+from shared import api_docs
+from shared.lazy_urls import lazy_include, lazy_view
+from shared.views import metrics_view
+
+# Admin and docs modules are imported on their first request (see shared.lazy_urls);
+# the OpenAPI schema is prebuilt by `manage.py build_openapi_schema`.
+API_DOCS = api_docs.get_config()
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    
-    # Swagger Documentation
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('metrics/', metrics_view, name='metrics'),
 
     # API Endpoints
     path('api/v1/auth/', include('apps.users.urls')),  # Auth & Users
+    path('api/v1/properties/', include('apps.properties.urls')),  # Properties, Rooms & Beds
+    path('api/v1/dashboard/', include('apps.users.dashboard_urls')),  # Tenant & Parent dashboards (sync + async)
+    path('api/v1/wallet/', include('apps.users.wallet_urls')),  # Tenant wallet ledger
     
     # Placeholders for future apps
-    # path('api/v1/properties/', include('apps.properties.urls')),
     # path('api/v1/bookings/', include('apps.bookings.urls')),
 ]
 
+if API_DOCS['ADMIN_ENABLED']:
+    urlpatterns.append(lazy_include('admin/', 'pgmanagement.admin_urls'))
+
+if API_DOCS['ENABLED']:
+    # Swagger Documentation
+    urlpatterns += [
+        path('swagger/', lazy_view('shared.docs_views.swagger_ui_view'), name='schema-swagger-ui'),
+        path('redoc/', lazy_view('shared.docs_views.redoc_view'), name='schema-redoc'),
+        re_path(
+            r'^openapi/(?P<version>v\d+)\.(?P<fmt>json|yaml)$',
+            lazy_view('shared.docs_views.openapi_schema_view'),
+            name='schema-file',
+        ),
+    ]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -0,0 +1,199 @@
+"""
+Admin building blocks for tables that grow into the millions of rows.
+"""
+
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import ForeignKey, OneToOneField, Q
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep
+ESTIMATE_THRESHOLD = 100000
+
+
+def estimate_table_rows(model, using='default'):
+    """Planner/statistics row estimate for a model's table, or None if unavailable."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Uses the table statistics instead of COUNT(*) for unfiltered, large changelists."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, 'query') and not queryset.query.where:
+            estimate = estimate_table_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class ListOnlyChangeList(ChangeList):
+    """Loads only the columns list_display needs (wide Text/JSON fields stay deferred)."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        fields = self.model_admin.get_list_only_fields(request)
+        return queryset.only(*fields) if fields else queryset
+
+
+class PerformantModelAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin whose changelist joins the FKs shown in list_display, defers unused
+    columns and never runs a second full-table COUNT(*).
+
+    `list_select_related_extra` adds paths a related __str__ needs beyond the FK
+    itself (e.g. 'student_tenant__user' because TenantProfile.__str__ reads user).
+    """
+    list_select_related_extra = ()
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def _list_display_fields(self, request):
+        names = set()
+        for name in self.get_list_display(request):
+            try:
+                names.add(self.model._meta.get_field(name))
+            except FieldDoesNotExist:
+                continue
+        return names
+
+    def get_list_select_related(self, request):
+        paths = [
+            field.name for field in self._list_display_fields(request)
+            if isinstance(field, (ForeignKey, OneToOneField))
+        ]
+        return tuple(paths) + tuple(self.list_select_related_extra)
+
+    def get_list_only_fields(self, request):
+        """
+        Concrete columns for only(). Returns () (load everything) as soon as
+        list_display contains a callable or property we cannot see into.
+        """
+        fields = self._list_display_fields(request)
+        if len(fields) != len(self.get_list_display(request)):
+            return ()
+        names = {self.model._meta.pk.name}
+        names.update(field.name for field in fields)
+        # Related rows joined by select_related are loaded in full
+        for path in self.get_list_select_related(request):
+            names.add(path)
+        return tuple(names)
+
+    def get_changelist(self, request, **kwargs):
+        return ListOnlyChangeList
+
+
+class RecentValuesListFilter(admin.SimpleListFilter):
+    """
+    Filter choices taken from the most recent rows instead of SELECT DISTINCT over
+    the whole table; cached briefly. Subclasses set `title`, `parameter_name`,
+    `field_name` and optionally `ordering_field`.
+    """
+    field_name = None
+    ordering_field = '-pk'
+    sample_size = 5000
+    cache_timeout = 600
+
+    def lookups(self, request, model_admin):
+        key = f"admin-filter:{model_admin.model._meta.label_lower}:{self.field_name}"
+        values = cache.get(key)
+        if values is None:
+            recent = model_admin.model.objects.order_by(self.ordering_field).values_list(self.field_name, flat=True)
+            values = sorted({value for value in recent[:self.sample_size] if value})
+            cache.set(key, values, self.cache_timeout)
+        return [(value, value) for value in values]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.field_name: self.value()})
+        return queryset
+
+
+class KeysetChangeList(ListOnlyChangeList):
+    """
+    Changelist paged by (timestamp, pk) cursor instead of OFFSET, and without any
+    COUNT. The cursor travels in the `before` query parameter (stripped from the
+    filter parameters by KeysetPaginatedAdmin.changelist_view).
+    """
+
+    def _parse_cursor(self, cursor):
+        """(value, pk) from a `before` cursor, or None if it is missing or malformed."""
+        if not cursor:
+            return None
+        value, _, pk = cursor.partition('|')
+        try:
+            value = self.model._meta.get_field(self.model_admin.keyset_field).to_python(value)
+            pk = self.model._meta.pk.to_python(pk)
+        except ValidationError:
+            return None
+        if value is None or pk is None:
+            return None
+        return value, pk
+
+    def get_results(self, request):
+        field = self.model_admin.keyset_field
+        queryset = self.queryset.order_by(f'-{field}', '-pk')
+        cursor = self._parse_cursor(getattr(request, '_keyset_cursor', None))
+        if cursor:
+            value, pk = cursor
+            # The bare range lets the index on `field` serve both the filter and the ORDER BY
+            queryset = queryset.filter(Q(**{f'{field}__lte': value}), Q(**{f'{field}__lt': value}) | Q(pk__lt=pk))
+
+        rows = list(queryset[:self.list_per_page + 1])
+        has_next = len(rows) > self.list_per_page
+        rows = rows[:self.list_per_page]
+
+        self.result_list = rows
+        self.result_count = len(rows)
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = False
+        self.paginator = Paginator(rows, self.list_per_page)
+        self.keyset_is_first_page = cursor is None
+        self.keyset_next = None
+        if has_next:
+            last = rows[-1]
+            marker = getattr(last, field)
+            marker = marker.isoformat() if hasattr(marker, 'isoformat') else marker
+            self.keyset_next = self.get_query_string({'before': f"{marker}|{last.pk}"})
+
+
+class KeysetPaginatedAdmin(PerformantModelAdmin):
+    """
+    PerformantModelAdmin for append-mostly tables browsed newest first by `keyset_field`.
+    The change list template swaps the page-number paginator for Newest / Older links.
+    """
+    keyset_field = 'timestamp'
+    sortable_by = ()
+    change_list_template = 'admin/keyset_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def changelist_view(self, request, extra_context=None):
+        if 'before' in request.GET:
+            params = request.GET.copy()
+            request._keyset_cursor = params.pop('before')[0]
+            request.GET = params
+        return super().changelist_view(request, extra_context)
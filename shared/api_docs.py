@@ -0,0 +1,132 @@
+"""
+Prebuilt OpenAPI schema for the Swagger/ReDoc pages.
+
+`manage.py build_openapi_schema` introspects the API once (at build/deploy time)
+and writes OUTPUT_DIR/<version>.json and .yaml. OUTPUT_DIR sits under
+STATICFILES_DIRS, so collectstatic ships the same files. Workers serve the bytes
+with a content-hash ETag and never import drf_yasg's generator. A file is read
+once per process and re-read only when its mtime changes. With GENERATE_ON_MISS
+(DEBUG by default) a missing file is generated in memory on the first hit instead.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULTS = {
+    'ENABLED': True,             # mount /swagger/, /redoc/ and /openapi/
+    'ADMIN_ENABLED': True,       # mount /admin/
+    'VERSIONS': ('v1',),
+    'OUTPUT_DIR': None,          # BASE_DIR/static/openapi
+    'GENERATE_ON_MISS': None,    # settings.DEBUG
+    'MAX_AGE': 300,
+}
+
+FORMATS = {
+    'json': 'application/json',
+    'yaml': 'application/yaml; charset=utf-8',
+}
+
+# (version, fmt) -> (mtime_ns or None when generated, etag, body)
+_loaded = {}
+_lock = threading.Lock()
+
+
+def get_config():
+    config = {**DEFAULTS, **getattr(settings, 'API_DOCS', {})}
+    if config['OUTPUT_DIR'] is None:
+        config['OUTPUT_DIR'] = Path(settings.BASE_DIR) / 'static' / 'openapi'
+    if config['GENERATE_ON_MISS'] is None:
+        config['GENERATE_ON_MISS'] = settings.DEBUG
+    return config
+
+
+def schema_info(version):
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Smart PG Management API",
+        default_version=version,
+        description="API documentation for PG Management System",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="contact@pgmanagement.local"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+def generate(version):
+    """Introspect every view and serializer: {fmt: bytes}. Slow; meant for build time."""
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    schema = OpenAPISchemaGenerator(schema_info(version), version=version).get_schema(request=None, public=True)
+    return {
+        'json': OpenAPICodecJson(validators=[]).encode(schema),
+        'yaml': OpenAPICodecYaml(validators=[]).encode(schema),
+    }
+
+
+def schema_path(version, fmt, output_dir=None):
+    return Path(output_dir or get_config()['OUTPUT_DIR']) / f'{version}.{fmt}'
+
+
+def _write(path, body):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+
+def build(output_dir=None, versions=None):
+    """Write every version in both formats. Returns [(path, bytes)]."""
+    config = get_config()
+    output_dir = Path(output_dir or config['OUTPUT_DIR'])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for version in versions or config['VERSIONS']:
+        for fmt, body in generate(version).items():
+            path = schema_path(version, fmt, output_dir)
+            _write(path, body)
+            written.append((path, len(body)))
+    return written
+
+
+def _etag(body):
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def get_schema(version, fmt):
+    """(etag, body) for a prebuilt schema, or None when it is not available."""
+    config = get_config()
+    if version not in config['VERSIONS'] or fmt not in FORMATS:
+        return None
+    key = (version, fmt)
+    path = schema_path(version, fmt)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    entry = _loaded.get(key)
+    if entry is not None and entry[0] == mtime:
+        return entry[1:]
+
+    with _lock:
+        entry = _loaded.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1:]
+        if mtime is not None:
+            body = path.read_bytes()
+            _loaded[key] = (mtime, _etag(body), body)
+        elif config['GENERATE_ON_MISS']:
+            for name, body in generate(version).items():
+                _loaded[(version, name)] = (None, _etag(body), body)
+        else:
+            return None
+    return _loaded[key][1:]
+
+
+def cache_control():
+    return f"public, max-age={get_config()['MAX_AGE']}"
@@ -0,0 +1,38 @@
+"""
+Django cache backends that count hits and misses for the performance middleware
+(shared.middleware.logging_middleware). Drop-in replacements for the stock ones.
+"""
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from shared.middleware.logging_middleware import record_cache_lookup
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    backend_label = None
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            record_cache_lookup(self.backend_label, 0, 1)
+            return default
+        record_cache_lookup(self.backend_label, 1, 0)
+        return value
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    backend_label = 'redis'
+
+    def get_many(self, keys, version=None):
+        # RedisCache fetches in one MGET; the base implementation would go through get()
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        record_cache_lookup(self.backend_label, len(found), len(keys) - len(found))
+        return found
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    backend_label = 'locmem'
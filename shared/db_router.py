@@ -0,0 +1,67 @@
+"""
+Primary/replica routing.
+
+Writes always go to 'default'. Reads go to a replica only inside replica_reads()
+(ReplicaReadMixin wraps read-only API views in it), and never once the current
+request has written something, is inside a transaction, or when no replica is
+configured - so a request always sees its own writes.
+"""
+
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+
+PRIMARY = 'default'
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+_pinned = contextvars.ContextVar('pinned_to_primary', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != PRIMARY and settings.DATABASES[alias].get('REPLICA_OF') == PRIMARY]
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_to_primary():
+    """Route every later read of this request/task to the primary."""
+    _pinned.set(True)
+
+
+def reset(**kwargs):
+    # Worker threads are reused between requests, so stickiness must not leak across them
+    _pinned.set(False)
+    _replica_reads.set(False)
+
+
+request_started.connect(reset, dispatch_uid='shared.db_router.reset')
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or _pinned.get() or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY, *replica_aliases()}
+        return obj1._state.db in aliases and obj2._state.db in aliases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
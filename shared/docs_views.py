@@ -0,0 +1,123 @@
+"""
+Swagger UI / ReDoc pages over the prebuilt schema (shared.api_docs).
+
+The pages are static shells that fetch /openapi/<version>.json, so opening the
+docs no longer introspects the API. The UI scripts are the copies bundled with
+drf_yasg and served as static files.
+"""
+
+import json
+
+from django.http import HttpResponse
+from django.templatetags.static import static
+from django.urls import get_script_prefix
+from django.views.decorators.http import require_GET
+
+from shared import api_docs
+
+SWAGGER_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Smart PG Management API</title>
+<link rel="stylesheet" href="{css}">
+</head>
+<body>
+<div id="swagger-ui"></div>
+<script src="{bundle}"></script>
+<script src="{preset}"></script>
+<script>
+window.ui = SwaggerUIBundle({{
+  url: {url},
+  dom_id: "#swagger-ui",
+  presets: [SwaggerUIBundle.presets.apis, SwaggerUIStandalonePreset],
+  layout: "StandaloneLayout",
+  persistAuthorization: true
+}});
+</script>
+</body>
+</html>
+"""
+
+REDOC_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Smart PG Management API</title>
+</head>
+<body>
+<redoc spec-url={url}></redoc>
+<script src="{bundle}"></script>
+</body>
+</html>
+"""
+
+
+def _schema_url(request):
+    # Not reverse(): populating the resolver would import the lazily mounted admin
+    versions = api_docs.get_config()['VERSIONS']
+    version = request.GET.get('version')
+    if version not in versions:
+        version = versions[0]
+    return json.dumps(f'{get_script_prefix()}openapi/{version}.json')
+
+
+def _page(html):
+    response = HttpResponse(html)
+    response['Cache-Control'] = api_docs.cache_control()
+    return response
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    return header.strip() == '*' or etag in [value.strip() for value in header.split(',')]
+
+
+@require_GET
+def swagger_ui_view(request):
+    """GET /swagger/"""
+    return _page(SWAGGER_PAGE.format(
+        css=static('drf-yasg/swagger-ui-dist/swagger-ui.css'),
+        bundle=static('drf-yasg/swagger-ui-dist/swagger-ui-bundle.js'),
+        preset=static('drf-yasg/swagger-ui-dist/swagger-ui-standalone-preset.js'),
+        url=_schema_url(request),
+    ))
+
+
+@require_GET
+def redoc_view(request):
+    """GET /redoc/"""
+    return _page(REDOC_PAGE.format(
+        bundle=static('drf-yasg/redoc/redoc.min.js'),
+        url=_schema_url(request),
+    ))
+
+
+@require_GET
+def openapi_schema_view(request, version, fmt):
+    """
+    GET /openapi/<version>.json | .yaml
+    The prebuilt schema with a content-hash ETag; If-None-Match answers 304.
+    """
+    entry = api_docs.get_schema(version, fmt)
+    if entry is None:
+        return HttpResponse(
+            json.dumps({
+                'success': False,
+                'error': {
+                    'code': 'RESOURCE_NOT_FOUND',
+                    'message': "Schema not built; run manage.py build_openapi_schema",
+                },
+            }),
+            status=404,
+            content_type='application/json',
+        )
+    etag, body = entry
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(body, content_type=api_docs.FORMATS[fmt])
+    response['ETag'] = etag
+    response['Cache-Control'] = api_docs.cache_control()
+    return response
@@ -0,0 +1,31 @@
+"""
+URL entries whose modules are imported on first use instead of at URLconf load.
+
+include() imports its urlconf immediately. lazy_include() builds the URLResolver
+directly, and a URLResolver only imports its urlconf_name when a request path
+matches its prefix, or when reverse() populates the resolver. Give lazy entries
+a distinct prefix: an empty one would match, and import, on every request.
+"""
+
+from django.urls import URLResolver
+from django.urls.resolvers import RoutePattern
+from django.utils.module_loading import import_string
+
+
+def lazy_include(route, urlconf_name, namespace=None):
+    return URLResolver(RoutePattern(route, is_endpoint=False), urlconf_name, namespace=namespace)
+
+
+def lazy_view(dotted_path):
+    """A view function that imports `dotted_path` on its first call."""
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path)
+        return view(request, *args, **kwargs)
+
+    wrapper.__name__ = dotted_path.rsplit('.', 1)[-1]
+    wrapper.__qualname__ = wrapper.__name__
+    return wrapper
@@ -0,0 +1,197 @@
+"""
+Per-request performance instrumentation.
+
+Every request records wall time and status into Prometheus histograms/counters
+(a couple of perf_counter calls and a dict update). A sampled fraction
+(SAMPLE_RATE) additionally wraps every DB connection with execute_wrapper to
+count queries, time them and spot the same statement repeated from one call site
+(N+1). An even smaller fraction (PROFILE_SAMPLE_RATE) runs under cProfile, and
+the profile is written out only when the request turned out slow.
+"""
+
+import cProfile
+import contextvars
+import hashlib
+import logging
+import random
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from shared.utils import metrics
+
+logger = logging.getLogger('pgmanagement.performance')
+
+DEFAULTS = {
+    'SAMPLE_RATE': 1.0,
+    'PROFILE_SAMPLE_RATE': 0.0,
+    'SLOW_REQUEST_MS': 500,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'PROFILE_DIR': None,
+}
+
+current_stats = contextvars.ContextVar('request_perf_stats', default=None)
+
+REQUESTS = metrics.counter('http_requests_total', 'HTTP requests by method, route and status.', ('method', 'route', 'status'))
+DURATION = metrics.histogram('http_request_duration_seconds', 'Request wall time.', ('method', 'route'))
+DB_QUERIES = metrics.histogram(
+    'db_queries_per_request', 'DB queries per sampled request.', ('route',),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+DB_TIME = metrics.histogram('db_time_per_request_seconds', 'Total DB time per sampled request.', ('route',))
+N_PLUS_ONE = metrics.counter('db_n_plus_one_total', 'Requests with a statement repeated from one call site.', ('route',))
+CACHE_LOOKUPS = metrics.counter('django_cache_lookups_total', 'Django cache lookups by outcome.', ('backend', 'result'))
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'PERFORMANCE_MONITORING', {})}
+
+
+def _call_site():
+    """First frame inside the project that is not Django/DRF or this module."""
+    base = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(base) and 'site-packages' not in filename and filename != __file__:
+            return f"{Path(filename).relative_to(base)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class RequestStats:
+    def __init__(self, n_plus_one_threshold, track_queries=True):
+        self.threshold = n_plus_one_threshold
+        self.track_queries = track_queries
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = {}
+        self.repeated = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Statements arrive parameterised, so the SQL text is already the query shape
+        count = self.statements.get(sql, 0) + 1
+        self.statements[sql] = count
+        if count == self.threshold:
+            site = _call_site()
+            fingerprint = hashlib.blake2b(f"{sql}|{site}".encode(), digest_size=6).hexdigest()
+            self.repeated[fingerprint] = (site, sql)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    def record_cache(self, hits, misses):
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+
+def record_cache_lookup(backend, hits, misses):
+    """Called by shared.cache_backends on every get/get_many."""
+    if hits:
+        CACHE_LOOKUPS.inc(backend, 'hit', amount=hits)
+    if misses:
+        CACHE_LOOKUPS.inc(backend, 'miss', amount=misses)
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record_cache(hits, misses)
+
+
+class RequestLoggingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        profile_dir = self.config['PROFILE_DIR']
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        config = self.config
+        sampled = random.random() < config['SAMPLE_RATE']
+        profiler = None
+        if self.profile_dir is not None and random.random() < config['PROFILE_SAMPLE_RATE']:
+            profiler = cProfile.Profile()
+
+        stats = RequestStats(config['N_PLUS_ONE_THRESHOLD']) if sampled else None
+        token = current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                if stats is not None:
+                    for alias in connections:
+                        stack.enter_context(connections[alias].execute_wrapper(stats))
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            current_stats.reset(token)
+        self._record(request, response, time.perf_counter() - start, stats, profiler)
+        return response
+
+    async def __acall__(self, request):
+        # Under ASGI the ORM runs in worker threads that per-connection execute_wrappers
+        # installed here do not reach, so only timing and cache lookups are recorded.
+        sampled = random.random() < self.config['SAMPLE_RATE']
+        stats = RequestStats(self.config['N_PLUS_ONE_THRESHOLD'], track_queries=False) if sampled else None
+        token = current_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        self._record(request, response, time.perf_counter() - start, stats, None)
+        return response
+
+    def _record(self, request, response, elapsed, stats, profiler):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else 'unmatched'
+        REQUESTS.inc(request.method, route, response.status_code)
+        DURATION.observe(elapsed, request.method, route)
+
+        if stats is not None and stats.track_queries:
+            DB_QUERIES.observe(stats.queries, route)
+            DB_TIME.observe(stats.db_time, route)
+            response['Server-Timing'] = f'app;dur={elapsed * 1000:.1f}, db;dur={stats.db_time * 1000:.1f}'
+            if stats.repeated:
+                N_PLUS_ONE.inc(route)
+                for fingerprint, (site, sql) in stats.repeated.items():
+                    logger.warning(
+                        "Repeated query %s on %s %s from %s (x%d): %.300s",
+                        fingerprint, request.method, request.path, site, stats.statements[sql], sql,
+                    )
+        if elapsed * 1000 >= self.config['SLOW_REQUEST_MS']:
+            detail = ''
+            if stats is not None:
+                detail = f" cache={stats.cache_hits}/{stats.cache_hits + stats.cache_misses}"
+                if stats.track_queries:
+                    detail = f" queries={stats.queries} db={stats.db_time * 1000:.1f}ms" + detail
+            logger.info("Slow request %s %s %d %.1fms%s", request.method, request.path, response.status_code, elapsed * 1000, detail)
+            if profiler is not None:
+                self._dump_profile(profiler, request, elapsed)
+
+    def _dump_profile(self, profiler, request, elapsed):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        name = request.path.strip('/').replace('/', '_') or 'root'
+        path = self.profile_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{int(elapsed * 1000)}ms.prof"
+        profiler.dump_stats(str(path))
+        logger.info("Profile written to %s", path)
@@ -0,0 +1,2 @@
+from .sparse_fieldset_mixin import SparseFieldsetMixin
+from .replica_read_mixin import ReplicaReadMixin
@@ -0,0 +1,11 @@
+from shared.db_router import replica_reads
+
+
+class ReplicaReadMixin:
+    """Serves safe (GET/HEAD/OPTIONS) requests of a view from a read replica."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
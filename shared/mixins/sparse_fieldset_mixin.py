@@ -0,0 +1,73 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=id,action,timestamp` on a GenericAPIView: the serializer renders only
+    those fields and the queryset loads only the matching columns. Without the
+    parameter, `deferred_fields` (wide Text/JSON columns) are left out of both the
+    SELECT and the response; clients ask for them by name.
+    """
+    fields_query_param = 'fields'
+    deferred_fields = ()
+
+    def get_requested_fields(self):
+        if not hasattr(self, '_requested_fields'):
+            raw = self.request.query_params.get(self.fields_query_param) if self.request else None
+            requested = None
+            if raw:
+                requested = {name.strip() for name in raw.split(',') if name.strip()}
+                available = self._serializer_fields()
+                unknown = requested - set(available)
+                if unknown:
+                    raise ValidationError({self.fields_query_param: f"Unknown fields: {', '.join(sorted(unknown))}"})
+            self._requested_fields = requested
+        return self._requested_fields
+
+    def _serializer_fields(self):
+        serializer_class = self.get_serializer_class()
+        return serializer_class(context=self.get_serializer_context()).fields
+
+    def get_only_fields(self, model, requested):
+        """
+        Model columns backing the requested serializer fields, or () when one of
+        them is computed (source='*', a method or a property) and needs the full row.
+        """
+        fields = self._serializer_fields()
+        names = {model._meta.pk.name}
+        for name in requested:
+            source = fields[name].source
+            if source == '*':
+                return ()
+            try:
+                field = model._meta.get_field(source.split('.')[0])
+            except FieldDoesNotExist:
+                return ()
+            if not field.concrete:
+                return ()
+            names.add(field.name)
+        # The paginator reads the ordering column for its cursor
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'get_ordering'):
+            ordering = paginator.get_ordering(self, model._default_manager.none()).lstrip('-')
+            if ordering != 'pk':
+                names.add(ordering)
+        return tuple(names)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_fields()
+        if requested is None:
+            return queryset.defer(*self.deferred_fields) if self.deferred_fields else queryset
+        only = self.get_only_fields(queryset.model, requested)
+        return queryset.only(*only) if only else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        target = getattr(serializer, 'child', serializer)
+        for name in list(target.fields):
+            if (requested is None and name in self.deferred_fields) or (requested and name not in requested):
+                target.fields.pop(name)
+        return serializer
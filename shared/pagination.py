@@ -0,0 +1,166 @@
+"""
+Project-wide API pagination.
+
+KeysetPagination pages on an indexed, stable ordering plus the primary key as a
+tiebreak, e.g. (-created_at, -id). The cursor carries the last row's values, so
+every page is an index range scan with no OFFSET and no COUNT(*).
+"""
+
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_ORDERING_FIELDS = ('created_at', 'timestamp', 'joined_at')
+
+
+def get_page_size_limits():
+    config = getattr(settings, 'API_PAGINATION', {})
+    default = config.get('PAGE_SIZE', settings.REST_FRAMEWORK.get('PAGE_SIZE', 10))
+    return default, config.get('MAX_PAGE_SIZE', 100)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (ordering field, pk).
+
+    Views may set `keyset_ordering = '-timestamp'`; otherwise the first of
+    created_at / timestamp / joined_at on the model is used (newest first), and
+    the primary key alone as a last resort.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def get_ordering(self, view, queryset):
+        ordering = getattr(view, 'keyset_ordering', None)
+        if ordering:
+            return ordering
+        for name in DEFAULT_ORDERING_FIELDS:
+            try:
+                queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            return f'-{name}'
+        return '-pk'
+
+    def get_page_size(self, request):
+        default, maximum = get_page_size_limits()
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return default
+        return max(1, min(size, maximum))
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps({'v': values, 'r': int(reverse)}, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(raw + '=' * (-len(raw) % 4)))
+            return payload['v'], bool(payload['r'])
+        except (ValueError, KeyError, TypeError):
+            raise ParseError("Invalid cursor")
+
+    def _cursor_values(self, model, values):
+        """The cursor's values converted by the model fields; a crafted cursor is a 400, not a database error."""
+        fields = [model._meta.pk] if self.field == 'pk' else [model._meta.get_field(self.field), model._meta.pk]
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ParseError("Invalid cursor")
+        try:
+            values = [field.to_python(value) for field, value in zip(fields, values)]
+        except ValidationError:
+            raise ParseError("Invalid cursor")
+        if None in values:
+            raise ParseError("Invalid cursor")
+        return values
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(view, queryset)
+        descending = ordering.startswith('-')
+        self.field = ordering.lstrip('-')
+        values, reverse = self.decode_cursor(request)
+        if values is not None:
+            values = self._cursor_values(queryset.model, values)
+
+        # Walking backwards means flipping the comparison and the ORDER BY, then un-reversing the page
+        forward = descending != reverse
+        sign = '-' if forward else ''
+        order_by = [f'{sign}{self.field}'] if self.field != 'pk' else []
+        queryset = queryset.order_by(*order_by, f'{sign}pk')
+
+        if values is not None:
+            lookup = 'lt' if forward else 'gt'
+            if self.field == 'pk':
+                queryset = queryset.filter(**{f'pk__{lookup}': values[-1]})
+            else:
+                value = values[0]
+                # The bare range on the ordering field is redundant but lets MySQL/SQLite
+                # range-scan its index instead of sorting every row the OR matches
+                queryset = queryset.filter(
+                    Q(**{f'{self.field}__{lookup}e': value}),
+                    Q(**{f'{self.field}__{lookup}': value}) | Q(**{f'pk__{lookup}': values[1]}),
+                )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else values is not None
+        self.has_previous = values is not None if not reverse else has_more
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def _row_values(self, row):
+        if self.field == 'pk':
+            return [row.pk]
+        return [getattr(row, self.field), row.pk]
+
+    def _link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self._row_values(row), reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_row is None:
+            return None
+        return self._link(self.last_row, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_row is None:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._link(self.first_row, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
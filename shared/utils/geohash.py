@@ -0,0 +1,76 @@
+"""
+Minimal geohash encoding plus helpers for turning a radius search into a small
+set of geohash prefixes that an indexed LIKE 'prefix%' lookup can use.
+"""
+
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+
+def encode(latitude, longitude, precision=8):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) enclosing a circle of radius_km."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lng_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    return (
+        max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0),
+        max(longitude - lng_delta, -180.0), min(longitude + lng_delta, 180.0),
+    )
+
+
+def cell_size(precision):
+    """(lat_degrees, lng_degrees) covered by one geohash cell."""
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def precision_for_box(min_lat, max_lat, min_lng, max_lng, max_precision=8):
+    """Finest precision whose cells are at least as large as the box on both axes."""
+    precision = 1
+    for candidate in range(1, max_precision + 1):
+        lat_size, lng_size = cell_size(candidate)
+        if lat_size >= max_lat - min_lat and lng_size >= max_lng - min_lng:
+            precision = candidate
+    return precision
+
+
+def covering_prefixes(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose cells together cover the bounding box of the circle.
+    The box is never larger than one cell per axis, so this is at most 4 prefixes.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    precision = precision_for_box(min_lat, max_lat, min_lng, max_lng)
+    return sorted({
+        encode(lat, lng, precision)
+        for lat in (min_lat, max_lat)
+        for lng in (min_lng, max_lng)
+    })
@@ -0,0 +1,126 @@
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format.
+
+Each worker process keeps its own counters; scrape every worker (or run a single
+worker per port) the same way as with prometheus_client's default registry.
+"""
+
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+_cache_stats = {}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name, _label_text(self.labelnames, labels), value
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        names = self.labelnames + ('le',)
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket', _label_text(names, labels + (le,)), cumulative
+            yield f'{self.name}_sum', _label_text(self.labelnames, labels), total
+            yield f'{self.name}_count', _label_text(self.labelnames, labels), cumulative
+
+
+def _get_or_create(cls, name, documentation, labelnames, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, documentation, labelnames, **kwargs)
+        return metric
+
+
+def counter(name, documentation, labelnames=()):
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def register_cache_stats(name, stats_fn):
+    """Expose a cache's stats() (hits/misses/...) as gauges labelled cache=<name>."""
+    _cache_stats[name] = stats_fn
+
+
+def render():
+    lines = []
+    with _registry_lock:
+        metrics = list(_registry.values())
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for name, labels, value in metric.samples():
+            lines.append(f'{name}{labels} {value}')
+
+    if _cache_stats:
+        gauges = {}
+        for cache_name, stats_fn in list(_cache_stats.items()):
+            stats = stats_fn()
+            lookups = stats.get('hits', 0) + stats.get('misses', 0)
+            stats = {**stats, 'hit_ratio': round(stats.get('hits', 0) / lookups, 6) if lookups else 0.0}
+            for key, value in stats.items():
+                gauges.setdefault(key, []).append((cache_name, value))
+        for key, values in gauges.items():
+            lines.append(f'# TYPE app_cache_{key} gauge')
+            for cache_name, value in values:
+                lines.append(f'app_cache_{key}{_label_text(("cache",), (cache_name,))} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,158 @@
+"""
+Constant-memory CSV and XLSX writers that yield bytes as rows are consumed.
+
+Both take a header and any iterable of row tuples and never hold more than one
+flush batch. The XLSX writer emits a minimal SpreadsheetML package (one sheet,
+inline strings, no styles) through zipfile writing to a non-seekable sink, so the
+archive can be streamed straight into an HTTP response or a file.
+
+CSV text cells that a spreadsheet would evaluate as a formula (leading = + - @,
+tab or carriage return) are prefixed with a single quote. XLSX inline strings are
+never evaluated, so they are written as is.
+"""
+
+import csv
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_SHEET_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = b'</sheetData></worksheet>'
+
+
+class _Sink:
+    """Write-only, non-seekable byte sink drained by the generators below."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _Line:
+    def write(self, value):
+        return value
+
+
+def _csv_safe(row):
+    return [f"'{value}" if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES) else value for value in row]
+
+
+def iter_csv(header, rows, flush_every=1000):
+    """Yield UTF-8 CSV (with BOM for Excel) in batches of `flush_every` rows."""
+    writer = csv.writer(_Line())
+    buffer = ['﻿' + writer.writerow(_csv_safe(header))]
+    for count, row in enumerate(rows, start=1):
+        buffer.append(writer.writerow(_csv_safe(row)))
+        if count % flush_every == 0:
+            yield ''.join(buffer).encode('utf-8')
+            buffer.clear()
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def _text_cell(value):
+    text = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    if '&' in text or '<' in text or '>' in text:
+        text = escape(text)
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{_ILLEGAL_XML.sub("", text)}</t></is></c>'
+
+
+def _number_cell(value):
+    return f'<c><v>{value}</v></c>'
+
+
+_CELL_WRITERS = {
+    type(None): lambda value: '<c/>',
+    bool: lambda value: f'<c t="b"><v>{int(value)}</v></c>',
+    int: _number_cell,
+    float: _number_cell,
+    Decimal: _number_cell,
+    str: _text_cell,
+}
+
+
+def _row(values):
+    cells = ''.join(_CELL_WRITERS.get(type(value), _text_cell)(value) for value in values)
+    return f'<row>{cells}</row>'
+
+
+def iter_xlsx(header, rows, sheet_name='Export', flush_every=1000):
+    """Yield an .xlsx file in pieces; memory is bounded by one batch of rows."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name[:31], {'"': '&quot;'})))
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        yield sink.drain()
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(_SHEET_HEAD)
+            sheet.write(_row(header).encode('utf-8'))
+            buffer = []
+            for count, row in enumerate(rows, start=1):
+                buffer.append(_row(row))
+                if count % flush_every == 0:
+                    sheet.write(''.join(buffer).encode('utf-8'))
+                    buffer.clear()
+                    yield sink.drain()
+            sheet.write(''.join(buffer).encode('utf-8'))
+            sheet.write(_SHEET_TAIL)
+    yield sink.drain()
+
+
+def write_to_file(chunks, path):
+    """Drain a chunk iterator into a file; returns bytes written."""
+    size = 0
+    with open(path, 'wb') as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+            size += len(chunk)
+    return size
@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from shared.utils import metrics
+
+
+def metrics_view(request):
+    """GET /metrics/ - Prometheus scrape endpoint, restricted to METRICS_ALLOWED_IPS."""
+    allowed = getattr(settings, 'PERFORMANCE_MONITORING', {}).get('METRICS_ALLOWED_IPS', ('127.0.0.1', '::1'))
+    if request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')